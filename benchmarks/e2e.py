@@ -0,0 +1,323 @@
+"""
+Offline end-to-end benchmark of the orchestration code.
+
+Every entry point runs in a fresh interpreter against a scripted local LLM
+(Ollama protocol) and a fake Tavily server, both with configurable latency (see
+stubs.py). For each entry point the benchmark reports:
+- wall: total run time
+- io: wall time with at least one HTTP request to a backend outstanding
+- framework: wall - io, i.e. time spent in Agno/LlamaIndex and our own code
+  (including imports; MCP stdio round trips also count here, as they are not HTTP)
+- peak_rss_mb: peak resident set size of the run
+- model_calls / tool_calls / search_calls: requests seen by the stub servers
+
+Results can be stored as a JSON baseline and compared on later runs.
+
+Usage:
+    uv run python -m benchmarks.e2e
+    uv run python -m benchmarks.e2e --only agent_with_tools --runs 5
+    uv run python -m benchmarks.e2e --llm-latency 0.2 --search-latency 0.1
+    uv run python -m benchmarks.e2e --save-baseline
+    uv run python -m benchmarks.e2e --compare --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.stubs import StubLLMServer, StubSearchServer
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "e2e.json"
+
+# name -> (kind, target); "module" entries run as __main__
+ENTRY_POINTS: Dict[str, Tuple[str, str]] = {
+    "agent_with_tools": ("module", "src.memory_and_tools.agent_with_tools"),
+    "agent_with_stm": ("module", "src.memory_and_tools.agent_with_stm"),
+    "agent_with_ltm": ("module", "src.memory_and_tools.agent_with_ltm"),
+    "investment_team": ("module", "src.mas.investment_strategy"),
+    "due_diligence_committee": ("module", "src.mas.hybrid_teams"),
+    "plan_trip_with_team": ("mcp", "src.mas.mcp.client"),
+    "react_agent": ("module", "src.react_agent.agent_llamaindex"),
+}
+
+TIMED_METRICS = ("wall", "io", "framework")
+COUNTED_METRICS = ("model_calls", "tool_calls", "search_calls")
+
+
+class IOTracker:
+    """Records the time intervals during which backend HTTP requests are outstanding."""
+
+    def __init__(self):
+        self.intervals: List[Tuple[float, float]] = []
+        self._lock = threading.Lock()
+
+    def add(self, start: float, end: float) -> None:
+        with self._lock:
+            self.intervals.append((start, end))
+
+    def busy_time(self) -> float:
+        """Length of the union of all intervals."""
+        total, current_start, current_end = 0.0, None, None
+        for start, end in sorted(self.intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+    def install(self) -> None:
+        """Patch httpx and requests so every request reports its interval."""
+        import httpx
+        import requests
+
+        tracker = self
+        sync_send = httpx.Client.send
+        async_send = httpx.AsyncClient.send
+        requests_send = requests.Session.send
+
+        def track_close(response, start):
+            # Streamed bodies are read after send() returns; stop timing on close
+            close, aclose = response.close, response.aclose
+
+            def timed_close():
+                close()
+                tracker.add(start, time.perf_counter())
+
+            async def timed_aclose():
+                await aclose()
+                tracker.add(start, time.perf_counter())
+
+            response.close, response.aclose = timed_close, timed_aclose
+
+        def send(client, request, *args, stream=False, **kwargs):
+            start = time.perf_counter()
+            response = sync_send(client, request, *args, stream=stream, **kwargs)
+            if stream:
+                track_close(response, start)
+            else:
+                tracker.add(start, time.perf_counter())
+            return response
+
+        async def asend(client, request, *args, stream=False, **kwargs):
+            start = time.perf_counter()
+            response = await async_send(client, request, *args, stream=stream, **kwargs)
+            if stream:
+                track_close(response, start)
+            else:
+                tracker.add(start, time.perf_counter())
+            return response
+
+        def session_send(session, request, **kwargs):
+            start = time.perf_counter()
+            try:
+                return requests_send(session, request, **kwargs)
+            finally:
+                tracker.add(start, time.perf_counter())
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+        requests.Session.send = session_send
+
+
+def _entry_callable(name: str) -> Callable[[], None]:
+    kind, target = ENTRY_POINTS[name]
+    if kind == "module":
+        import runpy
+
+        return lambda: runpy.run_module(target, run_name="__main__", alter_sys=True)
+
+    import asyncio
+    import importlib
+
+    client = importlib.import_module(target)
+    client.MCP_COMMAND = f"{sys.executable} {ROOT / 'src' / 'mas' / 'mcp' / 'server.py'}"
+    return lambda: asyncio.run(client.demo_travel_planning())
+
+
+def run_child(name: str, llm_url: str, search_url: str, output: Path) -> None:
+    """Run one entry point in this process and write its measurements to output."""
+    os.environ.update(
+        {
+            "MODEL_PROVIDER": "ollama",
+            "OLLAMA_HOST": llm_url,
+            "OLLAMA_MODEL_ID": "stub-model",
+            "OLLAMA_TEMPERATURE": "0",
+            "TAVILY_API_KEY": "stub-key",
+            "TAVILY_BASE_URL": search_url,
+            "LLM_CACHE_MODE": "off",
+        }
+    )
+    sys.path.insert(0, str(ROOT))
+
+    # Relative paths (tmp_dbs/, pyproject.toml) resolve inside a scratch directory
+    workdir = Path(tempfile.mkdtemp(prefix="e2e-"))
+    shutil.copy(ROOT / "pyproject.toml", workdir / "pyproject.toml")
+    os.chdir(workdir)
+
+    tracker = IOTracker()
+    tracker.install()
+
+    devnull = open(os.devnull, "w")
+    stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        start = time.perf_counter()
+        _entry_callable(name)()
+        wall = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    io = tracker.busy_time()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+    output.write_text(
+        json.dumps(
+            {
+                "wall": wall,
+                "io": io,
+                "framework": max(wall - io, 0.0),
+                "peak_rss_mb": peak_rss_mb,
+            }
+        )
+    )
+
+
+def measure(name: str, llm: StubLLMServer, search: StubSearchServer) -> Dict[str, float]:
+    """Run an entry point in a fresh interpreter and collect its metrics."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        output = Path(f.name)
+    llm_before, tools_before, search_before = llm.requests, llm.tool_calls, search.requests
+    try:
+        proc = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.e2e",
+                "--child", name,
+                "--llm-url", llm.url,
+                "--search-url", search.url,
+                "--output", str(output),
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{proc.stderr[-3000:]}")
+        metrics = json.loads(output.read_text())
+    finally:
+        output.unlink(missing_ok=True)
+
+    metrics["model_calls"] = llm.requests - llm_before
+    metrics["tool_calls"] = llm.tool_calls - tools_before
+    metrics["search_calls"] = search.requests - search_before
+    return metrics
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """Median of every metric across runs."""
+    return {
+        key: round(statistics.median(sample[key] for sample in samples), 4)
+        for key in samples[0]
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Return regressions against the stored baseline."""
+    baseline = json.loads(BASELINE_FILE.read_text())["results"]
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in TIMED_METRICS + ("peak_rss_mb",):
+            if metrics[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{name}.{key}: {metrics[key]:.3f} vs baseline {base[key]:.3f}")
+        for key in COUNTED_METRICS:
+            if metrics[key] != base[key]:
+                regressions.append(f"{name}.{key}: {metrics[key]} vs baseline {base[key]}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end orchestration benchmark")
+    parser.add_argument("--only", nargs="*", choices=list(ENTRY_POINTS), help="Entry points to run")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per entry point (median reported)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub LLM latency (s)")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Stub search latency (s)")
+    parser.add_argument("--response-words", type=int, default=50, help="Words per stub answer")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    # Internal: run a single entry point in this interpreter
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--llm-url", help=argparse.SUPPRESS)
+    parser.add_argument("--search-url", help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.llm_url, args.search_url, args.output)
+        return 0
+
+    names = args.only or list(ENTRY_POINTS)
+    results: Dict[str, Dict[str, float]] = {}
+    with StubLLMServer(latency=args.llm_latency, words=args.response_words) as llm, \
+            StubSearchServer(latency=args.search_latency) as search:
+        for name in names:
+            results[name] = summarize([measure(name, llm, search) for _ in range(args.runs)])
+
+    header = f"{'entry point':<26}{'wall':>9}{'io':>9}{'framework':>11}{'rss MB':>9}{'model':>7}{'tools':>7}{'search':>8}"
+    print(header)
+    for name, m in results.items():
+        print(
+            f"{name:<26}{m['wall']:>8.3f}s{m['io']:>8.3f}s{m['framework']:>10.3f}s"
+            f"{m['peak_rss_mb']:>9.1f}{m['model_calls']:>7.0f}{m['tool_calls']:>7.0f}{m['search_calls']:>8.0f}"
+        )
+
+    settings = {
+        "llm_latency": args.llm_latency,
+        "search_latency": args.search_latency,
+        "response_words": args.response_words,
+        "runs": args.runs,
+    }
+    report: Dict[str, Any] = {"settings": settings, "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        if BASELINE_FILE.exists():
+            # Keep baselines of entry points that were not run this time
+            stored = json.loads(BASELINE_FILE.read_text())
+            report["results"] = {**stored.get("results", {}), **results}
+        BASELINE_FILE.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+    if args.compare:
+        if not BASELINE_FILE.exists():
+            print(f"No baseline at {BASELINE_FILE}; run with --save-baseline first")
+            return 1
+        regressions = compare(results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION - {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
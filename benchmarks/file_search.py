@@ -0,0 +1,143 @@
+"""
+Benchmark of indexed content search (search_files) against a naive scan.
+
+Generates a synthetic source tree, then times:
+- build: first full index of the tree (persisted to disk)
+- load: opening the persisted index in a new ContentIndex
+- refresh: incremental update after a few files change
+- query: keyword and regex searches through the index
+- naive: the same searches with os.walk + read + regex over every file
+
+Usage:
+    uv run python -m benchmarks.file_search
+    uv run python -m benchmarks.file_search --files 50000 --changed 20
+    uv run python -m benchmarks.file_search --root src --query "create_model"
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from src.memory_and_tools.content_index import ContentIndex
+
+WORDS = (
+    "model agent team memory session tool search index cache router pool config "
+    "request response stream token budget query result score async thread"
+).split()
+
+QUERIES = [
+    ("keyword", "needle_function"),
+    ("keyword", "needle_function_changed timeout"),
+    ("regex", r"def needle_\w+\(timeout"),
+]
+
+
+def generate_tree(root: Path, files: int, seed: int = 0) -> None:
+    """Write `files` small Python-like files, a few of them containing needles."""
+    rng = random.Random(seed)
+    for i in range(files):
+        directory = root / f"pkg{i % 100}" / f"sub{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for j in range(rng.randint(20, 120)):
+            name = "_".join(rng.sample(WORDS, 2))
+            lines.append(f"def {name}_{j}(value, {rng.choice(WORDS)}=None):")
+            lines.append(f"    return {rng.choice(WORDS)}.{rng.choice(WORDS)}(value)")
+        if i % 500 == 0:
+            lines.append("def needle_function(timeout=30):")
+            lines.append("    return timeout")
+        (directory / f"module_{i}.py").write_text("\n".join(lines) + "\n")
+
+
+def naive_search(root: str, kind: str, query: str) -> int:
+    """os.walk + read every file + regex, the baseline the index replaces."""
+    if kind == "regex":
+        pattern = re.compile(query)
+    else:
+        pattern = re.compile("|".join(re.escape(t) for t in query.split()), re.IGNORECASE)
+    hits = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            try:
+                with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        if pattern.search(line):
+                            hits += 1
+            except OSError:
+                continue
+    return hits
+
+
+def timed(fn: Callable[[], object], runs: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Indexed vs naive content search benchmark")
+    parser.add_argument("--files", type=int, default=20000, help="Files in the synthetic tree")
+    parser.add_argument("--changed", type=int, default=10, help="Files modified before the refresh")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per query (median reported)")
+    parser.add_argument("--root", help="Benchmark an existing directory instead of a synthetic tree")
+    parser.add_argument("--query", action="append", help="Extra keyword query (repeatable)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="file-search-"))
+    try:
+        if args.root:
+            root = os.path.realpath(args.root)
+        else:
+            root = str(workdir / "tree")
+            start = time.perf_counter()
+            generate_tree(Path(root), args.files)
+            print(f"Generated {args.files} files in {time.perf_counter() - start:.1f}s")
+        index_path = str(workdir / "index.pkl")
+        queries = QUERIES + [("keyword", q) for q in args.query or []]
+
+        start = time.perf_counter()
+        index = ContentIndex(root, index_path=index_path, refresh_interval=0)
+        index.refresh(force=True)
+        build = time.perf_counter() - start
+        stats = index.stats()
+        size_mb = os.path.getsize(index_path) / (1024 * 1024)
+        print(f"build:   {build * 1000:9.1f} ms  ({stats['files']} files, {stats['trigrams']} trigrams, {size_mb:.1f} MB on disk)")
+
+        load = timed(lambda: ContentIndex(root, index_path=index_path), 1)
+        print(f"load:    {load:9.1f} ms")
+
+        if not args.root:
+            changed = sorted(Path(root).rglob("*.py"))[: args.changed]
+            for path in changed:
+                path.write_text(path.read_text() + "def needle_function_changed():\n    pass\n")
+        start = time.perf_counter()
+        reindexed = index.refresh(force=True)
+        print(f"refresh: {(time.perf_counter() - start) * 1000:9.1f} ms  ({reindexed} files re-indexed)")
+
+        # Measure queries alone; change scans are covered by the refresh timing above
+        index.refresh_interval = float("inf")
+        print(f"\n{'query':<32}{'index ms':>10}{'naive ms':>11}{'speedup':>9}{'hits':>7}")
+        for kind, query in queries:
+            hits = index.search(query, regex=kind == "regex", limit=10**9)
+            indexed = timed(lambda: index.search(query, regex=kind == "regex"), args.runs)
+            naive = timed(lambda: naive_search(root, kind, query), max(1, args.runs // 2))
+            label = f"{kind}: {query}"[:31]
+            print(f"{label:<32}{indexed:>10.1f}{naive:>11.1f}{naive / max(indexed, 1e-6):>8.0f}x{len(hits):>7}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
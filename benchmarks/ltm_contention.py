@@ -0,0 +1,162 @@
+"""
+Multi-process write contention benchmark for the long-term memory database.
+
+Several processes upsert sessions and user memories into one SQLite file at the
+same time, using:
+- default: SqliteDb(db_file=...) as in agent_with_ltm.py before tuning
+- tuned: SqliteDb on create_sqlite_engine() (WAL, pragmas, connection pool)
+- batched: BatchedSqliteDb (tuned engine + write-behind batching)
+
+For each mode it reports writes/sec (all processes, until every write is durable),
+p50/p99 latency from the upsert call until the write is committed, and the number of
+failed writes. For batched mode that is the time until the flush that wrote the
+queued upsert has committed, not the time to queue it. Every upsert writes a new
+session or memory id, so no write is merged into a later one.
+
+Batched mode trades latency for throughput: it commits several times more writes
+per second than the other modes, but each write waits for its batch, so its p50/p99
+are well above those of an unbatched SqliteDb.
+
+Usage:
+    uv run python -m benchmarks.ltm_contention
+    uv run python -m benchmarks.ltm_contention --processes 8 --writes 500
+    uv run python -m benchmarks.ltm_contention --modes tuned batched
+"""
+import argparse
+import contextlib
+import multiprocessing
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+MODES = ("default", "tuned", "batched")
+
+
+def _open_db(mode: str, db_file: str):
+    from agno.db.sqlite import SqliteDb
+
+    from src.memory_and_tools.ltm_store import BatchedSqliteDb, create_sqlite_engine
+
+    tables = {"session_table": "agent_sessions", "memory_table": "user_memories"}
+    if mode == "default":
+        return SqliteDb(db_file=db_file, **tables)
+    if mode == "tuned":
+        return SqliteDb(db_engine=create_sqlite_engine(db_file), **tables)
+    return BatchedSqliteDb(db_file=db_file, **tables)
+
+
+def _track_commits(db, queued: List[float], latencies: List[float]) -> None:
+    """Record each queued write's latency once the BatchedSqliteDb flush that wrote it returns."""
+    flush = db.flush
+
+    def timed_flush() -> None:
+        with db._queue_lock:
+            # Every write counted here is pending, so this flush (or an earlier one) commits it
+            count = len(queued)
+        flush()
+        now = time.perf_counter()
+        with db._queue_lock:
+            latencies.extend(now - start for start in queued[len(latencies):count])
+
+    db.flush = timed_flush
+
+
+def _worker(mode: str, db_file: str, worker: int, writes: int, payload: int, barrier, results) -> None:
+    from agno.db.schemas.memory import UserMemory
+    from agno.session import AgentSession
+
+    db = _open_db(mode, db_file)
+    latencies: List[float] = []
+    queued: List[float] = []
+    if mode == "batched":
+        _track_commits(db, queued, latencies)
+        # Held (re-entrantly) around each upsert, so a flush counts the write and its start time together
+        lock = db._queue_lock
+    else:
+        lock = contextlib.nullcontext()
+    errors = 0
+    barrier.wait()
+    start = time.perf_counter()
+    for i in range(writes):
+        begin = time.perf_counter()
+        try:
+            with lock:
+                if i % 2 == 0:
+                    db.upsert_session(
+                        AgentSession(
+                            session_id=f"w{worker}-s{i}",
+                            agent_id="bench",
+                            user_id=f"user{worker}",
+                            session_data={"notes": "x" * payload},
+                            created_at=int(time.time()),
+                        )
+                    )
+                else:
+                    db.upsert_user_memory(
+                        UserMemory(memory_id=f"w{worker}-m{i}", memory="y" * payload, user_id=f"user{worker}")
+                    )
+                if mode == "batched":
+                    queued.append(begin)
+        except Exception:
+            errors += 1
+            continue
+        if mode != "batched":
+            latencies.append(time.perf_counter() - begin)
+    db.close()
+    results.put({"latencies": latencies, "errors": errors, "wall": time.perf_counter() - start})
+
+
+def run_mode(mode: str, processes: int, writes: int, payload: int) -> Dict[str, float]:
+    """Run one mode with all processes writing concurrently and return its metrics."""
+    workdir = Path(tempfile.mkdtemp(prefix="ltm-bench-"))
+    db_file = str(workdir / "ltm.db")
+    # Create the tables up front so the workers only measure writes
+    _open_db(mode, db_file)._get_table("sessions", create_table_if_not_found=True)
+    _open_db(mode, db_file)._get_table("memories", create_table_if_not_found=True)
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(processes)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_worker, args=(mode, db_file, w, writes, payload, barrier, results))
+        for w in range(processes)
+    ]
+    for p in workers:
+        p.start()
+    outcomes = [results.get() for _ in workers]
+    for p in workers:
+        p.join()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = sorted(latency for outcome in outcomes for latency in outcome["latencies"])
+    wall = max(outcome["wall"] for outcome in outcomes)
+    return {
+        "writes_per_sec": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "errors": sum(outcome["errors"] for outcome in outcomes),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Multi-process LTM SQLite write benchmark")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent writer processes")
+    parser.add_argument("--writes", type=int, default=300, help="Upserts per process")
+    parser.add_argument("--payload", type=int, default=2000, help="Bytes of text per upsert")
+    parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes x {args.writes} upserts ({args.payload} B payload)")
+    print(f"{'mode':<10}{'writes/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for mode in args.modes:
+        m = run_mode(mode, args.processes, args.writes, args.payload)
+        print(f"{mode:<10}{m['writes_per_sec']:>10.0f}{m['p50_ms']:>9.2f}{m['p99_ms']:>9.2f}{m['errors']:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark of the pooled async search client against blocking TavilyClient calls.
+
+Sends --queries searches to the local stub Tavily server (fixed latency, optionally
+failing every Nth request) and times:
+- blocking: one TavilyClient, one search after the other (what an async tool calling
+  the sync client does to the event loop)
+- pooled: AsyncSearchClient with all searches gathered on one event loop
+- pooled-sync: SearchClient (blocking wrapper) called from a thread pool
+
+Usage:
+    uv run python -m benchmarks.search_client
+    uv run python -m benchmarks.search_client --queries 64 --latency 0.2 --concurrency 16
+    uv run python -m benchmarks.search_client --fail-every 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tavily import TavilyClient
+
+from benchmarks.stubs import StubSearchServer
+from src.config.search_client import AsyncSearchClient, SearchClient
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pooled async search client vs. blocking TavilyClient")
+    parser.add_argument("--queries", type=int, default=32, help="Searches per measurement")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub search latency (s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight")
+    parser.add_argument("--fail-every", type=int, default=0, help="Stub fails every Nth request with a 503")
+    args = parser.parse_args()
+    queries = [f"benchmark query {i}" for i in range(args.queries)]
+
+    with StubSearchServer(latency=args.latency, fail_every=args.fail_every) as server:
+        rows = []
+
+        if not args.fail_every:
+            # TavilyClient does not retry, so it is only measured without failures
+            client = TavilyClient(api_key="stub-key", api_base_url=server.url)
+            start = time.perf_counter()
+            for query in queries:
+                client.search(query=query, max_results=5)
+            rows.append(("blocking", time.perf_counter() - start, len(queries)))
+
+        pooled = AsyncSearchClient(
+            api_key="stub-key", base_url=server.url, max_concurrency=args.concurrency, backoff=0.05
+        )
+
+        async def gather() -> None:
+            await asyncio.gather(*(pooled.search(query=query, max_results=5) for query in queries))
+
+        start = time.perf_counter()
+        asyncio.run(gather())
+        rows.append(("pooled", time.perf_counter() - start, pooled.stats().requests))
+
+        blocking = SearchClient(pooled)
+        before = pooled.stats().requests
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(lambda query: blocking.search(query=query, max_results=5), queries))
+        rows.append(("pooled-sync", time.perf_counter() - start, pooled.stats().requests - before))
+        stats = pooled.stats()
+        pooled.close()
+
+    print(f"{'client':<14}{'seconds':>9}{'searches/s':>12}{'requests':>10}")
+    for name, seconds, requests in rows:
+        print(f"{name:<14}{seconds:>9.2f}{len(queries) / seconds:>12.1f}{requests:>10}")
+    print(f"retries: {stats.retries}, failures: {stats.failures}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
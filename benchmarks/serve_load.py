@@ -0,0 +1,148 @@
+"""
+Load test of the team server against the stub backends.
+
+Starts the stub LLM and Tavily servers (see stubs.py) and a TeamServer in this
+process, then sends --requests streaming job requests, --concurrency at a time, spread
+round-robin over the served teams. Reports:
+- warm-up: time to build the served teams before the first job
+- throughput: completed jobs per second
+- p50 / p95 latency: request to final event, and to the first streamed event
+- rejected: jobs refused with 503 because the queue was full (backpressure)
+- model_calls / search_calls: requests seen by the stub servers
+
+Usage:
+    uv run python -m benchmarks.serve_load
+    uv run python -m benchmarks.serve_load --requests 40 --concurrency 16 --workers 4
+    uv run python -m benchmarks.serve_load --teams investment_team travel_team --llm-latency 0.2
+    uv run python -m benchmarks.serve_load --queue-size 2 --concurrency 16   # exercise backpressure
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.stubs import StubLLMServer, StubSearchServer
+
+ROOT = Path(__file__).resolve().parent.parent
+PROMPT = "Should we invest in NVIDIA for the next three years?"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """q-th percentile (0-100) of samples, nearest rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def send_job(client: httpx.AsyncClient, team: str) -> Dict[str, Optional[float]]:
+    """Send one job and read its event stream to the end."""
+    start = time.perf_counter()
+    first_event: Optional[float] = None
+    final: Optional[str] = None
+    async with client.stream("POST", f"/teams/{team}/runs", json={"input": PROMPT}) as response:
+        if response.status_code == 503:
+            return {"status": "rejected"}
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["event"] != "queued" and first_event is None:
+                first_event = time.perf_counter() - start
+            final = event["event"]
+    return {"status": final, "seconds": time.perf_counter() - start, "first_event": first_event}
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> List[Dict[str, Optional[float]]]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+
+        async def one(i: int) -> Dict[str, Optional[float]]:
+            async with semaphore:
+                return await send_job(client, args.teams[i % len(args.teams)])
+
+        return await asyncio.gather(*(one(i) for i in range(args.requests)))
+
+
+async def bench(args: argparse.Namespace) -> int:
+    from src.mas import team_server
+    from src.mas.mcp import client as mcp_client
+
+    mcp_client.MCP_COMMAND = f"{sys.executable} {ROOT / 'src' / 'mas' / 'mcp' / 'server.py'}"
+    server = team_server.TeamServer(teams=args.teams, workers=args.workers, queue_size=args.queue_size)
+    start = time.perf_counter()
+    await server.start()
+    warmup = time.perf_counter() - start
+    base_url = await server.listen(host="127.0.0.1", port=0)
+    try:
+        start = time.perf_counter()
+        results = await run_load(args, base_url)
+        wall = time.perf_counter() - start
+        stats = server.stats()
+    finally:
+        await server.stop()
+
+    done = [r for r in results if r["status"] == "done"]
+    latencies = [r["seconds"] for r in done]
+    first_events = [r["first_event"] for r in done if r["first_event"] is not None]
+    print(f"teams: {', '.join(args.teams)}  workers: {server.workers}  queue: {server.queue_size}")
+    print(f"warm-up:       {warmup:.2f}s")
+    print(f"completed:     {len(done)}/{args.requests} in {wall:.2f}s ({len(done) / wall:.2f} jobs/s)")
+    print(f"latency:       p50 {percentile(latencies, 50):.2f}s  p95 {percentile(latencies, 95):.2f}s")
+    print(f"first event:   p50 {percentile(first_events, 50):.2f}s  p95 {percentile(first_events, 95):.2f}s")
+    print(f"rejected:      {sum(r['status'] == 'rejected' for r in results)}  failed: {stats.failed}")
+    return 0 if len(done) + stats.rejected == args.requests else 1
+
+
+def main() -> int:
+    from src.mas.team_server import TEAM_BUILDERS
+
+    parser = argparse.ArgumentParser(description="Load test of the team server against stub backends")
+    parser.add_argument("--teams", nargs="+", choices=list(TEAM_BUILDERS),
+                        default=["investment_committee", "due_diligence_committee"], help="Teams to load")
+    parser.add_argument("--requests", type=int, default=20, help="Jobs to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Jobs in flight from the client")
+    parser.add_argument("--workers", type=int, default=4, help="Server workers")
+    parser.add_argument("--queue-size", type=int, default=32, help="Server queue size")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub LLM latency per call (seconds)")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Stub search latency per call (seconds)")
+    args = parser.parse_args()
+
+    with StubLLMServer(latency=args.llm_latency) as llm, StubSearchServer(latency=args.search_latency) as search:
+        os.environ.update(
+            {
+                "MODEL_PROVIDER": "ollama",
+                "OLLAMA_HOST": llm.url,
+                "OLLAMA_MODEL_ID": "stub-model",
+                "OLLAMA_TEMPERATURE": "0",
+                "TAVILY_API_KEY": "stub-key",
+                "TAVILY_BASE_URL": search.url,
+                "LLM_CACHE_MODE": "off",
+                "SEARCH_CACHE_TTL": "0",
+                "CHECKPOINT_TTL": "0",
+            }
+        )
+        # Relative paths (tmp_dbs/) resolve inside a scratch directory
+        workdir = Path(tempfile.mkdtemp(prefix="serve-load-"))
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            code = asyncio.run(bench(args))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+        print(f"model_calls:   {llm.requests}  search_calls: {search.requests}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
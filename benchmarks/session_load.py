@@ -0,0 +1,109 @@
+"""
+Benchmark of session-load latency against history length.
+
+For each history length, stores one agent session with that many runs (each with a
+user message, a tool result and an answer) in a SQLite file, then times
+SqliteDb.get_session() - what an agent does before every run - before and after
+SessionMaintenance compacts the session down to --keep-runs runs. Also reports the
+database size before and after (including the compressed archive).
+
+Usage:
+    uv run python -m benchmarks.session_load
+    uv run python -m benchmarks.session_load --lengths 10 100 1000 --keep-runs 20
+    uv run python -m benchmarks.session_load --tool-bytes 16000
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from agno.db.base import SessionType
+from agno.db.sqlite import SqliteDb
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.session import AgentSession
+
+from src.memory_and_tools.session_maintenance import SessionMaintenance
+
+
+def make_session(session_id: str, runs: int, tool_bytes: int) -> AgentSession:
+    """An agent session with `runs` runs of realistic shape."""
+    now = int(time.time())
+    outputs = []
+    for i in range(runs):
+        answer = f"Answer {i}: " + "summary of the findings " * 20
+        outputs.append(
+            RunOutput(
+                run_id=f"{session_id}-run{i}",
+                agent_id="bench",
+                session_id=session_id,
+                content=answer,
+                created_at=now - (runs - i) * 60,
+                messages=[
+                    Message(role="user", content=f"Question {i} about the portfolio"),
+                    Message(role="tool", content=f"result {i} " + "x" * tool_bytes, tool_call_id=f"call{i}"),
+                    Message(role="assistant", content=answer),
+                ],
+            )
+        )
+    return AgentSession(session_id=session_id, agent_id="bench", user_id="bench", runs=outputs, created_at=now)
+
+
+def timed(fn: Callable[[], object], runs: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def db_size_mb(db_file: Path) -> float:
+    files = [db_file, Path(f"{db_file}-wal")]
+    return sum(f.stat().st_size for f in files if f.exists()) / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Session-load latency vs. history length")
+    parser.add_argument("--lengths", type=int, nargs="*", default=[10, 50, 200, 1000], help="Runs per session")
+    parser.add_argument("--keep-runs", type=int, default=20, help="Runs kept after compaction")
+    parser.add_argument("--tool-bytes", type=int, default=4000, help="Bytes of tool output per run")
+    parser.add_argument("--runs", type=int, default=5, help="Loads per measurement (median reported)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="session-load-"))
+    try:
+        print(f"{'runs':>6}{'load ms':>10}{'compacted ms':>14}{'speedup':>9}{'MB before':>11}{'MB after':>10}")
+        for length in args.lengths:
+            db_file = workdir / f"sessions-{length}.db"
+            db = SqliteDb(db_file=str(db_file), session_table="agent_sessions")
+            session_id = f"session-{length}"
+            db.upsert_session(make_session(session_id, length, args.tool_bytes))
+            load = lambda: db.get_session(session_id, SessionType.AGENT)  # noqa: E731
+
+            before = timed(load, args.runs)
+            size_before = db_size_mb(db_file)
+            SessionMaintenance(db, keep_runs=args.keep_runs, max_age_days=0).run()
+            # Checkpoint so the file size reflects the compacted data
+            with db.db_engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            after = timed(load, args.runs)
+            size_after = db_size_mb(db_file)
+            assert len(db.get_session(session_id, SessionType.AGENT).runs) == min(length, args.keep_runs)
+            db.close()
+            print(
+                f"{length:>6}{before:>10.1f}{after:>14.1f}{before / max(after, 1e-6):>8.1f}x"
+                f"{size_before:>11.2f}{size_after:>10.2f}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
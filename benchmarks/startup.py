@@ -0,0 +1,128 @@
+"""
+Cold-start benchmark for the project entry points.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and reports
+the cumulative import time of each entry point module. With --check, the median
+is compared against the budgets in startup_budget.json and the script exits
+non-zero if any entry point is over budget.
+
+Usage:
+    uv run python -m benchmarks.startup
+    uv run python -m benchmarks.startup --check
+    uv run python -m benchmarks.startup --runs 10 --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "startup_budget.json"
+
+ENTRY_POINTS: Dict[str, str] = {
+    "config": "src.config",
+    "agent_with_tools": "src.memory_and_tools.agent_with_tools",
+    "investment_strategy": "src.mas.investment_strategy",
+    "hybrid_teams": "src.mas.hybrid_teams",
+    "mcp_client": "src.mas.mcp.client",
+    "react_agent": "src.react_agent.agent_llamaindex",
+}
+
+# Placeholder configuration so module-level code can run without a real .env
+BENCH_ENV: Dict[str, str] = {
+    "MODEL_PROVIDER": "ollama",
+    "OLLAMA_MODEL_ID": "bench-model",
+    "OLLAMA_TEMPERATURE": "0",
+    "OPENAI_MODEL_ID": "bench-model",
+    "OPENAI_API_KEY": "bench-key",
+    "TAVILY_API_KEY": "bench-key",
+}
+
+
+def measure_import(module: str) -> float:
+    """
+    Import a module in a fresh interpreter and return its cumulative import time.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        float: Cumulative import time in milliseconds
+    """
+    env = {**BENCH_ENV, **os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    # Lines look like: "import time:       123 |       4567 | src.config"
+    for line in reversed(proc.stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def run(runs: int) -> Dict[str, Dict[str, float]]:
+    """Measure every entry point `runs` times and summarize the timings."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name, module in ENTRY_POINTS.items():
+        timings: List[float] = [measure_import(module) for _ in range(runs)]
+        results[name] = {
+            "median_ms": round(statistics.median(timings), 2),
+            "min_ms": round(min(timings), 2),
+            "max_ms": round(max(timings), 2),
+        }
+    return results
+
+
+def check(results: Dict[str, Dict[str, float]]) -> List[str]:
+    """Return a list of budget violations (empty when everything is within budget)."""
+    budgets = json.loads(BUDGET_FILE.read_text())
+    failures = []
+    for name, stats in results.items():
+        budget = budgets.get(name)
+        if budget is not None and stats["median_ms"] > budget:
+            failures.append(f"{name}: {stats['median_ms']:.1f} ms > budget {budget:.1f} ms")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure entry point cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--check", action="store_true", help="Fail if over startup_budget.json")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    print(f"{'entry point':<22}{'median':>12}{'min':>12}{'max':>12}")
+    for name, stats in results.items():
+        print(
+            f"{name:<22}{stats['median_ms']:>10.1f}ms{stats['min_ms']:>10.1f}ms"
+            f"{stats['max_ms']:>10.1f}ms"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.check:
+        failures = check(results)
+        for failure in failures:
+            print(f"OVER BUDGET - {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
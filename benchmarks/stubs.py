@@ -0,0 +1,267 @@
+"""
+Local stand-ins for the LLM and web-search backends used by the benchmarks.
+
+StubLLMServer speaks the Ollama /api/chat protocol (JSON and NDJSON streaming) and
+follows a fixed script so that every entry point runs its full control flow:
+- Agents offered tools call the first tool once, then answer
+- Team coordinators delegate to each member listed in their system prompt, then answer
+- Text ReAct prompts (LlamaIndex) call each listed tool in turn, then give an Answer
+
+StubSearchServer answers Tavily /search and /extract requests with deterministic
+results, and can fail every Nth request (503) to exercise client retries. Point
+TAVILY_BASE_URL at it to use it from the agents.
+
+Both servers take a fixed latency (seconds) applied before every response.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+MEMBER_ID_PATTERN = re.compile(r"ID:\s*([\w\-]+)")
+REACT_TOOL_PATTERN = re.compile(r"Tool Name:\s*(\w+)")
+
+
+class _StubServer:
+    """Threaded HTTP server running in a background thread."""
+
+    handler_cls: type = BaseHTTPRequestHandler
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self.handler_cls)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "_StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_body(self, body: bytes, content_type: str = "application/json", status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _fake_arguments(parameters: Dict[str, Any], member_id: Optional[str]) -> Dict[str, Any]:
+    """Build plausible arguments for a tool from its JSON schema."""
+    arguments: Dict[str, Any] = {}
+    properties = parameters.get("properties", {})
+    for name in parameters.get("required", list(properties)):
+        kind = properties.get(name, {}).get("type", "string")
+        if name == "member_id" and member_id:
+            arguments[name] = member_id
+        elif "path" in name:
+            arguments[name] = "pyproject.toml"
+        elif kind == "integer" or kind == "number":
+            arguments[name] = 1
+        elif kind == "boolean":
+            arguments[name] = False
+        elif kind == "array":
+            arguments[name] = []
+        else:
+            arguments[name] = "benchmark query"
+    return arguments
+
+
+def _text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    return content if isinstance(content, str) else json.dumps(content)
+
+
+def script_reply(messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], words: int) -> Dict[str, Any]:
+    """
+    Decide the next assistant message for a conversation.
+
+    Args:
+        messages: Chat messages in Ollama format
+        tools: Tool schemas offered by the caller
+        words: Length of the final answer in words
+
+    Returns:
+        Assistant message (text or tool calls)
+    """
+    # ReAct observations come back as user messages; they do not start a new turn
+    last_user = max(
+        (
+            i
+            for i, m in enumerate(messages)
+            if m.get("role") == "user" and not _text(m).startswith("Observation:")
+        ),
+        default=0,
+    )
+    turn = messages[last_user:]
+    answer = " ".join(["benchmark"] * words)
+    system = "\n".join(_text(m) for m in messages if m.get("role") == "system")
+
+    if tools:
+        tool_results = sum(1 for m in turn if m.get("role") == "tool")
+        names = [t.get("function", {}).get("name") for t in tools]
+        members = MEMBER_ID_PATTERN.findall(system)
+        if "delegate_task_to_member" in names and members:
+            if tool_results < len(members):
+                tool = tools[names.index("delegate_task_to_member")]
+                return _tool_call(tool, members[tool_results])
+        elif tool_results == 0:
+            return _tool_call(tools[0], None)
+        return {"role": "assistant", "content": answer}
+
+    react_tools = REACT_TOOL_PATTERN.findall(system)
+    if react_tools:
+        observations = sum(1 for m in turn if _text(m).startswith("Observation:"))
+        if observations < len(react_tools):
+            tool = react_tools[observations]
+            return {
+                "role": "assistant",
+                "content": (
+                    f"Thought: I need to use {tool}.\n"
+                    f"Action: {tool}\n"
+                    'Action Input: {"query": "benchmark query"}'
+                ),
+            }
+        return {
+            "role": "assistant",
+            "content": f"Thought: I can answer without using any more tools.\nAnswer: {answer}",
+        }
+
+    return {"role": "assistant", "content": answer}
+
+
+def _tool_call(tool: Dict[str, Any], member_id: Optional[str]) -> Dict[str, Any]:
+    function = tool.get("function", {})
+    arguments = _fake_arguments(function.get("parameters", {}), member_id)
+    return {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [{"function": {"name": function.get("name"), "arguments": arguments}}],
+    }
+
+
+class _LLMHandler(_JSONHandler):
+    def do_POST(self):
+        stub: StubLLMServer = self.server.stub
+        body = self.read_json()
+        if self.path.endswith("/api/show"):
+            # LlamaIndex asks for the context window before chatting
+            self.send_body(json.dumps({"model_info": {"stub.context_length": 8192}}).encode())
+            return
+
+        stub.count()
+        time.sleep(stub.latency)
+        message = script_reply(body.get("messages", []), body.get("tools") or [], stub.words)
+        if message.get("tool_calls") or "\nAction:" in message["content"]:
+            stub.count_tool_call()
+        base = {"model": body.get("model", "stub"), "created_at": "2025-01-01T00:00:00Z"}
+        final = {
+            **base,
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 10,
+            "eval_count": stub.words,
+        }
+
+        if not body.get("stream"):
+            self.send_body(json.dumps({**final, "message": message}).encode())
+            return
+
+        chunks = []
+        if message.get("tool_calls"):
+            chunks.append({**base, "done": False, "message": message})
+        else:
+            for word in message["content"].split(" "):
+                chunks.append({**base, "done": False, "message": {"role": "assistant", "content": word + " "}})
+        chunks.append({**final, "message": {"role": "assistant", "content": ""}})
+        payload = b"".join(json.dumps(chunk).encode() + b"\n" for chunk in chunks)
+        self.send_body(payload, content_type="application/x-ndjson")
+
+
+class StubLLMServer(_StubServer):
+    """Scripted Ollama-compatible chat server."""
+
+    handler_cls = _LLMHandler
+
+    def __init__(self, latency: float = 0.0, words: int = 50, **kwargs):
+        super().__init__(latency=latency, **kwargs)
+        self.words = words
+        self.tool_calls = 0
+
+    def count_tool_call(self) -> None:
+        with self._lock:
+            self.tool_calls += 1
+
+
+class _SearchHandler(_JSONHandler):
+    def do_POST(self):
+        stub: StubSearchServer = self.server.stub
+        stub.count()
+        body = self.read_json()
+        time.sleep(stub.latency)
+        if stub.fail_every and stub.requests % stub.fail_every == 0:
+            self.send_body(json.dumps({"detail": {"error": "Stub failure"}}).encode(), status=503)
+            return
+        if self.path.rstrip("/").endswith("/extract"):
+            urls = body.get("urls") or []
+            results = [
+                {"url": url, "raw_content": f"Stub page content of {url}. " * 50}
+                for url in ([urls] if isinstance(urls, str) else urls)
+            ]
+            self.send_body(json.dumps({"results": results, "failed_results": []}).encode())
+            return
+        query = body.get("query", "")
+        results = [
+            {
+                "title": f"Result {i} for {query}",
+                "url": f"https://example.com/{i}",
+                "content": f"Stub content {i} about {query}. " * 20,
+                "score": round(1 - i / 10, 2),
+            }
+            for i in range(body.get("max_results") or 5)
+        ]
+        self.send_body(json.dumps({"query": query, "results": results, "response_time": stub.latency}).encode())
+
+
+class StubSearchServer(_StubServer):
+    """Tavily-compatible /search and /extract server returning deterministic results."""
+
+    handler_cls = _SearchHandler
+
+    def __init__(self, latency: float = 0.0, fail_every: int = 0, **kwargs):
+        super().__init__(latency=latency, **kwargs)
+        self.fail_every = fail_every
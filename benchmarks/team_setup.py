@@ -0,0 +1,72 @@
+"""
+Benchmark of team import time and per-request setup cost.
+
+For each team module, reports:
+- import: cumulative import time in a fresh interpreter (nothing is built)
+- first build: building the team on first use (models, search clients, and the Agno
+  import for the first team measured; later teams reuse already built members)
+- cached: getting the already built team, what every later request pays
+- rebuild: building the team again after reset_builders(), what a server that built
+  a team per request would pay
+
+Usage:
+    uv run python -m benchmarks.team_setup
+    uv run python -m benchmarks.team_setup --runs 50
+"""
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.startup import BENCH_ENV, measure_import
+
+TEAMS: Dict[str, Tuple[str, str]] = {
+    "investment_team": ("src.mas.investment_strategy", "get_investment_team"),
+    "investment_committee": ("src.mas.investment_strategy", "get_investment_committee"),
+    "due_diligence": ("src.mas.hybrid_teams", "get_due_diligence_committee"),
+}
+
+
+def timed_ms(fn: Callable[[], object], runs: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Team import time and per-request setup cost")
+    parser.add_argument("--runs", type=int, default=20, help="Repetitions per measurement (median reported)")
+    args = parser.parse_args()
+
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    from src.mas.team_spec import reset_builders
+
+    print(f"{'team':<22}{'import ms':>11}{'first build ms':>16}{'cached ms':>11}{'rebuild ms':>12}")
+    for name, (module, getter_name) in TEAMS.items():
+        imported = statistics.median(measure_import(module) for _ in range(3))
+        getter = getattr(importlib.import_module(module), getter_name)
+        reset_builders()
+        start = time.perf_counter()
+        getter()
+        first = (time.perf_counter() - start) * 1000
+        cached = timed_ms(getter, args.runs)
+
+        def rebuild() -> None:
+            reset_builders()
+            getter()
+
+        rebuilt = timed_ms(rebuild, args.runs)
+        print(f"{name:<22}{imported:>11.1f}{first:>16.1f}{cached:>11.4f}{rebuilt:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
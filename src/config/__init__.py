@@ -1,5 +1,42 @@
-"""Configuration module for model factory and utilities."""
-from src.config.model_factory import ModelFactory, ModelProvider
+"""
+Configuration module for model factory and utilities.
 
-__all__ = ["ModelFactory", "ModelProvider"]
+Every name below is imported from its submodule on first access, so importing one
+submodule (e.g. src.config.model_factory) does not pay for all the others.
+"""
+import importlib
+from typing import Any
 
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "ModelFactory": "model_factory",
+    "ModelProvider": "model_factory",
+    "ModelPool": "model_pool",
+    "PoolStats": "model_pool",
+    "get_model_pool": "model_pool",
+    "AdmissionController": "admission",
+    "admission_stats": "admission",
+    "admit_model": "admission",
+    "HistoryCompactor": "history_budget",
+    "compact_history": "history_budget",
+    "CacheMissError": "response_cache",
+    "ResponseCache": "response_cache",
+    "cache_model": "response_cache",
+    "get_response_cache": "response_cache",
+    "SearchCache": "search_cache",
+    "cached_tavily_client": "search_cache",
+    "cached_tavily_tools": "search_cache",
+    "get_search_cache": "search_cache",
+    "SingleFlight": "single_flight",
+    "coalesce": "single_flight",
+    "coalesce_toolkit": "single_flight",
+    "get_single_flight": "single_flight",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
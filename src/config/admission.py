@@ -0,0 +1,283 @@
+"""
+Per-endpoint admission control for model requests.
+
+Parallel team fan-out (e.g. delegate_to_all_members=True) can send many generations
+to one Ollama host at once, which makes every request slower or forces the server
+to swap models. An AdmissionController caps the number of in-flight requests per
+endpoint and queues the rest in priority order (coordinator calls ahead of member
+calls, FIFO within a priority). It works for both threads and asyncio tasks and
+records queue-wait metrics.
+
+Configuration via environment variables:
+- MODEL_MAX_IN_FLIGHT: Max concurrent requests per endpoint (default: 0 = unlimited)
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.config.model_wrappers import wrap_model
+
+PRIORITIES: Dict[str, int] = {"coordinator": 0, "member": 1}
+
+
+@dataclass
+class AdmissionStats:
+    """Queue and wait-time metrics for one endpoint."""
+
+    endpoint: str
+    max_in_flight: int
+    in_flight: int
+    queued: int
+    admitted: int
+    timeouts: int
+    max_queue_depth: int
+    avg_wait: float
+    p95_wait: float
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "event", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, priority: int, seq: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.seq = seq
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+class AdmissionController:
+    """Bounded in-flight counter with a priority FIFO queue, usable from threads and asyncio."""
+
+    def __init__(self, endpoint: str, max_in_flight: int, window: int = 500):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.endpoint = endpoint
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._timeouts = 0
+        self._max_queue_depth = 0
+        self._waits: deque = deque(maxlen=window)
+
+    def __deepcopy__(self, memo):
+        # Copies of a model must keep sharing the endpoint's limit
+        return self
+
+    def _try_admit(self, priority: int, loop=None) -> Optional[_Waiter]:
+        """Admit immediately if a slot is free and nobody is queued, else enqueue a waiter."""
+        with self._lock:
+            if self._in_flight < self.max_in_flight and not self._queued:
+                self._in_flight += 1
+                self._admitted += 1
+                self._waits.append(0.0)
+                return None
+            waiter = _Waiter(priority, next(self._seq), loop)
+            heapq.heappush(self._queue, waiter)
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw a waiter; returns True if it had already been granted a slot."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.cancelled = True
+            self._queued -= 1
+            self._timeouts += 1
+            return False
+
+    def acquire(self, priority: int = PRIORITIES["member"], timeout: Optional[float] = None) -> None:
+        """
+        Block until a request slot is available.
+
+        Args:
+            priority: Lower values are admitted first (see PRIORITIES)
+            timeout: Seconds to wait before raising TimeoutError (None = forever)
+        """
+        start = time.perf_counter()
+        waiter = self._try_admit(priority)
+        if waiter is None:
+            return
+        if not waiter.event.wait(timeout) and not self._abandon(waiter):
+            raise TimeoutError(f"Timed out waiting for a slot on {self.endpoint}")
+        self._record_wait(time.perf_counter() - start)
+
+    async def aacquire(self, priority: int = PRIORITIES["member"], timeout: Optional[float] = None) -> None:
+        """Asyncio version of acquire()."""
+        start = time.perf_counter()
+        waiter = self._try_admit(priority, loop=asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if self._abandon(waiter):
+                # Granted concurrently with the timeout/cancellation: hand the slot back
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                raise TimeoutError(f"Timed out waiting for a slot on {self.endpoint}") from e
+            raise
+        self._record_wait(time.perf_counter() - start)
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the next queued waiter if any."""
+        with self._lock:
+            while self._queue:
+                waiter = heapq.heappop(self._queue)
+                if waiter.cancelled:
+                    continue
+                waiter.granted = True
+                self._queued -= 1
+                self._admitted += 1
+                waiter.wake()
+                return
+            self._in_flight -= 1
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+
+    def stats(self) -> AdmissionStats:
+        """Return queue depth and wait-time metrics."""
+        with self._lock:
+            waits = sorted(self._waits)
+            return AdmissionStats(
+                endpoint=self.endpoint,
+                max_in_flight=self.max_in_flight,
+                in_flight=self._in_flight,
+                queued=self._queued,
+                admitted=self._admitted,
+                timeouts=self._timeouts,
+                max_queue_depth=self._max_queue_depth,
+                avg_wait=sum(waits) / len(waits) if waits else 0.0,
+                p95_wait=waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            )
+
+
+class AdmittedModelMixin:
+    """Mixin holding an admission slot for the duration of every model call."""
+
+    _admission: AdmissionController
+    _admission_priority: int = PRIORITIES["member"]
+
+    def invoke(self, *args, **kwargs):
+        self._admission.acquire(self._admission_priority)
+        try:
+            return super().invoke(*args, **kwargs)
+        finally:
+            self._admission.release()
+
+    async def ainvoke(self, *args, **kwargs):
+        await self._admission.aacquire(self._admission_priority)
+        try:
+            return await super().ainvoke(*args, **kwargs)
+        finally:
+            self._admission.release()
+
+    def invoke_stream(self, *args, **kwargs):
+        self._admission.acquire(self._admission_priority)
+        try:
+            yield from super().invoke_stream(*args, **kwargs)
+        finally:
+            self._admission.release()
+
+    async def ainvoke_stream(self, *args, **kwargs):
+        await self._admission.aacquire(self._admission_priority)
+        try:
+            async for chunk in super().ainvoke_stream(*args, **kwargs):
+                yield chunk
+        finally:
+            self._admission.release()
+
+
+def model_endpoint(model: Any) -> str:
+    """Return the endpoint a model talks to (host, base URL or provider name)."""
+    endpoint = getattr(model, "host", None) or getattr(model, "base_url", None)
+    if endpoint is None:
+        client = getattr(model, "client", None)
+        endpoint = getattr(getattr(client, "_client", None), "base_url", None)
+    if endpoint is None:
+        endpoint = getattr(model, "provider", None) or type(model).__name__
+    return str(endpoint).rstrip("/")
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(endpoint: str) -> Optional[AdmissionController]:
+    """
+    Return the shared controller for an endpoint (None when MODEL_MAX_IN_FLIGHT is unset).
+
+    Args:
+        endpoint: Endpoint identifier (see model_endpoint)
+    """
+    max_in_flight = int(os.getenv("MODEL_MAX_IN_FLIGHT", "0"))
+    if max_in_flight < 1:
+        return None
+    with _controllers_lock:
+        controller = _controllers.get(endpoint)
+        if controller is None:
+            controller = AdmissionController(endpoint, max_in_flight)
+            _controllers[endpoint] = controller
+        return controller
+
+
+def admission_stats() -> List[AdmissionStats]:
+    """Return metrics for every endpoint with an admission controller."""
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    return [controller.stats() for controller in controllers]
+
+
+def admit_model(model: Any, priority: str = "member", controller: Optional[AdmissionController] = None) -> Any:
+    """
+    Route a model's calls through its endpoint's admission controller.
+
+    Args:
+        model: Agno model instance to wrap
+        priority: "coordinator" or "member"
+        controller: Controller to use (defaults to the shared one for the model's endpoint)
+
+    Returns:
+        The wrapped model (the original instance when admission control is disabled)
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}, got '{priority}'")
+    controller = controller or get_admission_controller(model_endpoint(model))
+    if controller is None:
+        return model
+    return wrap_model(
+        model,
+        AdmittedModelMixin,
+        _admission=controller,
+        _admission_priority=PRIORITIES[priority],
+    )
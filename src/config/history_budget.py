@@ -0,0 +1,185 @@
+"""
+Token-budget compaction of the conversation history sent to a model.
+
+With add_history_to_context=True, Agno adds the messages of previous runs to every
+request (tagged from_history). Those runs include full tool outputs (e.g. 8000-token
+Tavily results), so a follow-up turn can carry tens of thousands of stale tokens.
+A HistoryCompactor keeps the history under a token budget instead of a run count:
+1. Old tool results are cut to a short excerpt, oldest first
+2. If that is not enough, whole turns (user message and everything after it) are
+   dropped, oldest first
+The current run's messages are never touched. The compaction plan is cached per
+history (message ids), so it is not recomputed on every model call of a run.
+
+Tokens are estimated as characters / 4, which is close enough for budgeting and
+needs no tokenizer.
+
+Configuration via environment variables:
+- HISTORY_MAX_TOKENS: Default history budget in tokens (default: 4000)
+- HISTORY_TOOL_RESULT_TOKENS: Tokens kept of an old tool result (default: 200)
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from src.config.model_wrappers import wrap_model
+
+CHARS_PER_TOKEN = 4
+
+_DROP = object()
+
+
+def estimate_tokens(message: Any) -> int:
+    """Rough token count of a message (content plus tool call arguments)."""
+    content = message.content
+    size = len(content) if isinstance(content, str) else len(json.dumps(content, default=str)) if content else 0
+    if message.tool_calls:
+        size += len(json.dumps(message.tool_calls, default=str))
+    return size // CHARS_PER_TOKEN + 4
+
+
+def _turns(history: List[Any]) -> List[List[int]]:
+    """Group history positions into turns, each starting at a user message."""
+    turns: List[List[int]] = []
+    for i, message in enumerate(history):
+        if message.role == "user" or not turns:
+            turns.append([])
+        turns[-1].append(i)
+    return turns
+
+
+class HistoryCompactor:
+    """Computes (and caches) how to fit history messages into a token budget."""
+
+    def __init__(self, max_tokens: int = 4000, tool_result_tokens: int = 200, cache_size: int = 256):
+        self.max_tokens = max_tokens
+        self.tool_result_tokens = tool_result_tokens
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo):
+        # Copies of a model keep sharing the plan cache
+        return self
+
+    def _plan(self, history: List[Any]) -> Tuple:
+        """One entry per history message: None (keep), _DROP or replacement content."""
+        plan: List[Any] = [None] * len(history)
+        tokens = [estimate_tokens(m) for m in history]
+        total = sum(tokens)
+
+        keep_chars = self.tool_result_tokens * CHARS_PER_TOKEN
+        for i, message in enumerate(history):
+            if total <= self.max_tokens:
+                break
+            content = message.content
+            if message.role != "tool" or not isinstance(content, str) or len(content) <= keep_chars:
+                continue
+            excerpt = (
+                f"{content[:keep_chars]}\n[... {len(content) - keep_chars} characters of an earlier "
+                f"tool result omitted to save context ...]"
+            )
+            plan[i] = excerpt
+            total -= tokens[i] - (len(excerpt) // CHARS_PER_TOKEN + 4)
+
+        for turn in _turns(history):
+            if total <= self.max_tokens:
+                break
+            for i in turn:
+                total -= tokens[i] if plan[i] is None else len(plan[i]) // CHARS_PER_TOKEN + 4
+                plan[i] = _DROP
+        return tuple(plan)
+
+    def compact(self, messages: List[Any]) -> List[Any]:
+        """
+        Return the messages with their history part fitted into the budget.
+
+        Args:
+            messages: Messages passed to the model (history tagged from_history)
+
+        Returns:
+            List: A new list; history messages that changed are copies, others are unchanged
+        """
+        positions = [i for i, m in enumerate(messages) if m.from_history]
+        if not positions:
+            return messages
+        history = [messages[i] for i in positions]
+        key = (self.max_tokens, self.tool_result_tokens, tuple((m.id, len(str(m.content or ""))) for m in history))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+        if plan is None:
+            plan = self._plan(history)
+            with self._lock:
+                self.misses += 1
+                self._plans[key] = plan
+                if len(self._plans) > self.cache_size:
+                    self._plans.popitem(last=False)
+        if all(action is None for action in plan):
+            return messages
+
+        actions = dict(zip(positions, plan))
+        compacted = []
+        for i, message in enumerate(messages):
+            action = actions.get(i)
+            if action is _DROP:
+                continue
+            if action is not None:
+                message = message.model_copy(update={"content": action})
+            compacted.append(message)
+        return compacted
+
+
+class CompactedHistoryModelMixin:
+    """Mixin fitting the history part of every request into a token budget (see wrap_model)."""
+
+    _history_compactor: HistoryCompactor
+
+    def invoke(self, messages, *args, **kwargs):
+        return super().invoke(self._history_compactor.compact(messages), *args, **kwargs)
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        return await super().ainvoke(self._history_compactor.compact(messages), *args, **kwargs)
+
+    def invoke_stream(self, messages, *args, **kwargs):
+        yield from super().invoke_stream(self._history_compactor.compact(messages), *args, **kwargs)
+
+    async def ainvoke_stream(self, messages, *args, **kwargs):
+        async for chunk in super().ainvoke_stream(self._history_compactor.compact(messages), *args, **kwargs):
+            yield chunk
+
+
+def compact_history(
+    model: Any,
+    max_tokens: Optional[int] = None,
+    tool_result_tokens: Optional[int] = None,
+) -> Any:
+    """
+    Keep the conversation history a model receives under a token budget.
+
+    Use with add_history_to_context=True and a generous num_history_runs; the budget
+    then decides how much history is sent.
+
+    Args:
+        model: Agno model instance to wrap
+        max_tokens: History budget in tokens (defaults to HISTORY_MAX_TOKENS)
+        tool_result_tokens: Tokens kept of each old tool result (defaults to HISTORY_TOOL_RESULT_TOKENS)
+
+    Returns:
+        The wrapped model
+    """
+    compactor = HistoryCompactor(
+        max_tokens=max_tokens if max_tokens is not None else int(os.getenv("HISTORY_MAX_TOKENS", "4000")),
+        tool_result_tokens=(
+            tool_result_tokens
+            if tool_result_tokens is not None
+            else int(os.getenv("HISTORY_TOOL_RESULT_TOKENS", "200"))
+        ),
+    )
+    return wrap_model(model, CompactedHistoryModelMixin, _history_compactor=compactor)
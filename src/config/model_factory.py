@@ -4,28 +4,117 @@ Model Factory for creating Agno model instances based on configuration.
 Supports:
 - Ollama (local and cloud)
 - OpenAI
+- Router over several Ollama/OpenAI backends (see model_router.py)
 
 Configuration via environment variables:
-- MODEL_PROVIDER: "ollama" or "openai" (default: "ollama")
+- MODEL_PROVIDER: "ollama", "openai" or "router" (default: "ollama")
 - For Ollama: OLLAMA_MODEL_ID, OLLAMA_TEMPERATURE
 - For OpenAI: OPENAI_MODEL_ID, OPENAI_TEMPERATURE, OPENAI_API_KEY
+- For the router: ROUTER_BACKENDS (e.g. "ollama@http://gpu1:11434,openai")
+
+Models are shared through the process-wide ModelPool (see model_pool.py), so
+agents asking for the same configuration reuse one instance and one keep-alive
+HTTP transport per endpoint. Pass shared=False to get a private instance.
+
+Set LLM_CACHE_MODE (or pass cache=...) to serve completions from the disk-backed
+response cache (see response_cache.py), and MODEL_MAX_IN_FLIGHT to cap concurrent
+requests per endpoint (see admission.py).
+
+Importing this module is cheap: provider modules are imported the first time
+create_model() resolves to them, and the .env file is located and loaded once,
+on first use (see load_config). The pool, admission and response cache modules are
+likewise only imported by create_model().
 """
+import importlib
 import os
-from typing import Literal, Optional
-from agno.models.ollama import Ollama
-from dotenv import load_dotenv, find_dotenv
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple
 
-load_dotenv(find_dotenv())
-
-# Conditional OpenAI import - only import if needed
-try:
+if TYPE_CHECKING:
+    from agno.models.ollama import Ollama
     from agno.models.openai.chat import OpenAIChat
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OpenAIChat = None
-    OPENAI_AVAILABLE = False
 
-ModelProvider = Literal["ollama", "openai"]
+    from src.config.model_pool import ModelPool
+
+ModelProvider = Literal["ollama", "openai", "router"]
+
+# Provider registry: name -> ("module:Class", install hint)
+PROVIDERS: Dict[str, tuple] = {
+    "ollama": ("agno.models.ollama:Ollama", "pip install ollama"),
+    "openai": ("agno.models.openai.chat:OpenAIChat", "pip install openai"),
+    "router": ("src.config.model_router:ModelRouter", "pip install agno"),
+}
+
+_provider_classes: Dict[str, type] = {}
+
+
+@lru_cache(maxsize=None)
+def load_config() -> str:
+    """
+    Locate and load the .env file once per process.
+
+    Returns:
+        str: Path of the loaded .env file ("" if none was found)
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    dotenv_path = find_dotenv()
+    load_dotenv(dotenv_path)
+    return dotenv_path
+
+
+def load_provider(provider: str) -> type:
+    """
+    Import and return the model class registered for a provider.
+
+    The import happens on first use and the class is cached afterwards.
+
+    Args:
+        provider: Provider name registered in PROVIDERS
+
+    Returns:
+        type: Agno model class for the provider
+    """
+    model_cls = _provider_classes.get(provider)
+    if model_cls is not None:
+        return model_cls
+
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unsupported provider: {provider}")
+    target, install_hint = PROVIDERS[provider]
+    module_name, class_name = target.split(":")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"{provider.capitalize()} support not available. Install with: {install_hint}"
+        ) from e
+
+    model_cls = getattr(module, class_name)
+    _provider_classes[provider] = model_cls
+    return model_cls
+
+
+def parse_backends(spec: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse a ROUTER_BACKENDS value into (provider, endpoint) pairs.
+
+    Args:
+        spec: Comma-separated provider[@endpoint] entries
+
+    Returns:
+        List of (provider, endpoint or None)
+    """
+    backends = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        provider, _, endpoint = entry.partition("@")
+        backends.append((provider.strip().lower(), endpoint.strip() or None))
+    if not backends:
+        raise ValueError("ROUTER_BACKENDS must list at least one provider[@endpoint]")
+    return backends
 
 
 class ModelFactory:
@@ -34,10 +123,11 @@ class ModelFactory:
     @staticmethod
     def get_provider() -> ModelProvider:
         """Get the model provider from environment variable."""
+        load_config()
         provider = os.getenv("MODEL_PROVIDER", "ollama").lower()
-        if provider not in ["ollama", "openai"]:
+        if provider not in PROVIDERS:
             raise ValueError(
-                f"MODEL_PROVIDER must be 'ollama' or 'openai', got '{provider}'"
+                f"MODEL_PROVIDER must be 'ollama', 'openai' or 'router', got '{provider}'"
             )
         return provider
 
@@ -45,6 +135,10 @@ class ModelFactory:
     def create_model(
         model_id: Optional[str] = None,
         temperature: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None,
+        shared: bool = True,
+        cache: Optional[str] = None,
+        priority: str = "member",
     ):
         """
         Create a model instance based on configuration.
@@ -52,35 +146,153 @@ class ModelFactory:
         Args:
             model_id: Override model ID (optional, uses env var if not provided)
             temperature: Override temperature (optional, uses env var if not provided)
+            options: Extra provider options (Ollama options / OpenAIChat parameters)
+            shared: Return the pooled instance for this configuration (default: True)
+            cache: Response cache mode - off, readwrite, record or replay
+                (optional, uses LLM_CACHE_MODE if not provided)
+            priority: Admission priority when MODEL_MAX_IN_FLIGHT is set -
+                "coordinator" calls are queued ahead of "member" calls
 
         Returns:
-            Model instance (Ollama or OpenAIChat)
+            Model instance (Ollama, OpenAIChat or ModelRouter)
         """
+        from src.config.model_pool import get_model_pool, make_pool_key
+        from src.config.response_cache import get_cache_mode
+
         provider = ModelFactory.get_provider()
+        pool = get_model_pool() if shared else None
 
+        if provider == "router":
+            backends = parse_backends(os.getenv("ROUTER_BACKENDS", ""))
+            builds = [
+                ModelFactory._backend_builder(
+                    backend,
+                    model_id=model_id,
+                    temperature=temperature,
+                    options=options,
+                    pool=pool,
+                    endpoint=endpoint,
+                )
+                for backend, endpoint in backends
+            ]
+            final_model_id = ",".join(
+                f"{backend}:{build.keywords['model_id']}@{endpoint or ''}"
+                for (backend, endpoint), build in zip(backends, builds)
+            )
+            final_temperature = builds[0].keywords["temperature"]
+            build = partial(
+                ModelFactory._create_router_model,
+                builds=builds,
+                temperature=final_temperature,
+                priority=priority,
+            )
+        else:
+            build = ModelFactory._backend_builder(
+                provider,
+                model_id=model_id,
+                temperature=temperature,
+                options=options,
+                pool=pool,
+            )
+            final_model_id = build.keywords["model_id"]
+            final_temperature = build.keywords["temperature"]
+            build = partial(ModelFactory._create_admitted_model, build=build, priority=priority)
+
+        cache_mode = cache or get_cache_mode()
+        if cache_mode != "off":
+            build = partial(
+                ModelFactory._create_cached_model,
+                build=build,
+                mode=cache_mode,
+                force=os.getenv("LLM_CACHE_FORCE", "false").lower() == "true",
+            )
+
+        if pool is None:
+            return build()
+        key = make_pool_key(
+            provider,
+            final_model_id,
+            final_temperature,
+            options,
+            variant={"cache": cache_mode, "priority": priority},
+        )
+        return pool.get_or_create(key, build)
+
+    @staticmethod
+    def _backend_builder(
+        provider: str,
+        model_id: Optional[str] = None,
+        temperature: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None,
+        pool: Optional["ModelPool"] = None,
+        endpoint: Optional[str] = None,
+    ) -> partial:
+        """Resolve settings for a single provider and return a partial that builds it."""
         if provider == "ollama":
-            return ModelFactory._create_ollama_model(
+            final_model_id, final_temperature = ModelFactory._resolve_ollama_settings(
                 model_id=model_id,
                 temperature=temperature,
             )
+            return partial(
+                ModelFactory._create_ollama_model,
+                model_id=final_model_id,
+                temperature=final_temperature,
+                options=options,
+                pool=pool,
+                host=endpoint,
+            )
         elif provider == "openai":
-            if not OPENAI_AVAILABLE:
-                raise ImportError(
-                    "OpenAI support not available. Install with: pip install openai"
-                )
-            return ModelFactory._create_openai_model(
+            final_model_id, final_temperature = ModelFactory._resolve_openai_settings(
                 model_id=model_id,
                 temperature=temperature,
             )
+            return partial(
+                ModelFactory._create_openai_model,
+                model_id=final_model_id,
+                temperature=final_temperature,
+                options=options,
+                pool=pool,
+                base_url=endpoint,
+            )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
     @staticmethod
-    def _create_ollama_model(
+    def _create_admitted_model(build, priority: str):
+        """Build a model and route its calls through its endpoint's admission controller."""
+        from src.config.admission import admit_model
+
+        return admit_model(build(), priority=priority)
+
+    @staticmethod
+    def _create_router_model(builds, temperature: float, priority: str = "member"):
+        """Create a ModelRouter over the given backend builders."""
+        ModelRouter = load_provider("router")
+        return ModelRouter(
+            backends=[
+                ModelFactory._create_admitted_model(build, priority=priority)
+                for build in builds
+            ],
+            temperature=temperature,
+            hedge=os.getenv("ROUTER_HEDGE", "true").lower() == "true",
+            hedge_min_samples=int(os.getenv("ROUTER_HEDGE_MIN_SAMPLES", "5")),
+            max_error_rate=float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5")),
+            cooldown=float(os.getenv("ROUTER_COOLDOWN", "30")),
+        )
+
+    @staticmethod
+    def _create_cached_model(build, mode: str, force: bool):
+        """Build a model and serve its completions from the response cache."""
+        from src.config.response_cache import cache_model
+
+        return cache_model(build(), mode=mode, force=force)
+
+    @staticmethod
+    def _resolve_ollama_settings(
         model_id: Optional[str] = None,
         temperature: Optional[float] = None,
-    ) -> Ollama:
-        """Create an Ollama model instance."""
+    ) -> tuple:
+        """Resolve the Ollama model ID and temperature from arguments or env vars."""
         # Determine model ID
         if model_id:
             final_model_id = model_id
@@ -102,17 +314,47 @@ class ModelFactory:
                 )
             final_temperature = float(temp_env)
 
+        return final_model_id, final_temperature
+
+    @staticmethod
+    def _create_ollama_model(
+        model_id: str,
+        temperature: float,
+        options: Optional[Dict[str, Any]] = None,
+        pool: Optional["ModelPool"] = None,
+        host: Optional[str] = None,
+    ) -> "Ollama":
+        """Create an Ollama model instance."""
+        Ollama = load_provider("ollama")
+        model_options = {"temperature": temperature, **(options or {})}
+        if pool is None:
+            return Ollama(id=model_id, options=model_options, host=host)
+
+        from ollama import AsyncClient, Client
+
+        api_key = os.getenv("OLLAMA_API_KEY")
+        default_host = "https://ollama.com" if api_key else "http://localhost:11434"
+        host = host or os.getenv("OLLAMA_HOST") or default_host
+        headers = {"authorization": f"Bearer {api_key}"} if api_key else None
+
         return Ollama(
-            id=final_model_id,
-            options={"temperature": final_temperature}
+            id=model_id,
+            host=host,
+            options=model_options,
+            client=Client(host=host, headers=headers, transport=pool.transport(host)),
+            async_client=AsyncClient(
+                host=host,
+                headers=headers,
+                transport=pool.transport(host, asynchronous=True),
+            ),
         )
 
     @staticmethod
-    def _create_openai_model(
+    def _resolve_openai_settings(
         model_id: Optional[str] = None,
         temperature: Optional[float] = None,
-    ) -> OpenAIChat:
-        """Create an OpenAI model instance."""
+    ) -> tuple:
+        """Resolve the OpenAI model ID and temperature from arguments or env vars."""
         # Determine model ID
         if model_id:
             final_model_id = model_id
@@ -123,13 +365,6 @@ class ModelFactory:
                     "OPENAI_MODEL_ID environment variable is required"
                 )
 
-        # Get API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is required"
-            )
-
         # Determine temperature
         if temperature is not None:
             final_temperature = temperature
@@ -141,9 +376,47 @@ class ModelFactory:
                 # Default temperature for OpenAI if not specified
                 final_temperature = 0.7
 
-        return OpenAIChat(
-            id=final_model_id,
+        return final_model_id, final_temperature
+
+    @staticmethod
+    def _create_openai_model(
+        model_id: str,
+        temperature: float,
+        options: Optional[Dict[str, Any]] = None,
+        pool: Optional["ModelPool"] = None,
+        base_url: Optional[str] = None,
+    ) -> "OpenAIChat":
+        """Create an OpenAI model instance."""
+        OpenAIChat = load_provider("openai")
+        # Get API key
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "OPENAI_API_KEY environment variable is required"
+            )
+
+        http_client = None
+        if pool is not None:
+            import httpx
+
+            endpoint = base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+            http_client = httpx.Client(transport=pool.transport(endpoint))
+
+        model = OpenAIChat(
+            id=model_id,
             api_key=api_key,
-            temperature=final_temperature,
+            base_url=base_url,
+            temperature=temperature,
+            http_client=http_client,
+            **(options or {}),
         )
+        if pool is not None:
+            from openai import AsyncOpenAI
+
+            # Agno would otherwise use its global async client, bound to the first event loop
+            model.async_client = AsyncOpenAI(
+                **model._get_client_params(),
+                http_client=httpx.AsyncClient(transport=pool.transport(endpoint, asynchronous=True)),
+            )
+        return model
 
@@ -0,0 +1,226 @@
+"""
+Model Pool for sharing Agno model instances and HTTP connections.
+
+Every call to ModelFactory.create_model() used to build a fresh model object with
+its own HTTP client. The pool instead hands out one shared instance per
+(provider, model_id, temperature, options) key, and all models talking to the same
+endpoint reuse a single keep-alive transport.
+
+Asynchronous connections belong to the event loop that opened them, so the async
+transport keeps one connection pool per event loop: cached agents and teams keep
+working when used from a new loop (e.g. successive asyncio.run() calls).
+
+Configuration via environment variables:
+- MODEL_POOL_MAX_CONNECTIONS: Max open connections per endpoint (default: 20)
+- MODEL_POOL_MAX_KEEPALIVE: Max idle keep-alive connections per endpoint (default: 10)
+- MODEL_POOL_KEEPALIVE_EXPIRY: Seconds before an idle connection is closed (default: 30)
+"""
+import asyncio
+import json
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of model pool usage."""
+
+    hits: int = 0
+    misses: int = 0
+    models: int = 0
+    endpoints: int = 0
+    live_connections: int = 0
+    connections_by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+
+def make_pool_key(
+    provider: str,
+    model_id: str,
+    temperature: float,
+    options: Optional[Dict[str, Any]] = None,
+    variant: Optional[Dict[str, Any]] = None,
+) -> Tuple[Hashable, ...]:
+    """
+    Build a hashable pool key, normalizing the options dict.
+
+    Args:
+        provider: Provider name
+        model_id: Model identifier
+        temperature: Sampling temperature
+        options: Extra provider options
+        variant: Wrapper settings (e.g. cache mode) that make an instance distinct
+    """
+    options_key = json.dumps(options or {}, sort_keys=True, default=str)
+    variant_key = json.dumps(variant or {}, sort_keys=True, default=str)
+    return (provider, model_id, float(temperature), options_key, variant_key)
+
+
+class LoopLocalAsyncTransport:
+    """httpx async transport with a separate connection pool per running event loop."""
+
+    def __init__(self, **kwargs: Any):
+        """
+        Args:
+            **kwargs: Arguments of each httpx.AsyncHTTPTransport (e.g. limits)
+        """
+        self._kwargs = kwargs
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _current(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                import httpx
+
+                # Connections of closed loops can never be used again
+                for closed in [old for old in self._transports if old.is_closed()]:
+                    del self._transports[closed]
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._kwargs)
+            return transport
+
+    def transports(self) -> List[Any]:
+        """Transports of every event loop still alive."""
+        with self._lock:
+            return list(self._transports.values())
+
+    async def handle_async_request(self, request: Any) -> Any:
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the running event loop."""
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    async def __aenter__(self) -> "LoopLocalAsyncTransport":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+class ModelPool:
+    """Registry of shared model instances and per-endpoint HTTP transports."""
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._models: Dict[Tuple[Hashable, ...], Any] = {}
+        self._transports: Dict[Tuple[str, bool], Any] = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(self, key: Tuple[Hashable, ...], build: Callable[[], Any]) -> Any:
+        """
+        Return the shared model for key, building it on first request.
+
+        Args:
+            key: Pool key (see make_pool_key)
+            build: Zero-argument callable creating the model instance
+
+        Returns:
+            Shared model instance
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._hits += 1
+                return model
+            self._misses += 1
+            model = build()
+            self._models[key] = model
+            return model
+
+    def transport(self, endpoint: str, asynchronous: bool = False):
+        """
+        Return the shared keep-alive transport for an endpoint.
+
+        Args:
+            endpoint: Base URL of the provider (e.g. http://localhost:11434)
+            asynchronous: Return an async transport (one connection pool per event loop)
+                instead of an HTTPTransport
+
+        Returns:
+            httpx transport shared by every client of that endpoint
+        """
+        key = (endpoint.rstrip("/"), asynchronous)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                import httpx
+
+                limits = httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                )
+                transport_cls = LoopLocalAsyncTransport if asynchronous else httpx.HTTPTransport
+                transport = transport_cls(limits=limits)
+                self._transports[key] = transport
+            return transport
+
+    def stats(self) -> PoolStats:
+        """Return hit/miss counters and the number of live connections."""
+        with self._lock:
+            by_endpoint: Dict[str, int] = {}
+            for (endpoint, _), transport in self._transports.items():
+                by_endpoint[endpoint] = by_endpoint.get(endpoint, 0) + _count_connections(transport)
+            return PoolStats(
+                hits=self._hits,
+                misses=self._misses,
+                models=len(self._models),
+                endpoints=len(by_endpoint),
+                live_connections=sum(by_endpoint.values()),
+                connections_by_endpoint=by_endpoint,
+            )
+
+    def clear(self) -> None:
+        """Drop all shared models and close the sync transports."""
+        with self._lock:
+            for (_, asynchronous), transport in self._transports.items():
+                if not asynchronous:
+                    transport.close()
+            self._transports.clear()
+            self._models.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+def _count_connections(transport) -> int:
+    """Count open connections in an httpx transport's connection pool."""
+    if isinstance(transport, LoopLocalAsyncTransport):
+        return sum(_count_connections(t) for t in transport.transports())
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    return len(connections) if connections is not None else 0
+
+
+_default_pool: Optional[ModelPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """Return the process-wide model pool, configured from environment variables."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ModelPool(
+                    max_connections=int(os.getenv("MODEL_POOL_MAX_CONNECTIONS", "20")),
+                    max_keepalive_connections=int(os.getenv("MODEL_POOL_MAX_KEEPALIVE", "10")),
+                    keepalive_expiry=float(os.getenv("MODEL_POOL_KEEPALIVE_EXPIRY", "30")),
+                )
+    return _default_pool
@@ -0,0 +1,55 @@
+"""
+Helpers for layering behaviour (caching, admission control, ...) onto Agno models.
+
+Agno agents expect a concrete Model subclass (Ollama, OpenAIChat, ...), so instead of
+proxy objects we re-create the instance as a subclass that puts a mixin in front of
+the provider class. The mixin overrides invoke/ainvoke/invoke_stream/ainvoke_stream
+and calls super() to reach the provider implementation.
+"""
+import threading
+from typing import Any, Dict, Tuple
+
+_wrapped_classes: Dict[Tuple[type, type], type] = {}
+_lock = threading.Lock()
+
+
+def wrap_model(model: Any, mixin: type, **attributes: Any) -> Any:
+    """
+    Put a mixin in front of a model's class and attach the mixin's state.
+
+    Args:
+        model: Agno model instance to wrap
+        mixin: Mixin class overriding some of the model's invoke methods
+        **attributes: Instance attributes the mixin relies on
+
+    Returns:
+        A copy of the model (sharing its field values) whose class includes the mixin
+    """
+    base = type(model)
+    if issubclass(base, mixin):
+        wrapped_model = model
+    else:
+        key = (mixin, base)
+        with _lock:
+            wrapped = _wrapped_classes.get(key)
+            if wrapped is None:
+                name = f"{mixin.__name__.replace('ModelMixin', '')}{base.__name__}"
+                wrapped = type(name, (mixin, base), {"__module__": base.__module__})
+                _wrapped_classes[key] = wrapped
+        # Assigning __class__ is rejected for Agno models ("object layout differs"),
+        # so build the wrapped instance without __init__ and share the field values
+        wrapped_model = wrapped.__new__(wrapped)
+        wrapped_model.__dict__.update(model.__dict__)
+
+    for name, value in attributes.items():
+        setattr(wrapped_model, name, value)
+    return wrapped_model
+
+
+def get_model_temperature(model: Any) -> float:
+    """Return a model's sampling temperature (OpenAI field or Ollama options)."""
+    temperature = getattr(model, "temperature", None)
+    if temperature is None:
+        options = getattr(model, "options", None) or {}
+        temperature = options.get("temperature")
+    return float(temperature) if temperature is not None else 0.0
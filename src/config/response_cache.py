@@ -0,0 +1,423 @@
+"""
+Disk-backed LLM response cache for models created by ModelFactory.
+
+Completions (including streamed chunks and tool-call payloads) are stored in a local
+SQLite file, keyed by a stable hash of (provider, model id, temperature, messages,
+tool schemas, response format). Entries are evicted least-recently-used once the
+store exceeds its size budget, and dropped once older than the maximum age.
+
+Modes:
+- off: No caching (default)
+- readwrite: Serve hits from the cache, store misses
+- record: Always call the model and overwrite the stored response
+- replay: Serve only from the cache; a miss raises CacheMissError (offline runs)
+
+Sampled completions (temperature > 0) bypass the cache in readwrite mode unless
+force=True. Record and replay always cache, since their purpose is reproducibility.
+
+Configuration via environment variables:
+- LLM_CACHE_MODE: off, readwrite, record or replay (default: off)
+- LLM_CACHE_PATH: SQLite file (default: tmp_dbs/llm_cache.db)
+- LLM_CACHE_MAX_BYTES: Size budget in bytes (default: 268435456)
+- LLM_CACHE_MAX_AGE: Maximum entry age in seconds (default: 604800)
+- LLM_CACHE_FORCE: Cache even when temperature > 0 (default: false)
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Literal, Optional
+
+from src.config.model_wrappers import get_model_temperature, wrap_model
+
+logger = logging.getLogger(__name__)
+
+CacheMode = Literal["off", "readwrite", "record", "replay"]
+CACHE_MODES = ("off", "readwrite", "record", "replay")
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+@dataclass
+class CacheStats:
+    """Counters for a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    total_bytes: int = 0
+
+
+class ResponseCache:
+    """SQLite store of pickled model responses with LRU and age-based eviction."""
+
+    def __init__(
+        self,
+        path: str = "tmp_dbs/llm_cache.db",
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: Optional[float] = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+
+    def __deepcopy__(self, memo):
+        # Agno deep-copies models per run; every copy must share the same store
+        return self
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            payload, created_at = row
+            if self.max_age is not None and now - created_at > self.max_age:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._stats.misses += 1
+                self._stats.evictions += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._stats.hits += 1
+        return pickle.loads(payload)
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        Store a value under key and evict entries over the age or size budget.
+
+        Returns:
+            bool: False if the value could not be serialized
+        """
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Not caching unpicklable response: {e}")
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._stats.stores += 1
+            self._evict(now)
+        return True
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones until under max_bytes."""
+        if self.max_age is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.max_age,)
+            )
+            self._stats.evictions += max(cursor.rowcount, 0)
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale: List[str] = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append(key)
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in stale])
+        self._stats.evictions += len(stale)
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and current store size."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                bypasses=self._stats.bypasses,
+                stores=self._stats.stores,
+                evictions=self._stats.evictions,
+                entries=entries,
+                total_bytes=total,
+            )
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache."""
+        with self._lock:
+            self._stats.bypasses += 1
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _message_to_dict(message: Any) -> dict:
+    """Extract the cache-relevant fields of an Agno message."""
+    if isinstance(message, dict):
+        return message
+    return {
+        "role": getattr(message, "role", None),
+        "content": getattr(message, "content", None),
+        "name": getattr(message, "name", None),
+        "tool_calls": getattr(message, "tool_calls", None),
+        "tool_call_id": getattr(message, "tool_call_id", None),
+    }
+
+
+def _response_format_key(response_format: Any) -> Any:
+    """Describe a response format (pydantic class, dict or None) as JSON data."""
+    if response_format is None or isinstance(response_format, (dict, str)):
+        return response_format
+    schema = getattr(response_format, "model_json_schema", None)
+    return schema() if callable(schema) else repr(response_format)
+
+
+def make_cache_key(
+    provider: str,
+    model_id: str,
+    temperature: float,
+    messages: List[Any],
+    tools: Optional[List[Any]] = None,
+    response_format: Any = None,
+    stream: bool = False,
+) -> str:
+    """
+    Build a stable SHA-256 key for a model request.
+
+    Args:
+        provider: Provider name (e.g. "Ollama")
+        model_id: Model identifier
+        temperature: Sampling temperature
+        messages: Conversation messages sent to the model
+        tools: Tool schemas offered to the model
+        response_format: Structured output format, if any
+        stream: Whether the response is a list of streamed chunks
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    payload = {
+        "provider": provider,
+        "model_id": model_id,
+        "temperature": temperature,
+        "messages": [_message_to_dict(m) for m in messages],
+        "tools": tools or [],
+        "response_format": _response_format_key(response_format),
+        "stream": stream,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CachedModelMixin:
+    """Mixin serving model responses from a ResponseCache (see wrap_model)."""
+
+    _response_cache: ResponseCache
+    _cache_mode: CacheMode = "readwrite"
+    _cache_force: bool = False
+
+    def _cache_key(self, messages, tools, response_format, stream: bool) -> Optional[str]:
+        """Return the cache key for a request, or None if the cache is bypassed."""
+        temperature = get_model_temperature(self)
+        if self._cache_mode == "readwrite" and temperature > 0 and not self._cache_force:
+            self._response_cache.record_bypass()
+            return None
+        return make_cache_key(
+            provider=getattr(self, "provider", None) or type(self).__name__,
+            model_id=self.id,
+            temperature=temperature,
+            messages=messages,
+            tools=tools,
+            response_format=response_format,
+            stream=stream,
+        )
+
+    def _cached(self, key: str) -> Optional[Any]:
+        """Look up a key according to the cache mode."""
+        if self._cache_mode == "record":
+            return None
+        cached = self._response_cache.get(key)
+        if cached is None and self._cache_mode == "replay":
+            raise CacheMissError(f"No recorded response for {self.id} (key {key[:12]})")
+        return cached
+
+    def invoke(self, messages, assistant_message=None, response_format=None, tools=None, tool_choice=None, **kwargs):
+        key = self._cache_key(messages, tools, response_format, stream=False)
+        if key is not None:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        response = super().invoke(
+            messages=messages,
+            assistant_message=assistant_message,
+            response_format=response_format,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        )
+        if key is not None:
+            self._response_cache.put(key, response)
+        return response
+
+    async def ainvoke(self, messages, assistant_message=None, response_format=None, tools=None, tool_choice=None, **kwargs):
+        key = self._cache_key(messages, tools, response_format, stream=False)
+        if key is not None:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        response = await super().ainvoke(
+            messages=messages,
+            assistant_message=assistant_message,
+            response_format=response_format,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        )
+        if key is not None:
+            self._response_cache.put(key, response)
+        return response
+
+    def invoke_stream(self, messages, assistant_message=None, response_format=None, tools=None, tool_choice=None, **kwargs) -> Iterator[Any]:
+        key = self._cache_key(messages, tools, response_format, stream=True)
+        if key is not None:
+            cached = self._cached(key)
+            if cached is not None:
+                yield from cached
+                return
+        chunks = []
+        for chunk in super().invoke_stream(
+            messages=messages,
+            assistant_message=assistant_message,
+            response_format=response_format,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        ):
+            chunks.append(chunk)
+            yield chunk
+        # Only complete streams are stored
+        if key is not None:
+            self._response_cache.put(key, chunks)
+
+    async def ainvoke_stream(self, messages, assistant_message=None, response_format=None, tools=None, tool_choice=None, **kwargs):
+        key = self._cache_key(messages, tools, response_format, stream=True)
+        if key is not None:
+            cached = self._cached(key)
+            if cached is not None:
+                for chunk in cached:
+                    yield chunk
+                return
+        chunks = []
+        async for chunk in super().ainvoke_stream(
+            messages=messages,
+            assistant_message=assistant_message,
+            response_format=response_format,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        ):
+            chunks.append(chunk)
+            yield chunk
+        if key is not None:
+            self._response_cache.put(key, chunks)
+
+
+def cache_model(
+    model: Any,
+    cache: Optional[ResponseCache] = None,
+    mode: CacheMode = "readwrite",
+    force: bool = False,
+) -> Any:
+    """
+    Serve a model's completions from a response cache.
+
+    Args:
+        model: Agno model instance to wrap
+        cache: Store to use (defaults to the process-wide cache)
+        mode: readwrite, record or replay
+        force: Cache sampled completions (temperature > 0) in readwrite mode
+
+    Returns:
+        The wrapped model
+    """
+    if mode not in CACHE_MODES or mode == "off":
+        raise ValueError(f"mode must be one of readwrite, record, replay, got '{mode}'")
+    return wrap_model(
+        model,
+        CachedModelMixin,
+        _response_cache=cache or get_response_cache(),
+        _cache_mode=mode,
+        _cache_force=force,
+    )
+
+
+def get_cache_mode() -> CacheMode:
+    """Get the cache mode from the LLM_CACHE_MODE environment variable."""
+    mode = os.getenv("LLM_CACHE_MODE", "off").lower()
+    if mode not in CACHE_MODES:
+        raise ValueError(f"LLM_CACHE_MODE must be one of {', '.join(CACHE_MODES)}, got '{mode}'")
+    return mode
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, configured from environment variables."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                max_age = float(os.getenv("LLM_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+                _default_cache = ResponseCache(
+                    path=os.getenv("LLM_CACHE_PATH", "tmp_dbs/llm_cache.db"),
+                    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+                    max_age=max_age if max_age > 0 else None,
+                )
+    return _default_cache
@@ -0,0 +1,291 @@
+"""
+Process-wide TTL cache for Tavily web searches.
+
+Agents of a team often search for the same things (e.g. the financial, market and
+risk analysts all looking up the same company), and every search is a slow, paid
+round trip. CachedTavilyClient wraps a TavilyClient and serves repeated search(),
+get_search_context() and extract() calls from a SearchCache shared by every agent,
+team and run in the process:
+- Keys are the method plus its normalized arguments: the query is case-folded and
+  whitespace-collapsed, defaults are filled in, and the request timeout is ignored
+- Entries expire after a TTL, and the least-recently-used ones are evicted once the
+  cached results exceed a byte budget
+- With SEARCH_CACHE_PATH set, results are also stored in a SQLite file (see
+  ResponseCache), so they survive restarts and are shared between processes
+- Concurrent misses for the same search are coalesced into one request (see
+  single_flight.py)
+
+cached_tavily_tools() also distills search results to a token budget (see
+search_distill.py and search_tools.py) unless SEARCH_DISTILL_TOKENS is 0.
+
+Usage:
+    tools = [cached_tavily_tools(search_depth="advanced", max_tokens=8000)]  # Agno agents
+    client = cached_tavily_client(get_async_search_client())                 # async callers
+
+Configuration via environment variables:
+- SEARCH_CACHE_TTL: Seconds a search result stays fresh (default: 3600, 0 disables the cache)
+- SEARCH_CACHE_MAX_BYTES: Byte budget of cached results (default: 67108864)
+- SEARCH_CACHE_PATH: SQLite file to persist results to (default: none, memory only)
+"""
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.config.response_cache import ResponseCache
+from src.config.single_flight import get_single_flight
+
+CACHED_METHODS = ("search", "get_search_context", "extract")
+
+# Arguments that do not change the result
+_IGNORED_ARGS = {"self", "timeout"}
+
+
+@dataclass
+class SearchCacheStats:
+    """Counters of a SearchCache."""
+
+    hits: int
+    disk_hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    total_bytes: int
+
+
+def normalize_query(query: Any) -> Any:
+    """Case-fold and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.casefold().split()) if isinstance(query, str) else query
+
+
+@lru_cache(maxsize=None)
+def _signature(method: Callable[..., Any]) -> inspect.Signature:
+    return inspect.signature(method)
+
+
+def make_search_key(method: Callable[..., Any], name: str, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    Build a stable key for a Tavily client call.
+
+    Args:
+        method: Unbound client method (for its signature and defaults)
+        name: Method name
+        args: Positional arguments (without self)
+        kwargs: Keyword arguments
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    signature = _signature(method)
+    bound = signature.bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    options: Dict[str, Any] = {}
+    for param, value in bound.arguments.items():
+        if param in _IGNORED_ARGS:
+            continue
+        if signature.parameters[param].kind is inspect.Parameter.VAR_KEYWORD:
+            options.update(value)
+        else:
+            options[param] = value
+    for field in ("query", "urls"):
+        if field in options:
+            options[field] = normalize_query(options[field])
+    encoded = json.dumps({"method": name, **options}, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """In-memory LRU of search results with TTL freshness and an optional SQLite tier."""
+
+    def __init__(self, ttl: float = 3600, max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._disk = ResponseCache(path=path, max_bytes=max_bytes, max_age=ttl) if path else None
+
+    def __deepcopy__(self, memo):
+        # Agno copies toolkits per run; every copy must share the same cache
+        return self
+
+    def _drop(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def _remember(self, key: str, payload: str, stored_at: float) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (stored_at, payload)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh copy of the cached result for key, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                self._drop(key)
+                self._evictions += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                payload = entry[1]
+            elif self._disk is not None and (stored := self._disk.get(key)) is not None:
+                stored_at, payload = stored
+                self._remember(key, payload, stored_at)
+                self._disk_hits += 1
+            else:
+                self._misses += 1
+                return None
+        # Results are stored as JSON, so every caller gets its own copy
+        return json.loads(payload)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result under key."""
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._remember(key, payload, now)
+            self._stores += 1
+        if self._disk is not None:
+            self._disk.put(key, (now, payload))
+
+    def stats(self) -> SearchCacheStats:
+        """Return hit/miss counters and the in-memory size."""
+        with self._lock:
+            return SearchCacheStats(
+                hits=self._hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                total_bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every cached result (including the SQLite tier)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._disk is not None:
+            self._disk.clear()
+
+
+class CachedTavilyClient:
+    """TavilyClient (or AsyncSearchClient) proxy answering repeated searches from a SearchCache."""
+
+    def __init__(self, client: Any, cache: Optional[SearchCache] = None):
+        self._client = client
+        self._cache = cache or get_search_cache()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in CACHED_METHODS:
+            return attr
+        method = getattr(type(self._client), name)
+
+        def fetch(key: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+            result = attr(*args, **kwargs)
+            self._cache.put(key, result)
+            return result
+
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            key = make_search_key(method, name, args, kwargs)
+            result = self._cache.get(key)
+            if result is None:
+                # Concurrent misses for the same search share one request
+                result = get_single_flight().do(f"tavily.{name}", key, lambda: fetch(key, args, kwargs))
+            return result
+
+        async def afetch(key: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+            result = await attr(*args, **kwargs)
+            self._cache.put(key, result)
+            return result
+
+        async def acached(*args: Any, **kwargs: Any) -> Any:
+            key = make_search_key(method, name, args, kwargs)
+            result = self._cache.get(key)
+            if result is None:
+                result = await get_single_flight().ado(f"tavily.{name}", key, lambda: afetch(key, args, kwargs))
+            return result
+
+        return acached if inspect.iscoroutinefunction(method) else cached
+
+
+def cached_tavily_client(client: Any, cache: Optional[SearchCache] = None) -> Any:
+    """
+    Serve a TavilyClient's searches from the shared search cache.
+
+    Args:
+        client: TavilyClient, SearchClient or AsyncSearchClient instance
+        cache: Cache to use (defaults to the process-wide cache)
+
+    Returns:
+        The wrapped client, or the client itself if the cache is disabled
+    """
+    if cache is None and float(os.getenv("SEARCH_CACHE_TTL", "3600")) <= 0:
+        return client
+    return CachedTavilyClient(client, cache)
+
+
+def cached_tavily_tools(
+    cache: Optional[SearchCache] = None, distill_tokens: Optional[int] = None, **kwargs: Any
+) -> Any:
+    """
+    Create Agno TavilyTools searching through the shared pooled client and search cache.
+
+    Args:
+        cache: Cache to use (defaults to the process-wide cache)
+        distill_tokens: Token budget of distilled search results
+            (defaults to SEARCH_DISTILL_TOKENS, 0 = return results undistilled)
+        **kwargs: TavilyTools arguments
+
+    Returns:
+        TavilyTools
+    """
+    from src.config.search_client import get_search_client
+    from src.config.search_distill import get_distill_tokens
+
+    if distill_tokens is None:
+        distill_tokens = get_distill_tokens()
+    if distill_tokens > 0:
+        from src.config.search_tools import DistilledTavilyTools
+
+        tools = DistilledTavilyTools(distill_tokens=distill_tokens, **kwargs)
+    else:
+        from agno.tools.tavily import TavilyTools
+
+        tools = TavilyTools(**kwargs)
+    tools.client = cached_tavily_client(get_search_client(), cache)
+    return tools
+
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache, configured from environment variables."""
+    return SearchCache(
+        ttl=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+        max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        path=os.getenv("SEARCH_CACHE_PATH") or None,
+    )
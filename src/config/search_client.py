@@ -0,0 +1,264 @@
+"""
+Pooled, async Tavily client shared by every agent in the process.
+
+TavilyClient is synchronous and every TavilyTools builds its own, so searches block the
+event loop of async callers (the LlamaIndex ReAct workflow) and each toolkit opens its
+own connections. AsyncSearchClient sends all searches through one httpx connection
+pool with keep-alive:
+- The pool lives on a private event loop in a background thread, so it can be used
+  from any event loop and from plain threads without being bound to either
+- Requests time out after SEARCH_CLIENT_TIMEOUT seconds
+- Timeouts, connection errors, rate limiting (429) and server errors (5xx) are retried
+  up to SEARCH_CLIENT_RETRIES times with full-jitter exponential backoff; other errors
+  (bad request, invalid key) are raised at once as Tavily's own exceptions
+- At most SEARCH_CLIENT_MAX_CONCURRENCY requests are in flight; further calls wait
+
+SearchClient is a thin blocking wrapper for synchronous callers (e.g. Agno's
+TavilyTools); both expose TavilyClient's search(), extract() and get_search_context().
+
+Usage:
+    results = await get_async_search_client().search(query="...", max_results=5)
+    results = get_search_client().search(query="...", max_results=5)
+
+benchmarks/stubs.py provides a local fake Tavily server; point TAVILY_BASE_URL at it.
+
+Configuration via environment variables:
+- TAVILY_BASE_URL: Tavily API endpoint (default: https://api.tavily.com)
+- SEARCH_CLIENT_TIMEOUT: Seconds before a request times out (default: 30)
+- SEARCH_CLIENT_MAX_CONNECTIONS: Max open connections in the pool (default: 10)
+- SEARCH_CLIENT_MAX_CONCURRENCY: Max requests in flight (default: 8)
+- SEARCH_CLIENT_RETRIES: Retries of a failed request (default: 3)
+- SEARCH_CLIENT_BACKOFF: Base delay in seconds of the retry backoff (default: 0.5)
+"""
+import asyncio
+import atexit
+import logging
+import os
+import random
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import httpx
+from tavily import AsyncTavilyClient
+from tavily.errors import TimeoutError as TavilyTimeoutError
+from tavily.errors import UsageLimitExceededError
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 10.0
+
+
+@dataclass
+class SearchClientStats:
+    """Counters of an AsyncSearchClient."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request may succeed when sent again."""
+    if isinstance(error, (TavilyTimeoutError, UsageLimitExceededError, httpx.TransportError)):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500
+
+
+class AsyncSearchClient:
+    """Tavily client with a shared connection pool, timeouts, retries and a concurrency limit."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ):
+        """
+        Args:
+            api_key: Tavily API key (defaults to TAVILY_API_KEY)
+            base_url: API endpoint (defaults to TAVILY_BASE_URL)
+            timeout: Request timeout in seconds (defaults to SEARCH_CLIENT_TIMEOUT)
+            max_connections: Pool size (defaults to SEARCH_CLIENT_MAX_CONNECTIONS)
+            max_concurrency: Max requests in flight (defaults to SEARCH_CLIENT_MAX_CONCURRENCY)
+            retries: Retries of a failed request (defaults to SEARCH_CLIENT_RETRIES)
+            backoff: Base backoff delay in seconds (defaults to SEARCH_CLIENT_BACKOFF)
+        """
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self.base_url = base_url or os.getenv("TAVILY_BASE_URL") or "https://api.tavily.com"
+        self.timeout = timeout or float(os.getenv("SEARCH_CLIENT_TIMEOUT", "30"))
+        self.max_connections = max_connections or int(os.getenv("SEARCH_CLIENT_MAX_CONNECTIONS", "10"))
+        self.max_concurrency = max_concurrency or int(os.getenv("SEARCH_CLIENT_MAX_CONCURRENCY", "8"))
+        self.retries = retries if retries is not None else int(os.getenv("SEARCH_CLIENT_RETRIES", "3"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("SEARCH_CLIENT_BACKOFF", "0.5"))
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncTavilyClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = SearchClientStats()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop owning the connection pool (once)."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                startup_error: List[BaseException] = []
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    try:
+                        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                        self._http = httpx.AsyncClient(
+                            base_url=self.base_url,
+                            limits=httpx.Limits(
+                                max_connections=self.max_connections, max_keepalive_connections=self.max_connections
+                            ),
+                            timeout=self.timeout,
+                        )
+                        self._client = AsyncTavilyClient(api_key=self.api_key, client=self._http)
+                    except BaseException as e:
+                        startup_error.append(e)
+                        return
+                    finally:
+                        ready.set()
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="search-client", daemon=True)
+                self._thread.start()
+                ready.wait()
+                if startup_error:
+                    self._thread.join()
+                    if self._http is not None:
+                        loop.run_until_complete(self._http.aclose())
+                        self._http = None
+                    loop.close()
+                    raise startup_error[0]
+                self._loop = loop
+                atexit.register(self.close)
+            return self._loop
+
+    async def _request(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Send one request on the background loop, retrying transient failures."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._stats.waiting += 1
+        async with self._semaphore:
+            with self._lock:
+                self._stats.waiting -= 1
+                self._stats.in_flight += 1
+            try:
+                for attempt in range(self.retries + 1):
+                    with self._lock:
+                        self._stats.requests += 1
+                    try:
+                        return await getattr(self._client, method)(**kwargs)
+                    except Exception as e:
+                        if attempt == self.retries or not is_retryable(e):
+                            with self._lock:
+                                self._stats.failures += 1
+                            raise
+                        delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2**attempt))
+                        logger.warning("Tavily %s failed (%s), retrying in %.2fs", method, e, delay)
+                        with self._lock:
+                            self._stats.retries += 1
+                        await asyncio.sleep(delay)
+            finally:
+                with self._lock:
+                    self._stats.in_flight -= 1
+
+    def submit(self, method: str, **kwargs: Any) -> Future:
+        """
+        Schedule a request on the background loop.
+
+        Args:
+            method: AsyncTavilyClient method (search, extract, get_search_context)
+            **kwargs: Method arguments
+
+        Returns:
+            Future: Resolves to the response
+        """
+        loop = self._start()
+        return asyncio.run_coroutine_threadsafe(self._request(method, kwargs), loop)
+
+    async def search(self, query: str, **kwargs: Any) -> Dict[str, Any]:
+        """Search the web (same arguments as TavilyClient.search)."""
+        return await asyncio.wrap_future(self.submit("search", query=query, **kwargs))
+
+    async def extract(self, urls: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Extract the content of web pages (same arguments as TavilyClient.extract)."""
+        return await asyncio.wrap_future(self.submit("extract", urls=urls, **kwargs))
+
+    async def get_search_context(self, query: str, **kwargs: Any) -> str:
+        """Search and return the results as a context string (same arguments as TavilyClient)."""
+        return await asyncio.wrap_future(self.submit("get_search_context", query=query, **kwargs))
+
+    def stats(self) -> SearchClientStats:
+        """Return request, retry and concurrency counters."""
+        with self._lock:
+            return SearchClientStats(**vars(self._stats))
+
+    def close(self) -> None:
+        """Close the connection pool and stop the background loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        # The Tavily client does not close a client it was given, so close both
+        asyncio.run_coroutine_threadsafe(self._client.close(), loop).result(timeout=5)
+        asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result(timeout=5)
+        self._http = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
+
+
+class SearchClient:
+    """Blocking wrapper around an AsyncSearchClient for synchronous callers."""
+
+    def __init__(self, client: Optional[AsyncSearchClient] = None):
+        self._client = client or get_async_search_client()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def search(self, query: str, **kwargs: Any) -> Dict[str, Any]:
+        """Search the web (same arguments as TavilyClient.search)."""
+        return self._client.submit("search", query=query, **kwargs).result()
+
+    def extract(self, urls: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Extract the content of web pages (same arguments as TavilyClient.extract)."""
+        return self._client.submit("extract", urls=urls, **kwargs).result()
+
+    def get_search_context(self, query: str, **kwargs: Any) -> str:
+        """Search and return the results as a context string (same arguments as TavilyClient)."""
+        return self._client.submit("get_search_context", query=query, **kwargs).result()
+
+    def stats(self) -> SearchClientStats:
+        """Return the counters of the underlying client."""
+        return self._client.stats()
+
+
+@lru_cache(maxsize=1)
+def get_async_search_client() -> AsyncSearchClient:
+    """Return the process-wide async search client, configured from environment variables."""
+    return AsyncSearchClient()
+
+
+@lru_cache(maxsize=1)
+def get_search_client() -> SearchClient:
+    """Return the process-wide blocking search client (sharing the async client's pool)."""
+    return SearchClient(get_async_search_client())
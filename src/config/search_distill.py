@@ -0,0 +1,184 @@
+"""
+Distillation of web search results into a small, relevant context.
+
+A Tavily search returns up to max_results pages whose content fields overlap heavily
+(syndicated articles, the same press release on several sites, navigation and cookie
+boilerplate), and the agents paste all of it into the model's context. distill_results()
+shrinks a result list before it reaches the model:
+1. Near-duplicate results are dropped: each result's word 5-shingles are summarized in
+   a bottom-k MinHash sketch, and a result whose estimated Jaccard similarity to a
+   better-ranked one is at or above the threshold is skipped
+2. The remaining content is split into sentence-aligned passages, and passages that
+   repeat verbatim (boilerplate) are kept once
+3. Passages are ranked by BM25 against the query
+4. The best passages are packed under a token budget, grouped by source so every
+   passage keeps its title and URL
+
+The output has the same shape as Tavily results (title, url, content, score), so it
+can replace them wherever they are formatted. Agno agents get distilled results through
+DistilledTavilyTools (search_tools.py); this module only needs the standard library.
+
+Configuration via environment variables:
+- SEARCH_DISTILL_TOKENS: Token budget of a distilled search result (default: 1500, 0 = off)
+"""
+import hashlib
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Set
+
+from src.config.history_budget import CHARS_PER_TOKEN
+
+SHINGLE_WORDS = 5
+SKETCH_SIZE = 64
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _tokens_of(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def minhash_sketch(text: str, size: int = SKETCH_SIZE) -> List[int]:
+    """Bottom-k MinHash sketch: the `size` smallest hashes of the text's word shingles."""
+    words = _tokens(text)
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles)
+    return sorted(heapq.nsmallest(size, hashes))
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int], size: int = SKETCH_SIZE) -> float:
+    """Estimate the Jaccard similarity of two texts from their bottom-k sketches."""
+    if not a or not b:
+        return 0.0
+    union = heapq.nsmallest(size, set(a) | set(b))
+    a_set, b_set = set(a), set(b)
+    return sum(1 for h in union if h in a_set and h in b_set) / len(union)
+
+
+def split_passages(text: str, max_chars: int = 400) -> List[str]:
+    """Split text into passages of whole sentences, each up to about max_chars."""
+    passages: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            passages.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        passages.append(current)
+    return passages
+
+
+def bm25_scores(query: str, documents: List[List[str]]) -> List[float]:
+    """Score tokenized documents against a query with Okapi BM25."""
+    if not documents:
+        return []
+    terms = set(_tokens(query))
+    avg_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    frequencies = [Counter(doc) for doc in documents]
+    document_frequency = {term: sum(1 for tf in frequencies if term in tf) for term in terms}
+    scores = []
+    for doc, tf in zip(documents, frequencies):
+        score = 0.0
+        for term in terms:
+            if term not in tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            norm = tf[term] * (BM25_K1 + 1) / (tf[term] + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_length))
+            score += idf * norm
+        scores.append(score)
+    return scores
+
+
+def distill_results(
+    query: str,
+    results: List[Dict[str, Any]],
+    max_tokens: int = 1500,
+    dedupe_threshold: float = 0.7,
+    passage_chars: int = 400,
+) -> List[Dict[str, Any]]:
+    """
+    Drop near-duplicate results and keep the passages most relevant to the query.
+
+    Args:
+        query: Search query the passages are ranked against
+        results: Tavily results (dicts with title, url, content and optionally score)
+        max_tokens: Budget for the returned titles, URLs and passages
+        dedupe_threshold: Estimated Jaccard similarity at which a result counts as a duplicate
+        passage_chars: Approximate passage length
+
+    Returns:
+        List: Results in the same shape, best source first, each with only its selected
+        passages (in document order) as content
+    """
+    kept: List[Dict[str, Any]] = []
+    sketches: List[List[int]] = []
+    for result in results:
+        sketch = minhash_sketch(result.get("content") or "")
+        if any(estimate_similarity(sketch, other) >= dedupe_threshold for other in sketches):
+            continue
+        kept.append(result)
+        sketches.append(sketch)
+
+    passages: List[tuple] = []  # (result index, passage index, text)
+    seen: Set[str] = set()
+    for r, result in enumerate(kept):
+        for p, passage in enumerate(split_passages(result.get("content") or "", passage_chars)):
+            normalized = " ".join(_tokens(passage))
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                passages.append((r, p, passage))
+
+    scores = bm25_scores(query, [_tokens(text) for _, _, text in passages])
+    ranking = sorted(range(len(passages)), key=lambda i: (-scores[i], passages[i][0], passages[i][1]))
+
+    selected: Dict[int, List[int]] = {}
+    best: Dict[int, float] = {}
+    budget = max_tokens
+    for i in ranking:
+        r, _, text = passages[i]
+        cost = _tokens_of(text)
+        if r not in selected:
+            # A source's title and URL are paid for with its first passage
+            cost += _tokens_of(f"{kept[r].get('title', '')} {kept[r].get('url', '')}") + 4
+        if cost > budget:
+            continue
+        budget -= cost
+        selected.setdefault(r, []).append(i)
+        best.setdefault(r, scores[i])
+
+    distilled = []
+    for r in sorted(selected, key=lambda r: (-best[r], r)):
+        result = kept[r]
+        distilled.append(
+            {
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "content": " ... ".join(passages[i][2] for i in sorted(selected[r])),
+                "score": result.get("score"),
+            }
+        )
+    return distilled
+
+
+def get_distill_tokens() -> int:
+    """Token budget of distilled search results from SEARCH_DISTILL_TOKENS (0 = off)."""
+    return int(os.getenv("SEARCH_DISTILL_TOKENS", "1500"))
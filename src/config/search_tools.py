@@ -0,0 +1,55 @@
+"""
+Agno Tavily toolkit returning distilled search results.
+
+DistilledTavilyTools is TavilyTools whose web search passes the results through
+distill_results() (see search_distill.py) before they reach the model. It lives apart
+from the distillation code so that importing that code does not import Agno.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from agno.tools.tavily import TavilyTools
+
+from src.config.history_budget import CHARS_PER_TOKEN
+from src.config.search_distill import distill_results, get_distill_tokens
+
+
+class DistilledTavilyTools(TavilyTools):
+    """TavilyTools whose web search returns distilled results under a token budget."""
+
+    def __init__(self, distill_tokens: Optional[int] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.distill_tokens = distill_tokens if distill_tokens is not None else get_distill_tokens()
+
+    def web_search_using_tavily(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search the web for a given query.
+        This function uses the Tavily API to provide realtime online information about the query.
+
+        Args:
+            query (str): Query to search for.
+            max_results (int): Maximum number of results to return. Defaults to 5.
+
+        Returns:
+            str: JSON string of results related to the query.
+        """
+        response = self.client.search(
+            query=query, search_depth=self.search_depth, include_answer=self.include_answer, max_results=max_results
+        )
+        answer = response.get("answer")
+        # max_tokens of TavilyTools counts characters
+        budget = min(self.distill_tokens, self.max_tokens // CHARS_PER_TOKEN)
+        budget -= len(f"# {query} {answer or ''}") // CHARS_PER_TOKEN + 1
+        results = distill_results(query, response.get("results", []), max_tokens=max(budget, 0))
+
+        if self.format == "json":
+            clean_response: Dict[str, Any] = {"query": query}
+            if answer:
+                clean_response["answer"] = answer
+            clean_response["results"] = results
+            return json.dumps(clean_response)
+        markdown = f"# {query}\n\n"
+        if answer:
+            markdown += f"### Summary\n{answer}\n\n"
+        for result in results:
+            markdown += f"### [{result['title']}]({result['url']})\n{result['content']}\n\n"
+        return markdown
@@ -0,0 +1,245 @@
+"""
+Single-flight coalescing of concurrent identical tool calls.
+
+When a team fans out to several members in parallel, they often call the same tool
+with the same arguments at the same moment (e.g. three architects searching for the
+same framework), and each call waits on its own request. SingleFlight lets the first
+caller for a key run the call while concurrent callers with the same key wait for,
+and share, its result (or exception). Nothing is cached: once the call finishes, the
+next caller runs it again, so there is no staleness.
+
+Cancellation only affects the caller being cancelled: a leader that is cancelled or
+interrupted (CancelledError, KeyboardInterrupt) releases the key and one of its
+followers runs the call instead, and a cancelled follower stops waiting without
+touching the shared call.
+
+Callers can be threads or asyncio tasks, in any mix and on any event loop: the shared
+result is a concurrent.futures.Future, which async callers await via asyncio.
+
+- @coalesce: decorator for sync or async tool functions (keeps their signature, so
+  Agno builds the same tool schema)
+- coalesce_toolkit(): wraps every function of an initialized Agno toolkit (e.g. MCPTools)
+- get_single_flight().stats(): calls, executions and coalesced calls, per tool
+
+Coalesced callers share the same result object, so results must be treated as
+read-only.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Arguments Agno injects into tool functions; they do not identify the call
+INJECTED_ARGS = {
+    "self", "agent", "team", "run_context", "session_state", "dependencies", "fc",
+    "images", "videos", "audios", "files",
+}
+
+
+# Outcome shared by a leader that was cancelled: its followers run the call again
+_ABANDONED = object()
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight."""
+
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+    coalesced_by_name: Dict[str, int] = field(default_factory=dict)
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome with concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], Future] = {}
+        self._stats = SingleFlightStats()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _join(self, name: str, key: str, retry: bool = False) -> Tuple[Future, bool]:
+        """Return the pending future for (name, key) and whether this caller leads."""
+        with self._lock:
+            if not retry:
+                self._stats.calls += 1
+            future = self._calls.get((name, key))
+            if future is not None:
+                if not retry:
+                    self._stats.coalesced += 1
+                    self._stats.coalesced_by_name[name] = self._stats.coalesced_by_name.get(name, 0) + 1
+                return future, False
+            future = Future()
+            self._calls[(name, key)] = future
+            self._stats.executions += 1
+            return future, True
+
+    def _finish(self, name: str, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            del self._calls[(name, key)]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, name: str, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already in flight.
+
+        Args:
+            name: Tool name (for stats)
+            key: Normalized arguments identifying the call
+            fn: Performs the call
+
+        Returns:
+            The result of fn (shared with concurrent callers)
+        """
+        retry = False
+        while True:
+            future, leader = self._join(name, key, retry)
+            if leader:
+                break
+            result = future.result()
+            if result is not _ABANDONED:
+                return result
+            retry = True
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(name, key, future, error=e)
+            raise
+        except BaseException:
+            # Only this caller was cancelled or interrupted; a follower runs the call instead
+            self._finish(name, key, future, _ABANDONED)
+            raise
+        self._finish(name, key, future, result)
+        return result
+
+    async def ado(self, name: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of do(): fn returns an awaitable."""
+        retry = False
+        while True:
+            future, leader = self._join(name, key, retry)
+            if leader:
+                break
+            # Shielded: cancelling this follower must not cancel the shared call
+            result = await asyncio.shield(asyncio.wrap_future(future))
+            if result is not _ABANDONED:
+                return result
+            retry = True
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(name, key, future, error=e)
+            raise
+        except BaseException:
+            # Only this caller was cancelled or interrupted; a follower runs the call instead
+            self._finish(name, key, future, _ABANDONED)
+            raise
+        self._finish(name, key, future, result)
+        return result
+
+    def stats(self) -> SingleFlightStats:
+        """Return call, execution and coalescing counters."""
+        with self._lock:
+            return SingleFlightStats(
+                calls=self._stats.calls,
+                executions=self._stats.executions,
+                coalesced=self._stats.coalesced,
+                in_flight=len(self._calls),
+                coalesced_by_name=dict(self._stats.coalesced_by_name),
+            )
+
+
+@lru_cache(maxsize=1)
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight shared by all tools."""
+    return SingleFlight()
+
+
+def make_call_key(signature: inspect.Signature, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    """Serialize a call's arguments (defaults filled in, injected ones dropped) as a stable key."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except TypeError:
+        arguments = {"args": args, **kwargs}
+    for name, param in signature.parameters.items():
+        if param.kind is inspect.Parameter.VAR_KEYWORD and name in arguments:
+            arguments.update(arguments.pop(name))
+    key = {name: value for name, value in arguments.items() if name not in INJECTED_ARGS}
+    return json.dumps(key, sort_keys=True, default=str, separators=(",", ":"))
+
+
+def coalesce(
+    fn: Optional[Callable[..., Any]] = None,
+    *,
+    name: Optional[str] = None,
+    flight: Optional[SingleFlight] = None,
+) -> Any:
+    """
+    Coalesce concurrent calls of a sync or async function that have the same arguments.
+
+    Usable as @coalesce or @coalesce(name=...).
+
+    Args:
+        fn: Function to wrap
+        name: Name used in stats (defaults to the function name)
+        flight: SingleFlight to use (defaults to the process-wide one)
+
+    Returns:
+        The wrapped function, with the original signature
+    """
+    if fn is None:
+        return functools.partial(coalesce, name=name, flight=flight)
+
+    tool_name = name or getattr(fn, "__name__", None) or getattr(getattr(fn, "func", None), "__name__", "tool")
+    signature = inspect.signature(fn)
+    is_async = inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(getattr(fn, "func", None))
+
+    if is_async:
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = make_call_key(signature, args, kwargs)
+            return await (flight or get_single_flight()).ado(tool_name, key, lambda: fn(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = make_call_key(signature, args, kwargs)
+        return (flight or get_single_flight()).do(tool_name, key, lambda: fn(*args, **kwargs))
+
+    return wrapper
+
+
+def coalesce_toolkit(toolkit: Any, flight: Optional[SingleFlight] = None) -> Any:
+    """
+    Coalesce concurrent identical calls to every function of an Agno toolkit.
+
+    For toolkits that register their functions on connect (e.g. MCPTools), call this
+    after initialization.
+
+    Args:
+        toolkit: Initialized Agno Toolkit
+        flight: SingleFlight to use (defaults to the process-wide one)
+
+    Returns:
+        The same toolkit
+    """
+    for function in toolkit.functions.values():
+        if function.entrypoint is not None and not getattr(function.entrypoint, "_coalesced", False):
+            function.entrypoint = coalesce(function.entrypoint, name=function.name, flight=flight)
+            function.entrypoint._coalesced = True
+    return toolkit
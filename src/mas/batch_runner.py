@@ -0,0 +1,328 @@
+"""
+Resumable batch runs of a team over many inputs.
+
+Runs a team (see TEAM_BUILDERS in team_server.py) over every row of a CSV or JSONL
+file, e.g. the tickers of a watchlist, instead of one hard-coded prompt:
+- Items run concurrently, at most BATCH_CONCURRENCY at a time, on one warm team
+- Each result is appended to the output JSONL as soon as it finishes (flushed and
+  fsynced), with its wall time and token usage
+- On restart, items already completed in the output file are skipped, so a crash or
+  Ctrl-C only loses the items that were in flight; failed items run again
+
+Each item's id is its `id` field when the input has one, otherwise a hash of its
+prompt, so resuming also works when the input file is edited or reordered. Use one
+output file per team: ids do not include the team.
+
+Input rows are turned into prompts with --template (str.format over the row fields),
+or taken from the --field column (default: input):
+    ticker,company
+    NVDA,NVIDIA
+    uv run python -m src.mas.batch_runner watchlist.csv results.jsonl \\
+        --team investment_committee --template "Should we invest in {company} ({ticker})?"
+
+Configuration via environment variables:
+- BATCH_CONCURRENCY: Items run at the same time (default: 4)
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchItem:
+    """One input of a batch."""
+
+    id: str
+    input: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one item, as written to the output file."""
+
+    id: str
+    input: str
+    status: str
+    content: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    finished_at: float = 0.0
+
+
+@dataclass
+class BatchStats:
+    """Counters of a batch run."""
+
+    total: int = 0
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    total_tokens: int = 0
+
+
+def _rows(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+        return
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield row if isinstance(row, dict) else {"input": row}
+
+
+def read_items(path: str, field: str = "input", template: Optional[str] = None) -> List[BatchItem]:
+    """
+    Read the batch inputs from a CSV (header row) or JSONL file.
+
+    Args:
+        path: Input file; .csv is read as CSV, anything else as JSONL
+        field: Row field holding the prompt (when no template is given)
+        template: str.format template building the prompt from the row fields
+
+    Returns:
+        List[BatchItem]: Items in file order, duplicates (same id) removed
+    """
+    items: Dict[str, BatchItem] = {}
+    for number, row in enumerate(_rows(Path(path)), start=1):
+        try:
+            prompt = template.format(**row) if template else str(row[field])
+        except KeyError as e:
+            raise ValueError(f"{path}: row {number} has no field {e}") from None
+        item_id = str(row.get("id") or hashlib.sha256(prompt.encode()).hexdigest()[:16])
+        items.setdefault(item_id, BatchItem(id=item_id, input=prompt, fields=dict(row)))
+    return list(items.values())
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids of the items already completed in an output file (a truncated last line is ignored)."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "completed":
+                done.add(record["id"])
+    return done
+
+
+def run_outputs(result: Any) -> Iterator[Any]:
+    """Every run output inside a team result: the run itself and its members' runs, recursively."""
+    if result is None:
+        return
+    if hasattr(result, "member_outputs"):  # ParallelTeamResult
+        yield from run_outputs(result.synthesis)
+        for output in result.member_outputs.values():
+            yield from run_outputs(output)
+        return
+    yield result
+    for member in getattr(result, "member_responses", None) or []:
+        yield from run_outputs(member)
+
+
+def token_usage(result: Any) -> Dict[str, int]:
+    """Tokens used by a team run, summed over its members (reused checkpoints cost nothing)."""
+    usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    for output in run_outputs(result):
+        metrics = getattr(output, "metrics", None)
+        if metrics is None or "checkpoint" in (getattr(output, "metadata", None) or {}):
+            continue
+        for key in usage:
+            usage[key] += getattr(metrics, key, 0) or 0
+    return usage
+
+
+def run_error(result: Any) -> Optional[str]:
+    """
+    Why a team run did not complete, or None if it did.
+
+    Agno reports model failures as a run whose content is the error message (with an
+    ERROR status for agents, but still RUNNING for teams) instead of raising, so only a
+    COMPLETED run counts. A ParallelTeam run also fails when any member failed.
+    """
+    if hasattr(result, "member_outputs"):  # ParallelTeamResult
+        if result.member_errors:
+            return "; ".join(f"{name}: {error}" for name, error in result.member_errors.items())
+        result = result.synthesis
+    if result is None or result.content is None:
+        return "empty response"
+    if result.status != "COMPLETED":
+        return str(result.content)
+    return None
+
+
+class BatchRunner:
+    """Runs one team over a list of items, appending each result to a JSONL file."""
+
+    def __init__(self, team: Any, output: str, concurrency: Optional[int] = None):
+        """
+        Args:
+            team: Agno Team or ParallelTeam to run every item on
+            output: JSONL file results are appended to (and resumed from)
+            concurrency: Items run at the same time (defaults to BATCH_CONCURRENCY)
+        """
+        self.team = team
+        self.output = output
+        self.concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    def _write(self, f: Any, result: BatchResult) -> None:
+        f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    async def _run_item(self, item: BatchItem) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            result = await self.team.arun(item.input, session_id=f"batch-{item.id}")
+        except Exception as e:
+            logger.warning("Item %s failed: %s", item.id, e)
+            return BatchResult(
+                id=item.id, input=item.input, status="failed", error=str(e),
+                seconds=time.perf_counter() - start, finished_at=time.time(),
+            )
+        content = getattr(result, "content", None)
+        error = run_error(result)
+        return BatchResult(
+            id=item.id,
+            input=item.input,
+            status="failed" if error else "completed",
+            content=content if content is None or isinstance(content, str) else str(content),
+            error=error,
+            seconds=time.perf_counter() - start,
+            finished_at=time.time(),
+            **token_usage(result),
+        )
+
+    async def arun(self, items: List[BatchItem]) -> BatchStats:
+        """
+        Run every item not yet completed in the output file.
+
+        Args:
+            items: Batch inputs
+
+        Returns:
+            BatchStats: Counts, wall time and tokens of this run
+        """
+        start = time.perf_counter()
+        done = completed_ids(self.output)
+        pending = [item for item in items if item.id not in done]
+        stats = BatchStats(total=len(items), skipped=len(items) - len(pending))
+        if stats.skipped:
+            logger.info("Skipping %d already completed items", stats.skipped)
+        Path(self.output).parent.mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with open(self.output, "a+", encoding="utf-8") as f:
+            # A crash can leave a partial last line; start new results on a fresh line
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                if f.read(1) != "\n":
+                    f.write("\n")
+
+            async def run_one(item: BatchItem) -> None:
+                async with semaphore:
+                    result = await self._run_item(item)
+                # Results are written from the event loop thread only, one line at a time
+                self._write(f, result)
+                stats.total_tokens += result.total_tokens
+                if result.status == "completed":
+                    stats.completed += 1
+                else:
+                    stats.failed += 1
+                logger.info(
+                    "[%d/%d] %s %s in %.1fs (%d tokens)",
+                    stats.skipped + stats.completed + stats.failed, stats.total,
+                    item.id, result.status, result.seconds, result.total_tokens,
+                )
+
+            await asyncio.gather(*(run_one(item) for item in pending))
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def run(self, items: List[BatchItem]) -> BatchStats:
+        """Blocking variant of arun()."""
+        return asyncio.run(self.arun(items))
+
+
+async def run_batch(
+    team: str,
+    input: str,
+    output: str,
+    field: str = "input",
+    template: Optional[str] = None,
+    concurrency: Optional[int] = None,
+) -> BatchStats:
+    """
+    Build a team and run it over every item of an input file.
+
+    Args:
+        team: Team name (a key of TEAM_BUILDERS)
+        input: CSV or JSONL input file
+        output: JSONL results file (resumed if it exists)
+        field: Row field holding the prompt
+        template: str.format template building the prompt from the row fields
+        concurrency: Items run at the same time (defaults to BATCH_CONCURRENCY)
+
+    Returns:
+        BatchStats: Counts, wall time and tokens of this run
+    """
+    from src.mas.team_server import TEAM_BUILDERS
+
+    if team not in TEAM_BUILDERS:
+        raise ValueError(f"Unknown team {team!r} (known: {', '.join(TEAM_BUILDERS)})")
+    items = read_items(input, field=field, template=template)
+    async with AsyncExitStack() as stack:
+        built = await TEAM_BUILDERS[team](stack)
+        return await BatchRunner(built, output, concurrency=concurrency).arun(items)
+
+
+def main() -> int:
+    from src.mas.team_server import TEAM_BUILDERS
+
+    parser = argparse.ArgumentParser(description="Run a team over every row of a CSV or JSONL file")
+    parser.add_argument("input", help="CSV (with header) or JSONL input file")
+    parser.add_argument("output", help="JSONL results file; completed items in it are skipped")
+    parser.add_argument("--team", choices=list(TEAM_BUILDERS), default="investment_committee", help="Team to run")
+    parser.add_argument("--field", default="input", help="Row field holding the prompt")
+    parser.add_argument("--template", help='Prompt template over the row fields, e.g. "Should we invest in {ticker}?"')
+    parser.add_argument("--concurrency", type=int, help="Items run at the same time")
+    args = parser.parse_args()
+
+    from src.config.model_factory import load_config
+
+    load_config()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    stats = asyncio.run(
+        run_batch(args.team, args.input, args.output, args.field, args.template, args.concurrency)
+    )
+    print(
+        f"{stats.completed} completed, {stats.failed} failed, {stats.skipped} skipped (of {stats.total}) "
+        f"in {stats.seconds:.1f}s, {stats.total_tokens} tokens"
+    )
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Checkpointing of team member results, so team re-runs only redo what changed.
+
+A due diligence committee run takes minutes and dozens of model calls, and when the
+final synthesis fails, or only the synthesis prompt changes, every member's work is
+redone. checkpoint_team() makes the members of a team (recursively, including
+sub-teams) store each successful result in a local SQLite store, keyed by:
+- the team and member names
+- a hash of the member's input (the delegated task, or the history it was given)
+- a hash of the member's configuration: instructions, role, description, model and
+  tool names, and, for a sub-team, the configuration of all of its members
+
+A later run with the same key reuses the stored result instead of running the member;
+members whose input or instructions changed, or whose result is older than the TTL,
+run again. The team leader itself (or a ParallelTeam's synthesizer) is never
+checkpointed, so changing the synthesis always takes effect.
+
+Works with Agno Teams (delegated member runs, streamed or not) and with ParallelTeam.
+
+Configuration via environment variables:
+- CHECKPOINT_TTL: Seconds a member result stays reusable (default: 86400, 0 disables checkpointing)
+- CHECKPOINT_PATH: SQLite file of the store (default: tmp_dbs/team_checkpoints.db)
+- CHECKPOINT_MAX_BYTES: Size budget of the store (default: 268435456)
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from uuid import uuid4
+
+from src.config.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CheckpointStats:
+    """Counters of a CheckpointStore."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    hits_by_member: Dict[str, int] = field(default_factory=dict)
+
+
+def _text(value: Any) -> str:
+    if callable(value):
+        value = getattr(value, "__qualname__", repr(value))
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def member_fingerprint(member: Any) -> str:
+    """Hash of everything in a member's configuration that shapes its output."""
+    model = getattr(member, "model", None)
+    tools = []
+    for tool in getattr(member, "tools", None) or []:
+        tools.append(getattr(tool, "name", None) or getattr(tool, "__name__", None) or type(tool).__name__)
+    parts = {
+        "name": getattr(member, "name", None),
+        "role": getattr(member, "role", None),
+        "description": _text(getattr(member, "description", None)),
+        "instructions": _text(getattr(member, "instructions", None)),
+        "expected_output": getattr(member, "expected_output", None),
+        "additional_context": getattr(member, "additional_context", None),
+        "model": f"{getattr(model, 'provider', None)}:{getattr(model, 'id', None)}" if model else None,
+        "tools": sorted(tools),
+        "members": [member_fingerprint(m) for m in getattr(member, "members", None) or []],
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def input_fingerprint(input: Any) -> str:
+    """Hash of a member's input (a task string or a list of messages)."""
+    if isinstance(input, list):
+        input = [
+            {"role": getattr(m, "role", None), "content": getattr(m, "content", m)} for m in input
+        ]
+    return hashlib.sha256(json.dumps(input, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CheckpointStore:
+    """SQLite store of member run outputs, expiring after a TTL."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: SQLite file (defaults to CHECKPOINT_PATH)
+            ttl: Seconds a result stays reusable (defaults to CHECKPOINT_TTL)
+            max_bytes: Size budget; least recently used results are dropped beyond it
+                (defaults to CHECKPOINT_MAX_BYTES)
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv("CHECKPOINT_TTL", "86400"))
+        self.path = path or os.getenv("CHECKPOINT_PATH", "tmp_dbs/team_checkpoints.db")
+        self.max_bytes = max_bytes or int(os.getenv("CHECKPOINT_MAX_BYTES", str(256 * 1024 * 1024)))
+        self._cache: Optional[ResponseCache] = None
+        self._lock = threading.Lock()
+        self._stats = CheckpointStats()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def _store(self) -> ResponseCache:
+        # Opened on first load or save, so building a team creates no file
+        with self._lock:
+            if self._cache is None:
+                self._cache = ResponseCache(path=self.path, max_bytes=self.max_bytes, max_age=self.ttl)
+            return self._cache
+
+    @staticmethod
+    def key(team: str, member: Any, input: Any) -> str:
+        """Checkpoint key of a member run."""
+        parts = [team, getattr(member, "name", None), input_fingerprint(input), member_fingerprint(member)]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def load(self, key: str, member: Any, session_id: Optional[str] = None) -> Optional[Any]:
+        """Return the stored output for key as a fresh run of member, or None."""
+        stored = self._store.get(key)
+        with self._lock:
+            if stored is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            name = getattr(member, "name", None) or "member"
+            self._stats.hits_by_member[name] = self._stats.hits_by_member.get(name, 0) + 1
+        if stored["kind"] == "team":
+            from agno.run.team import TeamRunOutput
+
+            output = TeamRunOutput.from_dict(stored["output"])
+        else:
+            from agno.run.agent import RunOutput
+
+            output = RunOutput.from_dict(stored["output"])
+        # A reused result is recorded as a new run of this session
+        output.run_id = str(uuid4())
+        output.session_id = session_id or output.session_id
+        output.metadata = {**(output.metadata or {}), "checkpoint": key}
+        return output
+
+    def save(self, key: str, output: Any) -> None:
+        """Store a completed run output under key."""
+        from agno.run.base import RunStatus
+        from agno.run.team import TeamRunOutput
+
+        if output is None or output.status != RunStatus.completed or output.content is None:
+            return
+        kind = "team" if isinstance(output, TeamRunOutput) else "agent"
+        if self._store.put(key, {"kind": kind, "output": output.to_dict()}):
+            with self._lock:
+                self._stats.stores += 1
+
+    def stats(self) -> CheckpointStats:
+        """Return hit, miss and store counters."""
+        with self._lock:
+            return CheckpointStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stores=self._stats.stores,
+                hits_by_member=dict(self._stats.hits_by_member),
+            )
+
+    def clear(self) -> None:
+        """Delete every checkpoint."""
+        self._store.clear()
+
+
+def _is_output(event: Any) -> bool:
+    from agno.run.agent import RunOutput
+    from agno.run.team import TeamRunOutput
+
+    return isinstance(event, (RunOutput, TeamRunOutput))
+
+
+def _content_event(output: Any) -> Any:
+    """The content event a live streamed run of output's member would have produced."""
+    from agno.run.team import TeamRunOutput
+
+    if isinstance(output, TeamRunOutput):
+        from agno.run.team import RunContentEvent as TeamRunContentEvent
+
+        return TeamRunContentEvent(
+            team_id=output.team_id or "",
+            team_name=output.team_name or "",
+            run_id=output.run_id,
+            session_id=output.session_id,
+            content=output.content,
+            content_type=output.content_type,
+        )
+    from agno.run.agent import RunContentEvent
+
+    return RunContentEvent(
+        agent_id=output.agent_id or "",
+        agent_name=output.agent_name or "",
+        run_id=output.run_id,
+        session_id=output.session_id,
+        content=output.content,
+        content_type=output.content_type,
+    )
+
+
+def _checkpoint_member(member: Any, team: str, store: CheckpointStore) -> None:
+    """Route a member's run() and arun() through the checkpoint store."""
+    run, arun = member.run, member.arun
+
+    def stream_and_save(key: str, input: Any, args: Any, kwargs: Dict[str, Any]) -> Iterator[Any]:
+        wants_output = kwargs.get("yield_run_output") or kwargs.get("yield_run_response")
+        for event in run(input, *args, stream=True, **{**kwargs, "yield_run_output": True}):
+            if _is_output(event):
+                store.save(key, event)
+                if not wants_output:
+                    continue
+            yield event
+
+    # A streamed delegation builds the member's result from its content events, so a
+    # replay emits the stored content as one event before the output itself
+    def replay(output: Any, kwargs: Dict[str, Any]) -> Iterator[Any]:
+        yield _content_event(output)
+        if kwargs.get("yield_run_output") or kwargs.get("yield_run_response"):
+            yield output
+
+    def checkpointed_run(input: Any, *args: Any, stream: Optional[bool] = None, **kwargs: Any) -> Any:
+        stream = stream if stream is not None else bool(getattr(member, "stream", False))
+        key = store.key(team, member, input)
+        output = store.load(key, member, kwargs.get("session_id"))
+        if output is not None:
+            logger.info("%s: reusing checkpointed result of %s", team, member.name)
+            return replay(output, kwargs) if stream else output
+        if stream:
+            return stream_and_save(key, input, args, kwargs)
+        output = run(input, *args, stream=False, **kwargs)
+        store.save(key, output)
+        return output
+
+    async def astream_and_save(key: str, input: Any, args: Any, kwargs: Dict[str, Any]) -> AsyncIterator[Any]:
+        wants_output = kwargs.get("yield_run_output") or kwargs.get("yield_run_response")
+        async for event in arun(input, *args, stream=True, **{**kwargs, "yield_run_output": True}):
+            if _is_output(event):
+                store.save(key, event)
+                if not wants_output:
+                    continue
+            yield event
+
+    async def areplay(output: Any, kwargs: Dict[str, Any]) -> AsyncIterator[Any]:
+        yield _content_event(output)
+        if kwargs.get("yield_run_output") or kwargs.get("yield_run_response"):
+            yield output
+
+    async def arun_and_save(key: str, input: Any, args: Any, kwargs: Dict[str, Any]) -> Any:
+        output = store.load(key, member, kwargs.get("session_id"))
+        if output is not None:
+            logger.info("%s: reusing checkpointed result of %s", team, member.name)
+            return output
+        output = await arun(input, *args, stream=False, **kwargs)
+        store.save(key, output)
+        return output
+
+    def checkpointed_arun(input: Any, *args: Any, stream: Optional[bool] = None, **kwargs: Any) -> Any:
+        stream = stream if stream is not None else bool(getattr(member, "stream", False))
+        key = store.key(team, member, input)
+        if not stream:
+            return arun_and_save(key, input, args, kwargs)
+        output = store.load(key, member, kwargs.get("session_id"))
+        if output is not None:
+            logger.info("%s: reusing checkpointed result of %s", team, member.name)
+            return areplay(output, kwargs)
+        return astream_and_save(key, input, args, kwargs)
+
+    member.run = checkpointed_run
+    member.arun = checkpointed_arun
+    member._checkpointed = True
+
+
+def _checkpointed_copy(member: Any, team: str, store: CheckpointStore) -> Any:
+    """A shallow copy of member (and of its members, for a sub-team) checkpointed under team."""
+    if getattr(member, "_checkpointed", False):
+        return member
+    member = copy.copy(member)
+    if getattr(member, "members", None):
+        checkpoint_team(member, store)
+    _checkpoint_member(member, team, store)
+    return member
+
+
+def checkpoint_team(team: Any, store: Optional[CheckpointStore] = None) -> Any:
+    """
+    Checkpoint the results of every member of a team, recursively.
+
+    Members are replaced by checkpointed shallow copies, so agents shared with other
+    teams (see get_agent()) are left untouched and each team keys results by its own name.
+
+    Args:
+        team: Agno Team or ParallelTeam (its leader or synthesizer is not checkpointed)
+        store: Store to use (defaults to the process-wide store)
+
+    Returns:
+        The same team, or the team unchanged if CHECKPOINT_TTL is 0
+    """
+    if store is None:
+        if float(os.getenv("CHECKPOINT_TTL", "86400")) <= 0:
+            return team
+        store = get_checkpoint_store()
+    team.members = [_checkpointed_copy(member, team.name or "team", store) for member in team.members]
+    return team
+
+
+@lru_cache(maxsize=1)
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store, configured from environment variables."""
+    return CheckpointStore()
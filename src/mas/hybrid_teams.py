@@ -1,28 +1,27 @@
 """
 Hybrid Team Architecture - Startup Due Diligence
 Demonstrates parallel execution within a sub-team + sequential coordination at main team level
+
+Agents and teams are built on first use and cached (see team_spec.py): importing this
+module is cheap, and get_due_diligence_committee() returns the same instance for every
+request.
+
+Member results are checkpointed (see checkpoints.py): re-running the committee reuses
+every architect and analyst result whose task and instructions did not change.
 """
-from textwrap import dedent
-from agno.agent import Agent
-from agno.team.team import Team
-from agno.tools.tavily import TavilyTools
-from src.config.model_factory import ModelFactory
+from typing import TYPE_CHECKING
+
+from src.mas.team_spec import AgentSpec, cached_builder, get_agent, lazy_exports
+
+if TYPE_CHECKING:
+    from agno.team.team import Team
 
 # Technical Assessment Sub-Team - Multiple experts assess in parallel
 
-backend_architect = Agent(
+BACKEND_ARCHITECT = AgentSpec(
     name="Backend Architect",
     role="Assess backend architecture, scalability, and technical debt",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate the startup's backend technical stack:
     - Architecture design and scalability
     - Database design and data management
@@ -32,22 +31,13 @@ backend_architect = Agent(
     - Security practices
     
     Provide technical assessment with specific findings and recommendations.
-    """),
+    """,
 )
 
-frontend_architect = Agent(
+FRONTEND_ARCHITECT = AgentSpec(
     name="Frontend Architect",
     role="Assess frontend architecture, UX, and performance",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate the startup's frontend technical stack:
     - Frontend framework and architecture
     - User experience and interface design
@@ -57,22 +47,13 @@ frontend_architect = Agent(
     - Code maintainability
     
     Provide frontend assessment with specific findings and recommendations.
-    """),
+    """,
 )
 
-infrastructure_architect = Agent(
+INFRASTRUCTURE_ARCHITECT = AgentSpec(
     name="Infrastructure Architect",
     role="Assess infrastructure, DevOps, and operational practices",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate the startup's infrastructure and operations:
     - Cloud infrastructure and architecture
     - DevOps practices and CI/CD pipelines
@@ -82,42 +63,14 @@ infrastructure_architect = Agent(
     - Security and compliance
     
     Provide infrastructure assessment with specific findings and recommendations.
-    """),
-)
-
-# Technical Assessment Sub-Team - Executes in parallel for comprehensive technical review
-technical_assessment_team = Team(
-    members=[
-        backend_architect,
-        frontend_architect,
-        infrastructure_architect,
-    ],
-    name="Technical Assessment Team",
-    model=ModelFactory.create_model(),
-    delegate_to_all_members=True,  # Parallel execution - all architects assess simultaneously
-    description="Technical experts assess different aspects of the tech stack in parallel.",
-    instructions=[
-        "Each architect independently assesses their domain.",
-        "Provide comprehensive technical evaluation from your perspective.",
-        "Work in parallel to gather diverse technical insights.",
-    ],
-    markdown=True,
+    """,
 )
 
 # Business Analyst - Evaluates business viability
-business_analyst = Agent(
+BUSINESS_ANALYST = AgentSpec(
     name="Business Analyst",
     role="Assess business model, market fit, and growth potential",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate the startup's business viability:
     - Business model and revenue streams
     - Market opportunity and competition
@@ -127,47 +80,96 @@ business_analyst = Agent(
     - Financial sustainability
     
     Provide business assessment with market analysis and growth potential.
-    """),
+    """,
 )
 
-# Main Due Diligence Committee - Coordinates sub-team and business analyst
-due_diligence_committee = Team(
-    members=[
-        technical_assessment_team,  # Sub-team with parallel execution
-        business_analyst,  # Individual analyst
-    ],
-    name="Due Diligence Committee",
-    model=ModelFactory.create_model(),
-    delegate_to_all_members=False,  # Sequential coordination at main level
-    description="Main committee coordinating technical assessment sub-team and business analysis.",
-    instructions=[
-        "Workflow:",
-        "1. Delegate to Technical Assessment Team to evaluate tech stack in parallel",
-        "   - Backend, Frontend, and Infrastructure architects work simultaneously",
-        "2. Delegate to Business Analyst to assess business viability",
-        "3. Synthesize all assessments into investment decision",
-        "",
-        "Output structure:",
-        "- Technical Assessment Summary",
-        "  - Backend findings",
-        "  - Frontend findings",
-        "  - Infrastructure findings",
-        "- Business Assessment",
-        "- Overall Risk Analysis",
-        "- Investment Recommendation (Invest/Pass/Further Investigation)",
-        "- Key Decision Factors",
-        "",
-        "Provide clear, actionable investment recommendation based on all assessments.",
-    ],
-    add_datetime_to_context=True,
-    share_member_interactions=True,
-    show_members_responses=True,
-    markdown=True,
+
+@cached_builder
+def get_technical_assessment_team() -> "Team":
+    """Technical Assessment Sub-Team - Executes in parallel for comprehensive technical review"""
+    from agno.team.team import Team
+
+    from src.config.model_factory import ModelFactory
+
+    return Team(
+        members=[
+            get_agent(BACKEND_ARCHITECT),
+            get_agent(FRONTEND_ARCHITECT),
+            get_agent(INFRASTRUCTURE_ARCHITECT),
+        ],
+        name="Technical Assessment Team",
+        model=ModelFactory.create_model(priority="coordinator"),
+        delegate_to_all_members=True,  # Parallel execution - all architects assess simultaneously
+        description="Technical experts assess different aspects of the tech stack in parallel.",
+        instructions=[
+            "Each architect independently assesses their domain.",
+            "Provide comprehensive technical evaluation from your perspective.",
+            "Work in parallel to gather diverse technical insights.",
+        ],
+        markdown=True,
+    )
+
+
+@cached_builder
+def get_due_diligence_committee() -> "Team":
+    """Main Due Diligence Committee - Coordinates sub-team and business analyst"""
+    from agno.team.team import Team
+
+    from src.config.model_factory import ModelFactory
+    from src.mas.checkpoints import checkpoint_team
+
+    committee = Team(
+        members=[
+            get_technical_assessment_team(),  # Sub-team with parallel execution
+            get_agent(BUSINESS_ANALYST),  # Individual analyst
+        ],
+        name="Due Diligence Committee",
+        model=ModelFactory.create_model(priority="coordinator"),
+        delegate_to_all_members=False,  # Sequential coordination at main level
+        description="Main committee coordinating technical assessment sub-team and business analysis.",
+        instructions=[
+            "Workflow:",
+            "1. Delegate to Technical Assessment Team to evaluate tech stack in parallel",
+            "   - Backend, Frontend, and Infrastructure architects work simultaneously",
+            "2. Delegate to Business Analyst to assess business viability",
+            "3. Synthesize all assessments into investment decision",
+            "",
+            "Output structure:",
+            "- Technical Assessment Summary",
+            "  - Backend findings",
+            "  - Frontend findings",
+            "  - Infrastructure findings",
+            "- Business Assessment",
+            "- Overall Risk Analysis",
+            "- Investment Recommendation (Invest/Pass/Further Investigation)",
+            "- Key Decision Factors",
+            "",
+            "Provide clear, actionable investment recommendation based on all assessments.",
+        ],
+        add_datetime_to_context=True,
+        share_member_interactions=True,
+        show_members_responses=True,
+        markdown=True,
+    )
+    return checkpoint_team(committee)
+
+
+# Module attributes kept for existing imports; each is built on first access
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "backend_architect": lambda: get_agent(BACKEND_ARCHITECT),
+        "frontend_architect": lambda: get_agent(FRONTEND_ARCHITECT),
+        "infrastructure_architect": lambda: get_agent(INFRASTRUCTURE_ARCHITECT),
+        "business_analyst": lambda: get_agent(BUSINESS_ANALYST),
+        "technical_assessment_team": get_technical_assessment_team,
+        "due_diligence_committee": get_due_diligence_committee,
+    },
 )
 
 
 if __name__ == "__main__":
-    due_diligence_committee.print_response(
+    get_due_diligence_committee().print_response(
         "We're considering a $5M Series A investment in a SaaS startup. "
         "The company is TechFlow, an AI-powered project management tool with 10K users. "
         "Conduct comprehensive due diligence: technical assessment and business viability. "
@@ -175,4 +177,3 @@ if __name__ == "__main__":
         stream=True,
         show_member_responses=True,
     )
-
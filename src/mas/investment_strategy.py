@@ -1,27 +1,30 @@
 """
 Investment Strategy Team - Analyzing NVIDIA Investment Decision
 Four-agent team to provide comprehensive investment analysis
+
+The four analyses are independent, so the entry point runs them in parallel
+(investment_committee) and synthesizes them in one call; investment_team keeps the
+coordinator-led variant, where the leader delegates to the analysts one by one.
+
+Agents and teams are built on first use and cached (see team_spec.py): importing this
+module is cheap, and get_investment_team() / get_investment_committee() return the
+same instances for every request.
 """
-from textwrap import dedent
-from agno.agent import Agent
-from agno.team.team import Team
-from agno.tools.tavily import TavilyTools
-from src.config.model_factory import ModelFactory
+from typing import TYPE_CHECKING
+
+from src.mas.team_spec import AgentSpec, cached_builder, get_agent, lazy_exports
+
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.team.team import Team
+
+    from src.mas.parallel_team import ParallelTeam
 
 # Financial Analyst - Analyzes financial metrics and fundamentals
-financial_analyst = Agent(
+FINANCIAL_ANALYST = AgentSpec(
     name="Financial Analyst",
     role="Analyze financial metrics, revenue, profitability, and financial health",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Analyze NVIDIA's financial fundamentals:
     - Revenue growth trends and projections
     - Profitability metrics (margins, EPS, ROE)
@@ -31,23 +34,14 @@ financial_analyst = Agent(
     
     Provide quantitative analysis with specific metrics and comparisons to industry peers.
     Focus on financial health and growth sustainability.
-    """),
+    """,
 )
 
 # Market Analyst - Analyzes market position and competitive landscape
-market_analyst = Agent(
+MARKET_ANALYST = AgentSpec(
     name="Market Analyst",
     role="Analyze market position, competition, and industry trends",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate NVIDIA's market position:
     - Market share in key segments (AI chips, data center, gaming)
     - Competitive landscape (AMD, Intel, custom chips)
@@ -56,23 +50,14 @@ market_analyst = Agent(
     - Market opportunities and threats
     
     Assess competitive positioning and market dynamics.
-    """),
+    """,
 )
 
 # Technology Analyst - Analyzes technology trends and innovation
-technology_analyst = Agent(
+TECHNOLOGY_ANALYST = AgentSpec(
     name="Technology Analyst",
     role="Analyze technology trends, innovation, and product pipeline",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Evaluate NVIDIA's technology and innovation:
     - Product pipeline and roadmap (H100, Blackwell, next-gen architectures)
     - R&D investments and innovation capabilities
@@ -81,23 +66,14 @@ technology_analyst = Agent(
     - Emerging technologies (quantum computing, edge AI, autonomous vehicles)
     
     Assess technological moat and innovation trajectory.
-    """),
+    """,
 )
 
 # Risk Analyst - Analyzes risks and potential downsides
-risk_analyst = Agent(
+RISK_ANALYST = AgentSpec(
     name="Risk Analyst",
     role="Identify risks, challenges, and potential downsides",
-    model=ModelFactory.create_model(),
-    tools=[TavilyTools(
-        enable_search=True,
-        max_tokens=8000,
-        search_depth="advanced",
-        format="markdown"
-    )],
-    markdown=True,
-    add_name_to_context=True,
-    instructions=dedent("""
+    instructions="""
     Identify investment risks and challenges:
     - Regulatory risks (export controls, trade restrictions)
     - Market risks (cyclicality, demand fluctuations)
@@ -106,51 +82,110 @@ risk_analyst = Agent(
     - Valuation risks (overvaluation, market sentiment)
     
     Provide balanced risk assessment with probability and impact analysis.
-    """),
+    """,
 )
 
-# Investment Strategy Team - Coordinates all analysts
-investment_team = Team(
-    members=[
-        financial_analyst,
-        market_analyst,
-        technology_analyst,
-        risk_analyst,
-    ],
-    name="Investment Strategy Coordinator",
-    model=ModelFactory.create_model(),
-    delegate_to_all_members=False,
-    description="Coordinate comprehensive investment analysis across four specialized analysts.",
-    instructions=[
-        "Workflow:",
-        "1. Delegate to Financial Analyst to assess financial fundamentals",
-        "2. Delegate to Market Analyst to evaluate competitive position",
-        "3. Delegate to Technology Analyst to assess innovation and technology moat",
-        "4. Delegate to Risk Analyst to identify potential downsides",
-        "5. Synthesize all analyses into a comprehensive investment recommendation",
-        "",
-        "Output structure:",
-        "- Executive Summary",
-        "- Financial Analysis",
-        "- Market Position Analysis",
-        "- Technology & Innovation Assessment",
-        "- Risk Assessment",
-        "- Investment Recommendation (Buy/Hold/Sell) with rationale",
-        "",
-        "Provide clear, actionable investment advice based on all analyses.",
-    ],
-    add_datetime_to_context=True,
-    share_member_interactions=True,
-    show_members_responses=True,
-    markdown=True,
+ANALYSTS = (FINANCIAL_ANALYST, MARKET_ANALYST, TECHNOLOGY_ANALYST, RISK_ANALYST)
+
+
+@cached_builder
+def get_investment_team() -> "Team":
+    """Investment Strategy Team - Coordinates all analysts"""
+    from agno.team.team import Team
+
+    from src.config.model_factory import ModelFactory
+
+    return Team(
+        members=[get_agent(spec) for spec in ANALYSTS],
+        name="Investment Strategy Coordinator",
+        model=ModelFactory.create_model(priority="coordinator"),
+        delegate_to_all_members=False,
+        description="Coordinate comprehensive investment analysis across four specialized analysts.",
+        instructions=[
+            "Workflow:",
+            "1. Delegate to Financial Analyst to assess financial fundamentals",
+            "2. Delegate to Market Analyst to evaluate competitive position",
+            "3. Delegate to Technology Analyst to assess innovation and technology moat",
+            "4. Delegate to Risk Analyst to identify potential downsides",
+            "5. Synthesize all analyses into a comprehensive investment recommendation",
+            "",
+            "Output structure:",
+            "- Executive Summary",
+            "- Financial Analysis",
+            "- Market Position Analysis",
+            "- Technology & Innovation Assessment",
+            "- Risk Assessment",
+            "- Investment Recommendation (Buy/Hold/Sell) with rationale",
+            "",
+            "Provide clear, actionable investment advice based on all analyses.",
+        ],
+        add_datetime_to_context=True,
+        share_member_interactions=True,
+        show_members_responses=True,
+        markdown=True,
+    )
+
+
+@cached_builder
+def get_investment_strategist() -> "Agent":
+    """Investment Strategist - Synthesizes the analysts' reports in a single call"""
+    from agno.agent import Agent
+
+    from src.config.model_factory import ModelFactory
+
+    return Agent(
+        name="Investment Strategy Coordinator",
+        role="Synthesize the analysts' findings into an investment recommendation",
+        model=ModelFactory.create_model(priority="coordinator"),
+        markdown=True,
+        add_datetime_to_context=True,
+        instructions=[
+            "You receive independent analyses from the Financial, Market, Technology and Risk Analysts.",
+            "Synthesize them into a comprehensive investment recommendation.",
+            "",
+            "Output structure:",
+            "- Executive Summary",
+            "- Financial Analysis",
+            "- Market Position Analysis",
+            "- Technology & Innovation Assessment",
+            "- Risk Assessment",
+            "- Investment Recommendation (Buy/Hold/Sell) with rationale",
+            "",
+            "Provide clear, actionable investment advice based on all analyses.",
+        ],
+    )
+
+
+@cached_builder
+def get_investment_committee() -> "ParallelTeam":
+    """Parallel map-reduce: all four analysts at once, then one synthesis"""
+    from src.mas.parallel_team import ParallelTeam
+
+    return ParallelTeam(
+        members=[get_agent(spec) for spec in ANALYSTS],
+        synthesizer=get_investment_strategist(),
+    )
+
+
+# Module attributes kept for existing imports; each is built on first access
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "financial_analyst": lambda: get_agent(FINANCIAL_ANALYST),
+        "market_analyst": lambda: get_agent(MARKET_ANALYST),
+        "technology_analyst": lambda: get_agent(TECHNOLOGY_ANALYST),
+        "risk_analyst": lambda: get_agent(RISK_ANALYST),
+        "investment_team": get_investment_team,
+        "investment_strategist": get_investment_strategist,
+        "investment_committee": get_investment_committee,
+    },
 )
 
 
 if __name__ == "__main__":
-    investment_team.print_response(
+    get_investment_committee().print_response(
         "Should we invest in NVIDIA? Analyze the investment opportunity comprehensively. "
         "Consider a $100,000 investment horizon of 2-3 years.",
         stream=True,
         show_member_responses=True,
     )
-
@@ -0,0 +1,167 @@
+"""
+Parallel map-reduce execution of teams whose members work independently.
+
+A coordinated Team (delegate_to_all_members=False) lets its leader model decide, turn
+by turn, which member to call next, so independent analyses run one after another and
+the leader spends model calls on routing. ParallelTeam runs a fixed set of members
+declared independent concurrently (map), then hands all of their outputs to a single
+synthesizer agent call (reduce):
+- Members run with asyncio, at most max_parallelism at a time
+- Outputs are passed to the synthesizer in declaration order, whatever order the
+  members finish in, so the synthesis prompt is deterministic
+- A member that fails is reported to the synthesizer as unavailable instead of
+  failing the whole run
+
+Wall time is roughly the slowest member plus one synthesis call.
+
+Configuration via environment variables:
+- TEAM_MAX_PARALLELISM: Members run at the same time (default: 4)
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agno.agent import Agent
+from agno.run.agent import RunErrorEvent, RunOutput
+from agno.run.base import RunStatus
+from agno.utils.pprint import pprint_run_response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParallelTeamResult:
+    """Outcome of one ParallelTeam run."""
+
+    content: Optional[str]
+    synthesis: Optional[RunOutput]
+    member_outputs: Dict[str, Optional[RunOutput]] = field(default_factory=dict)
+    member_errors: Dict[str, str] = field(default_factory=dict)
+    member_seconds: Dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class ParallelTeam:
+    """Runs independent member agents concurrently and synthesizes their outputs in one call."""
+
+    def __init__(
+        self,
+        members: List[Agent],
+        synthesizer: Agent,
+        name: Optional[str] = None,
+        max_parallelism: Optional[int] = None,
+    ):
+        """
+        Args:
+            members: Agents whose work does not depend on each other
+            synthesizer: Agent combining the member outputs into the final answer
+            name: Team name
+            max_parallelism: Members run at the same time (defaults to TEAM_MAX_PARALLELISM)
+        """
+        self.members = members
+        self.synthesizer = synthesizer
+        self.name = name or synthesizer.name
+        self.max_parallelism = max_parallelism or int(os.getenv("TEAM_MAX_PARALLELISM", "4"))
+
+    async def _run_member(
+        self, member: Agent, task: str, semaphore: asyncio.Semaphore, result: ParallelTeamResult
+    ) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                output = await member.arun(task)
+                # Model and tool failures come back as a run with an error status, not an exception
+                if output is None or output.status != RunStatus.completed:
+                    raise RuntimeError(output.content if output is not None else "no output")
+                result.member_outputs[member.name] = output
+            except Exception as e:
+                logger.warning("%s: member %s failed: %s", self.name, member.name, e)
+                result.member_outputs[member.name] = None
+                result.member_errors[member.name] = str(e)
+            result.member_seconds[member.name] = time.perf_counter() - start
+
+    def synthesis_prompt(self, task: str, result: ParallelTeamResult) -> str:
+        """Build the synthesizer input: the task followed by every member's output, in member order."""
+        sections = []
+        for member in self.members:
+            output = result.member_outputs.get(member.name)
+            if output is None or not output.content:
+                body = f"(unavailable: {result.member_errors.get(member.name, 'no output')})"
+            else:
+                body = str(output.content)
+            sections.append(f'<analysis member="{member.name}" role="{member.role or ""}">\n{body}\n</analysis>')
+        return f"{task}\n\nAnalyses from the team members:\n\n" + "\n\n".join(sections)
+
+    async def _map(self, task: str) -> ParallelTeamResult:
+        result = ParallelTeamResult(content=None, synthesis=None)
+        semaphore = asyncio.Semaphore(self.max_parallelism)
+        await asyncio.gather(*(self._run_member(member, task, semaphore, result) for member in self.members))
+        return result
+
+    async def arun(self, task: str, **kwargs: Any) -> ParallelTeamResult:
+        """
+        Run every member on the task concurrently, then the synthesizer once.
+
+        Args:
+            task: Task given to every member
+            **kwargs: Extra arguments for the synthesizer run (e.g. session_id)
+
+        Returns:
+            ParallelTeamResult: Synthesized content plus each member's output and timing
+        """
+        start = time.perf_counter()
+        result = await self._map(task)
+        result.synthesis = await self.synthesizer.arun(self.synthesis_prompt(task, result), **kwargs)
+        result.content = result.synthesis.content
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def astream(self, task: str, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Run the team, yielding each member's RunOutput (in member order) once all are done,
+        or a RunErrorEvent for a member that failed, then the synthesizer's streamed events.
+
+        Args:
+            task: Task given to every member
+            **kwargs: Extra arguments for the synthesizer run (e.g. session_id)
+        """
+        result = await self._map(task)
+        for member in self.members:
+            output = result.member_outputs.get(member.name)
+            if output is not None:
+                yield output
+            elif member.name in result.member_errors:
+                yield RunErrorEvent(agent_name=member.name, content=result.member_errors[member.name])
+        async for event in self.synthesizer.arun(self.synthesis_prompt(task, result), stream=True, **kwargs):
+            yield event
+
+    def run(self, task: str, **kwargs: Any) -> ParallelTeamResult:
+        """Blocking variant of arun() (for callers without a running event loop)."""
+        return asyncio.run(self.arun(task, **kwargs))
+
+    async def aprint_response(
+        self, task: str, stream: bool = True, show_member_responses: bool = False, **kwargs: Any
+    ) -> None:
+        """
+        Run the team and print the synthesized answer (streamed) to the console.
+
+        Args:
+            task: Task given to every member
+            stream: Stream the synthesis as it is generated
+            show_member_responses: Also print each member's output first
+            **kwargs: Extra arguments for the synthesizer's aprint_response()
+        """
+        result = await self._map(task)
+        if show_member_responses:
+            for member in self.members:
+                output = result.member_outputs.get(member.name)
+                if output is not None:
+                    pprint_run_response(output, markdown=True)
+        await self.synthesizer.aprint_response(self.synthesis_prompt(task, result), stream=stream, **kwargs)
+
+    def print_response(self, task: str, stream: bool = True, show_member_responses: bool = False, **kwargs: Any) -> None:
+        """Blocking variant of aprint_response()."""
+        asyncio.run(self.aprint_response(task, stream=stream, show_member_responses=show_member_responses, **kwargs))
@@ -0,0 +1,462 @@
+"""
+Long-lived server running team jobs on warm teams.
+
+Each entry point script pays interpreter startup, imports and client setup for a
+single run. TeamServer builds the teams once (see team_spec.py; the MCP travel team
+keeps its MCP server connection open) and runs jobs on them for as long as it lives:
+- Jobs enter a bounded queue; when it is full, new jobs are rejected at once with
+  503 and Retry-After (backpressure) instead of piling up
+- A pool of asyncio workers takes jobs from the queue and runs them on the warm teams
+- Each job streams its events back as NDJSON while it runs, ending with "done", or
+  "error" when the run did not complete; a client that disconnects cancels its job
+
+HTTP API (plain HTTP/1.1 over TCP or a Unix socket, no extra dependencies):
+    POST /teams/<team>/runs  {"input": "...", "session_id": "..."}  -> NDJSON event stream
+    GET  /teams                                                    -> served teams
+    GET  /stats                                                    -> queue and job counters
+    GET  /health
+
+Usage:
+    uv run python -m src.mas.team_server --port 8080 --teams investment_committee due_diligence_committee
+    curl -N -X POST localhost:8080/teams/investment_committee/runs -d '{"input": "Should we invest in NVIDIA?"}'
+
+Configuration via environment variables:
+- SERVER_HOST: Interface to listen on (default: 127.0.0.1)
+- SERVER_PORT: TCP port (default: 8080)
+- SERVER_SOCKET: Unix socket path to listen on instead of TCP (optional)
+- SERVER_WORKERS: Jobs run at the same time (default: 4)
+- SERVER_QUEUE_SIZE: Jobs waiting for a worker before new ones are rejected (default: 32)
+- SERVER_TEAMS: Comma-separated teams to serve (default: all)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from src.mas.batch_runner import run_error
+
+logger = logging.getLogger(__name__)
+
+RUN_ERROR_EVENTS = ("RunError", "TeamRunError")
+RETRY_AFTER_SECONDS = 1
+MAX_BODY_BYTES = 1024 * 1024
+
+
+async def _build_investment_team(stack: AsyncExitStack) -> Any:
+    from src.mas.investment_strategy import get_investment_team
+
+    return get_investment_team()
+
+
+async def _build_investment_committee(stack: AsyncExitStack) -> Any:
+    from src.mas.investment_strategy import get_investment_committee
+
+    return get_investment_committee()
+
+
+async def _build_due_diligence_committee(stack: AsyncExitStack) -> Any:
+    from src.mas.hybrid_teams import get_due_diligence_committee
+
+    return get_due_diligence_committee()
+
+
+async def _build_travel_team(stack: AsyncExitStack) -> Any:
+    from agno.tools.mcp import MCPTools
+
+    from src.config.single_flight import coalesce_toolkit
+    from src.mas.mcp import client
+
+    # The MCP server connection stays open until the server stops
+    mcp_tools = await stack.enter_async_context(MCPTools(client.MCP_COMMAND, timeout_seconds=30))
+    coalesce_toolkit(mcp_tools)
+    return client.build_travel_team(mcp_tools)
+
+
+# Team name -> async builder; builders may register cleanup on the exit stack
+TEAM_BUILDERS: Dict[str, Callable[[AsyncExitStack], Awaitable[Any]]] = {
+    "investment_team": _build_investment_team,
+    "investment_committee": _build_investment_committee,
+    "due_diligence_committee": _build_due_diligence_committee,
+    "travel_team": _build_travel_team,
+}
+
+
+@dataclass
+class ServerStats:
+    """Counters of a TeamServer."""
+
+    workers: int = 0
+    queue_size: int = 0
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    jobs_by_team: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Job:
+    """One team run requested by a client."""
+
+    job_id: str
+    team: str
+    input: str
+    session_id: Optional[str] = None
+    created_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    events: "asyncio.Queue[Dict[str, Any]]" = field(default_factory=asyncio.Queue)
+    task: Optional["asyncio.Task[None]"] = None
+    cancelled: bool = False
+
+
+def event_to_dict(event: Any) -> Dict[str, Any]:
+    """Reduce an Agno run event (or a member RunOutput) to a small JSON-able dict."""
+    name = getattr(event, "event", None) or "MemberCompleted"
+    data: Dict[str, Any] = {"event": name}
+    for attr in ("agent_name", "team_name", "run_id", "content"):
+        value = getattr(event, attr, None)
+        if value is not None:
+            data[attr] = value if isinstance(value, (str, int, float, bool)) else str(value)
+    return data
+
+
+def stream_team(team: Any, input: str, session_id: Optional[str] = None) -> AsyncIterator[Any]:
+    """Stream the events of one run of an Agno Team or a ParallelTeam, then its run output."""
+    if hasattr(team, "astream"):
+        return team.astream(input, session_id=session_id, yield_run_output=True)
+    return team.arun(input, stream=True, session_id=session_id, yield_run_output=True)
+
+
+class TeamServer:
+    """Bounded job queue and asyncio worker pool in front of warm teams."""
+
+    def __init__(
+        self,
+        teams: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            teams: Teams to serve (defaults to SERVER_TEAMS, or every team in TEAM_BUILDERS)
+            workers: Jobs run at the same time (defaults to SERVER_WORKERS)
+            queue_size: Jobs waiting before new ones are rejected (defaults to SERVER_QUEUE_SIZE)
+        """
+        env_teams = [t.strip() for t in os.getenv("SERVER_TEAMS", "").split(",") if t.strip()]
+        self.team_names = teams or env_teams or list(TEAM_BUILDERS)
+        unknown = [name for name in self.team_names if name not in TEAM_BUILDERS]
+        if unknown:
+            raise ValueError(f"Unknown teams: {', '.join(unknown)} (known: {', '.join(TEAM_BUILDERS)})")
+        self.workers = workers or int(os.getenv("SERVER_WORKERS", "4"))
+        self.queue_size = queue_size or int(os.getenv("SERVER_QUEUE_SIZE", "32"))
+        self.teams: Dict[str, Any] = {}
+        self._queue: Optional["asyncio.Queue[Job]"] = None
+        self._admitted = 0  # Jobs queued or running
+        self._stack = AsyncExitStack()
+        self._worker_tasks: List["asyncio.Task[None]"] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stats = ServerStats(workers=self.workers, queue_size=self.queue_size)
+
+    # -- Lifecycle --
+    async def start(self) -> None:
+        """Build every served team and start the workers."""
+        start = time.perf_counter()
+        for name in self.team_names:
+            self.teams[name] = await TEAM_BUILDERS[name](self._stack)
+        logger.info("Warmed %d teams in %.2fs", len(self.teams), time.perf_counter() - start)
+        self._queue = asyncio.Queue()
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def listen(self, host: Optional[str] = None, port: Optional[int] = None, socket_path: Optional[str] = None) -> str:
+        """
+        Accept HTTP connections on a Unix socket or TCP port.
+
+        Args:
+            host: Interface (defaults to SERVER_HOST)
+            port: TCP port, 0 for any free port (defaults to SERVER_PORT)
+            socket_path: Unix socket path, used instead of TCP (defaults to SERVER_SOCKET)
+
+        Returns:
+            str: Address the server listens on
+        """
+        socket_path = socket_path or os.getenv("SERVER_SOCKET") or None
+        if socket_path:
+            self._server = await asyncio.start_unix_server(self._handle, path=socket_path)
+            return f"unix:{socket_path}"
+        host = host or os.getenv("SERVER_HOST", "127.0.0.1")
+        port = port if port is not None else int(os.getenv("SERVER_PORT", "8080"))
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{bound_host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """Stop accepting connections, cancel the workers and release team resources."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        await self._stack.aclose()
+
+    # -- Jobs --
+    def submit(self, team: str, input: str, session_id: Optional[str] = None) -> Job:
+        """
+        Queue a job.
+
+        Up to workers + queue_size jobs are admitted at a time (running or waiting),
+        counted here rather than by the queue: a burst arrives before idle workers have
+        taken anything off the queue.
+
+        Raises:
+            KeyError: If the team is not served
+            asyncio.QueueFull: If the server is at capacity (the caller should retry later)
+        """
+        if team not in self.teams:
+            raise KeyError(team)
+        if self._admitted >= self.workers + self.queue_size:
+            self._stats.rejected += 1
+            raise asyncio.QueueFull
+        job = Job(job_id=str(uuid4()), team=team, input=input, session_id=session_id)
+        self._admitted += 1
+        self._queue.put_nowait(job)
+        self._stats.jobs_by_team[team] = self._stats.jobs_by_team.get(team, 0) + 1
+        return job
+
+    async def _execute(self, job: Job) -> Optional[str]:
+        """
+        Stream a job's events to its client.
+
+        Agno reports model failures as RunError/TeamRunError events and a run that did
+        not complete instead of raising, so those make the job fail (see run_error()).
+
+        Returns:
+            Optional[str]: Why the run failed, or None if it completed
+        """
+        output: Any = None
+        error: Optional[str] = None
+        async for event in stream_team(self.teams[job.team], job.input, job.session_id):
+            if output is not None:
+                # Something followed it, so it was a member's output rather than the run's own
+                await job.events.put(event_to_dict(output))
+                output = None
+            name = getattr(event, "event", None)
+            if name is None:
+                output = event  # The run's own output comes last
+                continue
+            if name in RUN_ERROR_EVENTS and error is None:
+                source = getattr(event, "agent_name", None) or getattr(event, "team_name", None)
+                error = f"{source}: {event.content}" if source else str(event.content)
+            await job.events.put(event_to_dict(event))
+        return error or run_error(output)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.cancelled:
+                    continue
+                job.started_at = time.perf_counter()
+                self._stats.running += 1
+                job.task = asyncio.create_task(self._execute(job))
+                try:
+                    error = await job.task
+                    if error is not None:
+                        self._stats.failed += 1
+                        await job.events.put({"event": "error", "job_id": job.job_id, "error": error})
+                        continue
+                    self._stats.completed += 1
+                    await job.events.put(
+                        {
+                            "event": "done",
+                            "job_id": job.job_id,
+                            "queued_seconds": round(job.started_at - job.created_at, 3),
+                            "seconds": round(time.perf_counter() - job.started_at, 3),
+                        }
+                    )
+                except asyncio.CancelledError:
+                    if not job.cancelled:
+                        raise  # The worker itself is being stopped
+                    self._stats.cancelled += 1
+                except Exception as e:
+                    logger.exception("Job %s on %s failed", job.job_id, job.team)
+                    self._stats.failed += 1
+                    await job.events.put({"event": "error", "job_id": job.job_id, "error": str(e)})
+                finally:
+                    self._stats.running -= 1
+            finally:
+                self._admitted -= 1
+                self._queue.task_done()
+
+    def cancel(self, job: Job) -> None:
+        """Cancel a queued or running job."""
+        job.cancelled = True
+        if job.task is not None and not job.task.done():
+            job.task.cancel()
+
+    def stats(self) -> ServerStats:
+        """Return queue and job counters."""
+        return ServerStats(
+            workers=self.workers,
+            queue_size=self.queue_size,
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            running=self._stats.running,
+            completed=self._stats.completed,
+            failed=self._stats.failed,
+            cancelled=self._stats.cancelled,
+            rejected=self._stats.rejected,
+            jobs_by_team=dict(self._stats.jobs_by_team),
+        )
+
+    # -- HTTP --
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        length = min(int(headers.get("content-length") or 0), MAX_BODY_BYTES)
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, payload: Any, headers: str = "") -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"{headers}Connection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+    async def _stream_job(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, job: Job) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+        # The client sends nothing after its request, so a completed read means it disconnected
+        disconnected = asyncio.ensure_future(reader.read())
+        event: Dict[str, Any] = {"event": "queued", "job_id": job.job_id, "position": self._queue.qsize()}
+        try:
+            while True:
+                line = json.dumps(event).encode() + b"\n"
+                writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                await writer.drain()
+                if event["event"] in ("done", "error"):
+                    break
+                next_event = asyncio.ensure_future(job.events.get())
+                await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_event.done():
+                    next_event.cancel()
+                    self.cancel(job)
+                    return
+                event = next_event.result()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            self.cancel(job)
+            raise
+        finally:
+            disconnected.cancel()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+            except (ValueError, asyncio.LimitOverrunError) as e:
+                await self._respond(writer, "400 Bad Request", {"error": f"Malformed request: {e}"})
+                return
+            parts = [part for part in path.split("/") if part]
+            if method == "GET" and parts == ["health"]:
+                await self._respond(writer, "200 OK", {"status": "ok", "teams": list(self.teams)})
+            elif method == "GET" and parts == ["stats"]:
+                await self._respond(writer, "200 OK", vars(self.stats()))
+            elif method == "GET" and parts == ["teams"]:
+                await self._respond(writer, "200 OK", list(self.teams))
+            elif method == "POST" and len(parts) == 3 and parts[0] == "teams" and parts[2] == "runs":
+                try:
+                    request = json.loads(body or b"{}")
+                    job = self.submit(parts[1], str(request["input"]), request.get("session_id"))
+                except (ValueError, KeyError, TypeError) as e:
+                    status = "404 Not Found" if parts[1] not in self.teams else "400 Bad Request"
+                    await self._respond(writer, status, {"error": f"Invalid request: {e}"})
+                except asyncio.QueueFull:
+                    await self._respond(
+                        writer,
+                        "503 Service Unavailable",
+                        {"error": "Job queue is full, retry later"},
+                        headers=f"Retry-After: {RETRY_AFTER_SECONDS}\r\n",
+                    )
+                else:
+                    await self._stream_job(reader, writer, job)
+            else:
+                await self._respond(writer, "404 Not Found", {"error": f"No route for {method} {path}"})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    teams: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    socket_path: Optional[str] = None,
+) -> None:
+    """Warm the teams and serve jobs until cancelled."""
+    server = TeamServer(teams=teams, workers=workers, queue_size=queue_size)
+    await server.start()
+    address = await server.listen(host=host, port=port, socket_path=socket_path)
+    print(f"Serving {', '.join(server.teams)} on {address} ({server.workers} workers, queue {server.queue_size})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve team runs from warm teams")
+    parser.add_argument("--teams", nargs="*", choices=list(TEAM_BUILDERS), help="Teams to serve (default: all)")
+    parser.add_argument("--workers", type=int, help="Jobs run at the same time")
+    parser.add_argument("--queue-size", type=int, help="Waiting jobs before new ones are rejected")
+    parser.add_argument("--host", help="Interface to listen on")
+    parser.add_argument("--port", type=int, help="TCP port")
+    parser.add_argument("--socket", help="Unix socket path (instead of TCP)")
+    args = parser.parse_args()
+
+    from src.config.model_factory import load_config
+
+    load_config()
+    try:
+        asyncio.run(
+            serve(
+                teams=args.teams,
+                workers=args.workers,
+                queue_size=args.queue_size,
+                host=args.host,
+                port=args.port,
+                socket_path=args.socket,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
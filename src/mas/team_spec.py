@@ -0,0 +1,131 @@
+"""
+Declarative agent specs and lazily built, cached teams.
+
+Building an agent creates its model and search client and reads the environment, and
+importing Agno costs most of a second, so the team modules do neither at import time:
+- AgentSpec describes a member agent as plain data; build() creates the Agent
+- @cached_builder turns a builder function into a thread-safe, build-once getter
+  (e.g. get_investment_team()), so a serving process builds a team on first use and
+  reuses it for every request
+- reset_builders() drops every cached build, so the next access reads the environment
+  again (e.g. after changing MODEL_PROVIDER)
+- lazy_exports() keeps module attributes such as `investment_team` working: they are
+  built on first access
+
+Cached agents are used from whatever event loop runs them. Their models come from the
+model pool (ModelFactory.create_model(shared=True), the default), whose async transport
+keeps one connection pool per event loop, so a cached team also works across successive
+asyncio.run() calls. A model created with shared=False binds its async client to the
+first event loop that uses it; only use such models from one long-lived loop.
+
+Usage:
+    from src.mas.investment_strategy import get_investment_team
+    team = get_investment_team()           # built on first call, cached afterwards
+"""
+import functools
+import threading
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from agno.agent import Agent
+
+_builders: List[Callable[..., Any]] = []
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Declarative description of a member agent with web search."""
+
+    name: str
+    role: str
+    instructions: str
+    web_search: bool = True
+
+    def build(self) -> "Agent":
+        """Create the agent (model and search tools included)."""
+        from agno.agent import Agent
+
+        from src.config.model_factory import ModelFactory
+        from src.config.search_cache import cached_tavily_tools
+
+        tools = []
+        if self.web_search:
+            tools.append(
+                cached_tavily_tools(enable_search=True, max_tokens=8000, search_depth="advanced", format="markdown")
+            )
+        return Agent(
+            name=self.name,
+            role=self.role,
+            model=ModelFactory.create_model(),
+            tools=tools,
+            markdown=True,
+            add_name_to_context=True,
+            instructions=dedent(self.instructions),
+        )
+
+
+def cached_builder(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Cache a builder's result per (hashable) arguments; concurrent first calls build once.
+
+    Args:
+        fn: Function building an agent, team or other expensive object
+
+    Returns:
+        The caching getter, with a cache_clear() method
+    """
+    cache: Dict[Tuple, Any] = {}
+    lock = threading.RLock()
+
+    @functools.wraps(fn)
+    def getter(*args: Any) -> Any:
+        try:
+            return cache[args]
+        except KeyError:
+            pass
+        with lock:
+            if args not in cache:
+                cache[args] = fn(*args)
+            return cache[args]
+
+    def cache_clear() -> None:
+        with lock:
+            cache.clear()
+
+    getter.cache_clear = cache_clear
+    _builders.append(getter)
+    return getter
+
+
+def reset_builders() -> None:
+    """Drop every cached agent and team; the next access builds them from the current environment."""
+    for builder in _builders:
+        builder.cache_clear()
+
+
+@cached_builder
+def get_agent(spec: AgentSpec) -> "Agent":
+    """Return the agent built from spec (one instance per spec, shared by every team)."""
+    return spec.build()
+
+
+def lazy_exports(module: str, builders: Dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Build a module __getattr__ that creates the named objects on first access.
+
+    Args:
+        module: Module name (for the AttributeError message)
+        builders: Attribute name -> cached getter
+
+    Returns:
+        Function to assign to the module's __getattr__
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name in builders:
+            return builders[name]()
+        raise AttributeError(f"module {module!r} has no attribute {name!r}")
+
+    return __getattr__
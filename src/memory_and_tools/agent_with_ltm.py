@@ -1,6 +1,8 @@
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from src.memory_and_tools.file_search_tool import file_search_tool
+from src.memory_and_tools.content_index import search_files
+from src.memory_and_tools.file_search_tool import file_search_tool, read_files
+from src.memory_and_tools.ltm_store import BatchedSqliteDb
+from src.memory_and_tools.memory_pipeline import DeferredMemoryManager
 from src.config.model_factory import ModelFactory
 
 
@@ -17,18 +19,25 @@ if __name__ == '__main__':
     # - user_id: Required to associate memories with specific users
     # - add_history_to_context: Adds conversation history within session
     # Model provider configured via MODEL_PROVIDER env var (ollama or openai)
+    # WAL + pooled connections + batched writes, safe to share between processes
+    db = BatchedSqliteDb(
+        session_table="agent_sessions",
+        db_file="tmp_dbs/demo_ltm.db"
+    )
+    # Only the top-k memories relevant to the query go into the prompt; memories are
+    # extracted in background batches instead of after every run
+    memory_manager = DeferredMemoryManager(db=db)
     agent = Agent(
         model=ModelFactory.create_model(),
         user_id="demo_user",  # Required for user memories
         session_id="demo_ltm_session",
-        db=SqliteDb(
-            session_table="agent_sessions",
-            db_file="tmp_dbs/demo_ltm.db"
-        ),
+        db=db,
+        memory_manager=memory_manager,
+        pre_hooks=[memory_manager.capture_query],
         enable_user_memories=True,  # Enable long-term memory (persistent user memories)
         add_history_to_context=True,  # Short-term memory (conversation history)
         num_history_runs=3,
-        tools=[file_search_tool],
+        tools=[file_search_tool, read_files, search_files],
         markdown=True
     )
 
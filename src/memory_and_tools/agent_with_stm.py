@@ -1,7 +1,9 @@
 from agno.agent import Agent
-from agno.tools.tavily import TavilyTools
-from agno.db.in_memory import InMemoryDb
-from src.memory_and_tools.file_search_tool import file_search_tool
+from src.config.search_cache import cached_tavily_tools
+from src.memory_and_tools.content_index import search_files
+from src.memory_and_tools.file_search_tool import file_search_tool, read_files
+from src.memory_and_tools.session_store import BoundedInMemoryDb
+from src.config.history_budget import compact_history
 from src.config.model_factory import ModelFactory
 
 
@@ -15,23 +17,27 @@ if __name__ == '__main__':
     # Short-term memory maintains conversation history within the current session only
     # Key features:
     # - add_history_to_context=True: Adds previous conversation to context
-    # - num_history_runs=3: Includes last 3 conversation turns
-    # - InMemoryDb: Stores session data in memory (non-persistent, cleared when script ends)
+    # - num_history_runs=10: Considers up to the last 10 conversation turns
+    # - compact_history: Keeps that history under a token budget, cutting old tool outputs first
+    # - BoundedInMemoryDb: Stores session data in memory (non-persistent, cleared when script ends),
+    #   compressed and capped by session count, size and idle time (LRU + TTL eviction)
     # Note: This is in-memory storage - data is NOT saved to disk and is lost when the script ends
     agent = Agent(
-        model=ModelFactory.create_model(),
-        db=InMemoryDb(),  # In-memory storage (non-persistent)
+        model=compact_history(ModelFactory.create_model(), max_tokens=4000),
+        db=BoundedInMemoryDb(),  # In-memory storage (non-persistent, bounded)
         tools=[
-            TavilyTools(
+            cached_tavily_tools(
                 enable_search=True,
                 max_tokens=8000,
                 search_depth="advanced",
                 format="markdown"
             ),
-            file_search_tool
+            file_search_tool,
+            read_files,
+            search_files
         ],
         add_history_to_context=True,  # Enable short-term memory (conversation history)
-        num_history_runs=2,  # Include last 2 conversation turns
+        num_history_runs=10,  # Upper bound; the token budget decides how much is sent
         markdown=True
     )
 
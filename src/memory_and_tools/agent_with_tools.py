@@ -1,5 +1,5 @@
 from agno.agent import Agent
-from agno.tools.tavily import TavilyTools
+from src.config.search_cache import cached_tavily_tools
 from src.config.model_factory import ModelFactory
 
 
@@ -12,7 +12,7 @@ if __name__ == '__main__':
     agent = Agent(
         model=ModelFactory.create_model(),
         tools=[
-            TavilyTools(
+            cached_tavily_tools(
                 enable_search=True,
                 max_tokens=8000,
                 search_depth="advanced",
@@ -0,0 +1,397 @@
+"""
+Indexed content search over a directory tree, used by the search_files tool.
+
+The index maps trigrams of every word in a file to the files containing them, so a
+query only opens the few files that can possibly match. It is updated incrementally
+(only files whose mtime or size changed are re-read) and persisted to disk, so the
+first query of a new process does not rebuild it.
+
+Configuration via environment variables:
+- FILE_SEARCH_ROOT: Directory to index (default: current directory)
+- FILE_SEARCH_INDEX_PATH: Index file (default: tmp_dbs/file_index.pkl)
+- FILE_SEARCH_REFRESH_INTERVAL: Seconds between change scans (default: 5)
+"""
+import fnmatch
+import heapq
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from src.config.single_flight import coalesce
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+SKIP_DIRS = {".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox"}
+MAX_FILE_BYTES = 1024 * 1024
+WORD_PATTERN = re.compile(r"\w{3,}")
+REGEX_META = set(".^$*+?{}[]()|\\")
+
+
+@lru_cache(maxsize=65536)
+def _trigrams(word: str) -> FrozenSet[str]:
+    # Identifiers repeat across files, so caching per word avoids most of the slicing
+    return frozenset(word[i:i + 3] for i in range(len(word) - 2))
+
+
+def _text_trigrams(text: str) -> Set[str]:
+    """Trigrams of every distinct word in a (lower-cased) text."""
+    return set().union(*map(_trigrams, set(WORD_PATTERN.findall(text))))
+
+
+def _literal_runs(pattern: str) -> Optional[List[str]]:
+    """
+    Literal substrings every match of a regex must contain.
+
+    Returns None when nothing can be required (e.g. top-level alternation).
+    """
+    runs, current, i, depth = [], [], 0, 0
+
+    def end_run():
+        runs.append("".join(current))
+        current.clear()
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped.isalnum():
+                # Character classes like \d or \w end the literal run
+                end_run()
+            elif depth == 0:
+                current.append(escaped)
+            continue
+        if char == "|" and depth == 0:
+            return None
+        if char in "?*{":
+            # The preceding character is optional (or repeated a variable number of times)
+            if current:
+                current.pop()
+            end_run()
+            if char == "{":
+                end = pattern.find("}", i)
+                i = end if end != -1 else len(pattern)
+        elif char == "[":
+            end_run()
+            end = pattern.find("]", i + 2)
+            i = end if end != -1 else len(pattern)
+        elif char in REGEX_META:
+            # Everything inside a group may be optional or alternated, so it is skipped
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            end_run()
+        elif depth == 0:
+            current.append(char)
+        i += 1
+    runs.append("".join(current))
+    return [run for run in runs if run]
+
+
+def _required_trigrams(literals: List[str]) -> Set[str]:
+    grams: Set[str] = set()
+    for literal in literals:
+        # Any word-run of a literal lies inside a single indexed word of the file
+        for word in WORD_PATTERN.findall(literal.lower()):
+            grams.update(_trigrams(word))
+    return grams
+
+
+def _matching_lines(text: str, pattern: re.Pattern) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, line) for every line of text containing a match."""
+    number, counted, position = 1, 0, 0
+    while position <= len(text):
+        match = pattern.search(text, position)
+        if match is None:
+            return
+        start = text.rfind("\n", 0, match.start()) + 1
+        end = text.find("\n", match.start())
+        if end == -1:
+            end = len(text)
+        number += text.count("\n", counted, start)
+        counted = start
+        yield number, text[start:end]
+        position = end + 1
+
+
+@dataclass
+class SearchHit:
+    """A matching line."""
+
+    path: str
+    line: int
+    text: str
+    score: float
+
+
+class ContentIndex:
+    """Persistent trigram index of the text files under a root directory."""
+
+    def __init__(
+        self,
+        root: str = ".",
+        index_path: Optional[str] = "tmp_dbs/file_index.pkl",
+        refresh_interval: float = 5.0,
+        max_file_bytes: int = MAX_FILE_BYTES,
+    ):
+        self.root = os.path.realpath(root)
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        # relative path -> (mtime_ns, size, file id); ids of changed files are retired
+        self._files: Dict[str, Tuple[int, int, int]] = {}
+        self._paths: Dict[int, str] = {}
+        # trigram -> ascending file ids (arrays keep the persisted index small)
+        self._postings: Dict[str, array] = {}
+        self._next_id = 0
+        self._last_refresh = float("-inf")
+        self._load()
+
+    def _load(self) -> None:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                state = pickle.load(f)
+        except Exception as e:
+            logger.warning("Ignoring unreadable file index %s: %s", self.index_path, e)
+            return
+        if state.get("version") != INDEX_VERSION or state.get("root") != self.root:
+            return
+        self._files = state["files"]
+        self._postings = state["postings"]
+        self._next_id = state["next_id"]
+        self._paths = {file_id: path for path, (_, _, file_id) in self._files.items()}
+
+    def save(self) -> None:
+        """Write the index to index_path (atomically)."""
+        if not self.index_path:
+            return
+        Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "files": self._files,
+            "postings": self._postings,
+            "next_id": self._next_id,
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def _walk(self) -> Iterator[Tuple[str, os.stat_result]]:
+        own_files = set()
+        if self.index_path:
+            index_file = os.path.realpath(self.index_path)
+            own_files = {index_file, f"{index_file}.tmp"}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.path not in own_files:
+                        yield entry.path, entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+    def _read_text(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "rb") as f:
+                data = f.read(self.max_file_bytes + 1)
+        except OSError:
+            return None
+        if len(data) > self.max_file_bytes or b"\x00" in data[:8192]:
+            return None
+        return data.decode("utf-8", errors="replace")
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Re-index files that were added, changed or removed since the last scan.
+
+        Args:
+            force: Scan even if refresh_interval has not elapsed
+
+        Returns:
+            int: Number of files (re-)indexed or removed
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+                return 0
+            seen: Set[str] = set()
+            changed = 0
+            for full_path, st in self._walk():
+                path = os.path.relpath(full_path, self.root)
+                seen.add(path)
+                known = self._files.get(path)
+                if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+                    continue
+                if known:
+                    self._paths.pop(known[2], None)
+                file_id = self._next_id
+                self._next_id += 1
+                self._files[path] = (st.st_mtime_ns, st.st_size, file_id)
+                text = self._read_text(full_path)
+                if text is not None:
+                    self._paths[file_id] = path
+                    for gram in _text_trigrams(text.lower()):
+                        postings = self._postings.get(gram)
+                        if postings is None:
+                            postings = self._postings[gram] = array("I")
+                        postings.append(file_id)
+                changed += 1
+            for path in set(self._files) - seen:
+                self._paths.pop(self._files.pop(path)[2], None)
+                changed += 1
+            if changed:
+                self._compact()
+                self.save()
+            self._last_refresh = time.monotonic()
+            return changed
+
+    def _compact(self) -> None:
+        """Drop retired file ids from the postings once they outnumber live ones."""
+        if self._next_id - len(self._paths) <= len(self._paths):
+            return
+        live = set(self._paths)
+        postings = {}
+        for gram, ids in self._postings.items():
+            kept = array("I", (i for i in ids if i in live))
+            if kept:
+                postings[gram] = kept
+        self._postings = postings
+
+    def _candidates(self, grams: Set[str]) -> List[str]:
+        if not grams:
+            return sorted(self._paths.values())
+        ids: Optional[Set[int]] = None
+        # Intersect rarest first so the working set shrinks quickly
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            postings = self._postings.get(gram)
+            if not postings:
+                return []
+            ids = set(postings) if ids is None else ids.intersection(postings)
+            if not ids:
+                return []
+        return sorted(self._paths[i] for i in ids if i in self._paths)
+
+    def search(
+        self,
+        query: str,
+        regex: bool = False,
+        path_glob: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """
+        Find lines matching a keyword or regex query.
+
+        Keyword queries match lines containing any of the (case-insensitive) words;
+        lines with more of the words rank first. Regex queries are case-sensitive
+        unless the pattern sets (?i).
+
+        Args:
+            query: Whitespace-separated keywords, or a regular expression if regex=True
+            regex: Treat query as a regular expression
+            path_glob: Only search files whose relative path matches this glob
+            limit: Maximum number of hits
+
+        Returns:
+            List[SearchHit]: Hits ordered by score, then path and line number
+        """
+        self.refresh()
+        if regex:
+            pattern = re.compile(query, re.MULTILINE)
+            literals = _literal_runs(query)
+            groups = [_required_trigrams(literals)] if literals else [set()]
+            terms: List[str] = []
+        else:
+            terms = [term.lower() for term in query.split()]
+            if not terms:
+                return []
+            pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+            groups = [_required_trigrams([term]) for term in terms]
+
+        with self._lock:
+            paths: Set[str] = set()
+            for grams in groups:
+                paths.update(self._candidates(grams))
+        if path_glob:
+            paths = {path for path in paths if fnmatch.fnmatch(path, path_glob)}
+
+        hits: List[SearchHit] = []
+        for path in sorted(paths):
+            text = self._read_text(os.path.join(self.root, path))
+            if text is None or not pattern.search(text):
+                continue
+            file_hits = []
+            for number, line in _matching_lines(text, pattern):
+                lowered = line.lower()
+                score = sum(1 for term in terms if term in lowered) if terms else 1
+                file_hits.append(SearchHit(path, number, line.strip()[:200], float(score)))
+            # Files with many matches are more likely to be what the caller wants
+            bonus = min(len(file_hits), 10) / 100
+            for hit in file_hits:
+                hit.score += bonus
+            hits.extend(file_hits)
+        return heapq.nsmallest(limit, hits, key=lambda hit: (-hit.score, hit.path, hit.line))
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of indexed files and distinct trigrams."""
+        with self._lock:
+            return {"files": len(self._paths), "trigrams": len(self._postings)}
+
+
+@lru_cache(maxsize=None)
+def get_content_index() -> ContentIndex:
+    """Return the process-wide index configured from environment variables."""
+    return ContentIndex(
+        root=os.getenv("FILE_SEARCH_ROOT", "."),
+        index_path=os.getenv("FILE_SEARCH_INDEX_PATH", "tmp_dbs/file_index.pkl"),
+        refresh_interval=float(os.getenv("FILE_SEARCH_REFRESH_INTERVAL", "5")),
+    )
+
+
+@coalesce
+def search_files(query: str, regex: bool = False, path_glob: Optional[str] = None, limit: int = 20) -> str:
+    """
+    Search the contents of the files in the project and return matching lines.
+
+    Use this to find which file contains something before reading it with
+    file_search_tool (e.g. mode="lines" with start_line around a hit).
+
+    Args:
+        query (str): Keywords to look for, or a regular expression if regex is True.
+        regex (bool): Treat the query as a regular expression.
+        path_glob (str): Only search files matching this glob, e.g. "*.py" or "src/*".
+        limit (int): Maximum number of matching lines to return.
+
+    Returns:
+        str: Matching lines formatted as path:line: text
+    """
+    try:
+        hits = get_content_index().search(query, regex=regex, path_glob=path_glob, limit=limit)
+    except re.error as e:
+        return f"Error: invalid regular expression: {e}"
+    except Exception as e:
+        return f"Error: {str(e)}"
+    if not hits:
+        return "No matches found."
+    return "\n".join(f"{hit.path}:{hit.line}: {hit.text}" for hit in hits)
@@ -1,16 +1,394 @@
-def file_search_tool(file_path: str) -> str:
+import asyncio
+import glob
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config.single_flight import coalesce
+
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_TOTAL_BYTES = 256 * 1024
+MAX_BATCH_FILES = 50
+BINARY_SNIFF_BYTES = 8192
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class FileCacheStats:
+    """Counters for the file content cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    total_bytes: int = 0
+
+
+class FileContentCache:
+    """
+    In-process LRU cache of rendered file_search_tool results, bounded by total bytes.
+
+    Keys include the file's (realpath, mtime_ns, size), so an entry is only served
+    while a single stat() shows the file unchanged; older versions are dropped as
+    soon as a newer one is seen.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        # realpath -> (mtime_ns, size) of the cached version and its keys
+        self._versions: Dict[str, Tuple[Tuple[int, int], Set[Tuple]]] = {}
+        self._stats = FileCacheStats()
+
+    def get(self, key: Tuple) -> Optional[str]:
+        path, mtime_ns, size = key[:3]
+        with self._lock:
+            version = self._versions.get(path)
+            if version is not None and version[0] != (mtime_ns, size):
+                self._drop_path(path)
+            content = self._entries.get(key)
+            if content is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return content
+
+    def put(self, key: Tuple, content: str) -> None:
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        path, mtime_ns, file_size = key[:3]
+        with self._lock:
+            if key in self._entries:
+                return
+            version = self._versions.get(path)
+            if version is not None and version[0] != (mtime_ns, file_size):
+                self._drop_path(path)
+            self._versions.setdefault(path, ((mtime_ns, file_size), set()))[1].add(key)
+            self._entries[key] = content
+            self._sizes[key] = size
+            self._stats.total_bytes += size
+            while self._stats.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: Tuple) -> None:
+        del self._entries[key]
+        self._stats.total_bytes -= self._sizes.pop(key)
+        keys = self._versions[key[0]][1]
+        keys.discard(key)
+        if not keys:
+            del self._versions[key[0]]
+
+    def _drop_path(self, path: str) -> None:
+        for key in list(self._versions[path][1]):
+            self._remove(key)
+
+    def stats(self) -> FileCacheStats:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return FileCacheStats(**{**self._stats.__dict__, "entries": len(self._entries)})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._versions.clear()
+            self._stats.total_bytes = 0
+
+
+@lru_cache(maxsize=None)
+def get_file_cache() -> Optional[FileContentCache]:
+    """Return the process-wide cache (None when FILE_CACHE_MAX_BYTES is 0)."""
+    max_bytes = int(os.getenv("FILE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    return FileContentCache(max_bytes) if max_bytes > 0 else None
+
+
+def _is_binary(f) -> bool:
+    """Treat files with NUL bytes in their first block as binary."""
+    head = f.read(BINARY_SNIFF_BYTES)
+    f.seek(0)
+    return b"\x00" in head
+
+
+def _read_head(f, offset: int, max_bytes: int, max_lines: Optional[int]):
+    """Read whole lines from offset until the byte or line budget is spent."""
+    f.seek(offset)
+    parts, used, lines = [], 0, 0
+    while used < max_bytes and (max_lines is None or lines < max_lines):
+        line = f.readline(max_bytes - used)
+        if not line:
+            break
+        parts.append(line)
+        used += len(line)
+        lines += 1
+    return b"".join(parts), offset, offset + used
+
+
+def _read_tail(f, size: int, max_bytes: int, max_lines: Optional[int]):
+    """Read the last lines of the file by scanning backwards in chunks."""
+    wanted = max_lines if max_lines is not None else float("inf")
+    end = size
+    start = size
+    newlines = 0
+    # A trailing newline terminates the last line rather than starting a new one
+    if size:
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            newlines = -1
+    while start > 0 and end - start < max_bytes:
+        step = min(CHUNK_SIZE, start, max_bytes - (end - start))
+        start -= step
+        f.seek(start)
+        chunk = f.read(step)
+        count = chunk.count(b"\n")
+        if newlines + count >= wanted:
+            # Move start just past the newline that begins the wanted lines
+            excess = newlines + count - wanted
+            cut = -1
+            for _ in range(excess + 1):
+                cut = chunk.index(b"\n", cut + 1)
+            start += cut + 1
+            break
+        newlines += count
+    f.seek(start)
+    return f.read(end - start), start, end
+
+
+def _read_lines(f, start_line: int, end_line: Optional[int], max_bytes: int, max_lines: Optional[int] = None):
+    """Read lines start_line..end_line (1-based, inclusive) within the byte and line budgets."""
+    position, skipped = 0, 0
+    while skipped < start_line - 1:
+        # Bounded reads keep memory flat even for very long lines
+        chunk = f.readline(CHUNK_SIZE)
+        if not chunk:
+            break
+        position += len(chunk)
+        if chunk.endswith(b"\n"):
+            skipped += 1
+    if end_line is not None:
+        wanted = end_line - start_line + 1
+        max_lines = min(wanted, max_lines) if max_lines is not None else wanted
+    return _read_head(f, position, max_bytes, max_lines)
+
+
+@coalesce
+def file_search_tool(
+    file_path: str,
+    mode: str = "head",
+    offset: int = 0,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_lines: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+) -> str:
     """
     Search for a file and return its content.
 
+    Large files are read in chunks and truncated; a note at the end says which
+    part of the file was returned, so you can request the next part.
+
     Args:
         file_path (str): Path to the file to search.
+        mode (str): "head" (from offset), "tail" (end of file) or "lines" (start_line to end_line).
+        offset (int): Byte offset to start reading from in head mode.
+        max_bytes (int): Maximum number of bytes to return.
+        max_lines (int): Maximum number of lines to return.
+        start_line (int): First line to return in lines mode (1-based).
+        end_line (int): Last line to return in lines mode (inclusive).
 
     Returns:
         str: file content
     """
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        return "\n".join(lines) if lines else "No matches found."
+        if mode not in ("head", "tail", "lines"):
+            return f"Error: mode must be 'head', 'tail' or 'lines', got '{mode}'"
+        if mode == "lines":
+            if start_line is not None and start_line < 1:
+                return f"Error: start_line must be 1 or more, got {start_line}"
+            if end_line is not None and end_line < (start_line or 1):
+                return f"Error: end_line ({end_line}) is before start_line ({start_line or 1})"
+        max_bytes = max(1, max_bytes)
+
+        real_path = os.path.realpath(file_path)
+        st = os.stat(real_path)
+        cache = get_file_cache()
+        key = (real_path, st.st_mtime_ns, st.st_size, mode, offset, max_bytes, max_lines, start_line, end_line)
+        if cache is not None:
+            content = cache.get(key)
+            if content is not None:
+                return content
+
+        content = _read_range(file_path, real_path, st.st_size, mode, offset, max_bytes, max_lines, start_line, end_line)
+        if cache is not None and not content.startswith("Error:"):
+            cache.put(key, content)
+        return content
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def _read_range(
+    file_path: str,
+    real_path: str,
+    size: int,
+    mode: str,
+    offset: int,
+    max_bytes: int,
+    max_lines: Optional[int],
+    start_line: Optional[int],
+    end_line: Optional[int],
+) -> str:
+    """Read the requested part of a file and format it for the model."""
+    with open(real_path, "rb") as f:
+        if _is_binary(f):
+            return f"Error: {file_path} looks like a binary file ({size} bytes), not reading it."
+        if mode == "tail":
+            data, start, end = _read_tail(f, size, max_bytes, max_lines)
+        elif mode == "lines":
+            data, start, end = _read_lines(f, start_line or 1, end_line, max_bytes, max_lines)
+        else:
+            data, start, end = _read_head(f, min(max(offset, 0), size), max_bytes, max_lines)
+
+    if not data:
+        return "No matches found."
+    content = data.decode("utf-8", errors="replace")
+    if start > 0 or end < size:
+        note = f"returned bytes {start}-{end} of {size}"
+        if start > 0:
+            note += f"; {start} bytes before not shown"
+        if end < size:
+            note += f"; {size - end} bytes after not shown. {_continue_hint(mode, data, end, start_line)}"
+        content += f"\n\n[Truncated: {note}.]"
+    return content
+
+
+def _continue_hint(mode: str, data: bytes, end: int, start_line: Optional[int]) -> str:
+    """How to request the part right after a read that stopped before the end of the file."""
+    if mode == "lines" and data.endswith(b"\n"):
+        next_line = (start_line or 1) + data.count(b"\n")
+        return f"Use start_line={next_line} to continue"
+    # head reads, and lines reads cut in the middle of a line, continue by byte offset
+    return f'Use mode="head", offset={end} to continue'
+
+
+@lru_cache(maxsize=None)
+def _read_executor() -> ThreadPoolExecutor:
+    workers = int(os.getenv("FILE_READ_WORKERS", "8"))
+    return ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="file-read")
+
+
+def _expand_paths(paths: List[str]) -> List[str]:
+    """Expand glob patterns (recursive ** allowed) and drop duplicates, keeping order."""
+    expanded: List[str] = []
+    for path in paths:
+        if glob.has_magic(path):
+            expanded.extend(sorted(p for p in glob.glob(path, recursive=True) if os.path.isfile(p)))
+        else:
+            expanded.append(path)
+    return list(dict.fromkeys(expanded))
+
+
+def _allocate(sizes: List[int], budget: int, cap: int) -> List[int]:
+    """Split a byte budget so small files are read whole and large ones share the rest."""
+    limits = [0] * len(sizes)
+    remaining = budget
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while pending:
+        share = max(1, remaining // len(pending))
+        i = pending.pop(0)
+        limits[i] = max(1, min(sizes[i], share, cap))
+        remaining = max(0, remaining - limits[i])
+    return limits
+
+
+def _plan_batch(paths: List[str], max_bytes_per_file: int, total_max_bytes: int):
+    files = _expand_paths(paths)
+    skipped = files[MAX_BATCH_FILES:]
+    files = files[:MAX_BATCH_FILES]
+    sizes = []
+    for path in files:
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(0)
+    return files, _allocate(sizes, total_max_bytes, max_bytes_per_file), skipped
+
+
+def _format_batch(files: List[str], contents: List[str], skipped: List[str]) -> str:
+    if not files:
+        return "No matches found."
+    sections = [f"=== {path} ===\n{content}" for path, content in zip(files, contents)]
+    if skipped:
+        sections.append(f"[{len(skipped)} more files not read; at most {MAX_BATCH_FILES} files per call.]")
+    return "\n\n".join(sections)
+
+
+@coalesce
+def read_files(
+    paths: List[str],
+    max_bytes_per_file: int = DEFAULT_MAX_BYTES,
+    total_max_bytes: int = DEFAULT_TOTAL_BYTES,
+) -> str:
+    """
+    Read several files at once and return their contents in one result.
+
+    Prefer this over several file_search_tool calls when you need more than one file.
+
+    Args:
+        paths (list): File paths or glob patterns (e.g. "src/**/*.py").
+        max_bytes_per_file (int): Maximum number of bytes returned per file.
+        total_max_bytes (int): Maximum number of bytes returned across all files.
+
+    Returns:
+        str: The content of each file under a "=== path ===" header
+    """
+    try:
+        files, limits, skipped = _plan_batch(paths, max_bytes_per_file, total_max_bytes)
+        contents = list(
+            _read_executor().map(lambda args: file_search_tool(args[0], max_bytes=args[1]), zip(files, limits))
+        )
+        return _format_batch(files, contents, skipped)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@coalesce
+async def aread_files(
+    paths: List[str],
+    max_bytes_per_file: int = DEFAULT_MAX_BYTES,
+    total_max_bytes: int = DEFAULT_TOTAL_BYTES,
+) -> str:
+    """
+    Read several files at once and return their contents in one result.
+
+    Prefer this over several file_search_tool calls when you need more than one file.
+
+    Args:
+        paths (list): File paths or glob patterns (e.g. "src/**/*.py").
+        max_bytes_per_file (int): Maximum number of bytes returned per file.
+        total_max_bytes (int): Maximum number of bytes returned across all files.
+
+    Returns:
+        str: The content of each file under a "=== path ===" header
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        files, limits, skipped = await loop.run_in_executor(
+            _read_executor(), _plan_batch, paths, max_bytes_per_file, total_max_bytes
+        )
+        contents = await asyncio.gather(
+            *(
+                loop.run_in_executor(_read_executor(), lambda p=path, m=limit: file_search_tool(p, max_bytes=m))
+                for path, limit in zip(files, limits)
+            )
+        )
+        return _format_batch(files, list(contents), skipped)
     except Exception as e:
         return f"Error: {str(e)}"
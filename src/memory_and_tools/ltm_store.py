@@ -0,0 +1,331 @@
+"""
+SQLite storage for long-term memory that holds up under concurrent agents.
+
+With default settings every SqliteDb write is its own rollback-journal transaction
+with a full fsync, and concurrent writers fail fast with "database is locked". This
+module provides:
+- create_sqlite_engine(): a pooled SQLAlchemy engine whose connections use WAL
+  journaling, synchronous=NORMAL, a larger page cache, mmap I/O, a busy timeout
+  instead of immediate lock errors, and a per-connection prepared statement cache
+- BatchedSqliteDb: a SqliteDb that queues session and memory upserts and writes them
+  from a background thread, one transaction per table per batch. Reads flush the
+  queue first, so a process always sees its own writes, and bulk upserts replace
+  queued writes of the same sessions or memories.
+
+Batching trades latency for throughput: an upsert returns at once, but its write is
+only committed with the next batch, so under contention it is durable later than
+with an unbatched SqliteDb (see benchmarks/ltm_contention.py).
+
+Queued writes are flushed on close() and at interpreter exit; a hard crash can lose
+up to flush_interval seconds of writes. A batch that fails is retried with the next
+flush; writes that failed max_retries times are dropped from the queue and kept in
+dead_letters.
+
+Configuration via environment variables:
+- LTM_POOL_SIZE: Pooled connections per engine (default: 8)
+- LTM_BUSY_TIMEOUT: Seconds to wait for a lock before failing (default: 30)
+- LTM_CACHE_SIZE_MB: SQLite page cache per connection (default: 64)
+- LTM_MMAP_SIZE_MB: Memory-mapped I/O size (default: 256)
+- LTM_FLUSH_INTERVAL: Seconds between batched writes (default: 0.05)
+- LTM_MAX_BATCH: Queued upserts that trigger an immediate flush (default: 100)
+- LTM_MAX_RETRIES: Failed writes of an upsert before it is dead-lettered (default: 5)
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from agno.db.base import SessionType
+from agno.db.schemas.memory import UserMemory
+from agno.db.sqlite import SqliteDb
+from agno.session import AgentSession, Session, TeamSession, WorkflowSession
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+def create_sqlite_engine(
+    db_file: str,
+    pool_size: Optional[int] = None,
+    busy_timeout: Optional[float] = None,
+    cache_size_mb: Optional[int] = None,
+    mmap_size_mb: Optional[int] = None,
+) -> Engine:
+    """
+    Create a pooled SQLAlchemy engine tuned for concurrent access to one SQLite file.
+
+    Args:
+        db_file: Path to the SQLite database file
+        pool_size: Pooled connections (defaults to LTM_POOL_SIZE)
+        busy_timeout: Seconds to wait on a locked database (defaults to LTM_BUSY_TIMEOUT)
+        cache_size_mb: Page cache per connection (defaults to LTM_CACHE_SIZE_MB)
+        mmap_size_mb: Memory-mapped I/O size (defaults to LTM_MMAP_SIZE_MB)
+
+    Returns:
+        Engine: SQLAlchemy engine to pass as SqliteDb(db_engine=...)
+    """
+    pool_size = pool_size or int(os.getenv("LTM_POOL_SIZE", "8"))
+    busy_timeout = busy_timeout if busy_timeout is not None else float(os.getenv("LTM_BUSY_TIMEOUT", "30"))
+    cache_size_mb = cache_size_mb or int(os.getenv("LTM_CACHE_SIZE_MB", "64"))
+    mmap_size_mb = mmap_size_mb if mmap_size_mb is not None else int(os.getenv("LTM_MMAP_SIZE_MB", "256"))
+
+    path = Path(db_file).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        pool_pre_ping=False,
+        connect_args={
+            "timeout": busy_timeout,
+            "check_same_thread": False,
+            # sqlite3 keeps this many prepared statements per connection
+            "cached_statements": 256,
+        },
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints and is still corruption-safe
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{cache_size_mb * 1024}")
+        cursor.execute(f"PRAGMA mmap_size={mmap_size_mb * 1024 * 1024}")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
+
+def _session_key(session: Session) -> str:
+    return session.session_id
+
+
+def _memory_key(memory: UserMemory) -> str:
+    return memory.memory_id
+
+
+class BatchedSqliteDb(SqliteDb):
+    """SqliteDb with a tuned engine and write-behind batching of session and memory upserts."""
+
+    def __init__(
+        self,
+        db_file: str = "tmp_dbs/ltm.db",
+        db_engine: Optional[Engine] = None,
+        flush_interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(db_file=db_file, db_engine=db_engine or create_sqlite_engine(db_file), **kwargs)
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("LTM_FLUSH_INTERVAL", "0.05"))
+        self.max_batch = max_batch or int(os.getenv("LTM_MAX_BATCH", "100"))
+        self.max_retries = max_retries or int(os.getenv("LTM_MAX_RETRIES", "5"))
+        # Upserts whose write failed max_retries times
+        self.dead_letters: List[Union[Session, UserMemory]] = []
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        # Set while this thread writes to the database (see _write_direct)
+        self._local = threading.local()
+        self._pending_sessions: Dict[str, Session] = {}
+        self._pending_memories: Dict[str, UserMemory] = {}
+        self._queue_lock = threading.Condition()
+        # Held while a batch is being written, so reads wait for in-flight writes
+        self._flush_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        atexit.register(self.flush)
+
+    # -- Write queue --
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run_writer, name="ltm-writer", daemon=True)
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._queue_lock:
+                if not self._pending_sessions and not self._pending_memories:
+                    if self._closed:
+                        return
+                    self._queue_lock.wait()
+                    continue
+                # Let more writes accumulate unless the batch is already full
+                self._queue_lock.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # Already logged and re-queued; retry after the next interval
+                with self._queue_lock:
+                    self._queue_lock.wait(self.flush_interval)
+
+    def _enqueued(self) -> None:
+        """Wake the writer for the first queued write or a full batch (queue lock held)."""
+        self._ensure_writer()
+        pending = len(self._pending_sessions) + len(self._pending_memories)
+        if pending == 1 or pending >= self.max_batch:
+            self._queue_lock.notify()
+
+    def _write_direct(self, write: Any, *args: Any, **kwargs: Any) -> Any:
+        """Call a SqliteDb bulk upsert; its per-row fallback after an error must write, not queue."""
+        self._local.direct = True
+        try:
+            return write(*args, **kwargs)
+        finally:
+            self._local.direct = False
+
+    def _requeue(self, kind: str, items: List[Any], pending: Dict[str, Any], key: Any) -> None:
+        """Queue the items of a failed write again, or dead-letter them after max_retries (queue lock held)."""
+        for item in items:
+            attempts = self._attempts.get((kind, key(item)), 0) + 1
+            if attempts >= self.max_retries:
+                self._attempts.pop((kind, key(item)), None)
+                self.dead_letters.append(item)
+                logger.error("Dropping %s %s after %d failed LTM writes (kept in dead_letters)", kind, key(item), attempts)
+                continue
+            self._attempts[(kind, key(item))] = attempts
+            # Unless a newer version arrived meanwhile
+            pending.setdefault(key(item), item)
+
+    def flush(self) -> None:
+        """Write all queued upserts now (one transaction per table)."""
+        with self._flush_lock:
+            with self._queue_lock:
+                sessions = list(self._pending_sessions.values())
+                memories = list(self._pending_memories.values())
+                self._pending_sessions.clear()
+                self._pending_memories.clear()
+            error: Optional[Exception] = None
+            for kind, items, write, pending, key in (
+                ("session", sessions, super().upsert_sessions, self._pending_sessions, _session_key),
+                ("memory", memories, super().upsert_memories, self._pending_memories, _memory_key),
+            ):
+                if not items:
+                    continue
+                try:
+                    self._write_direct(write, items, deserialize=False)
+                except Exception as e:
+                    logger.error("Batched LTM write of %d %ss failed: %s", len(items), kind, e)
+                    with self._queue_lock:
+                        self._requeue(kind, items, pending, key)
+                    error = e
+                    continue
+                if self._attempts:
+                    with self._queue_lock:
+                        for item in items:
+                            self._attempts.pop((kind, key(item)), None)
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        """Flush queued writes, stop the writer thread and dispose of the connection pool."""
+        with self._queue_lock:
+            self._closed = True
+            self._queue_lock.notify_all()
+        self.flush()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        atexit.unregister(self.flush)
+        super().close()
+
+    def upsert_session(
+        self, session: Session, deserialize: Optional[bool] = True
+    ) -> Optional[Union[Session, Dict[str, Any]]]:
+        if getattr(self._local, "direct", False):
+            return super().upsert_session(session, deserialize=deserialize)
+        # Agents keep mutating their session, so queue a snapshot
+        snapshot = deepcopy(session)
+        if snapshot.created_at is None:
+            # The bulk insert, unlike the single-row one, needs created_at
+            snapshot.created_at = int(time.time())
+        with self._queue_lock:
+            self._pending_sessions[_session_key(snapshot)] = snapshot
+            self._enqueued()
+        return session if deserialize else snapshot.to_dict()
+
+    def upsert_user_memory(
+        self, memory: UserMemory, deserialize: Optional[bool] = True
+    ) -> Optional[Union[UserMemory, Dict[str, Any]]]:
+        if getattr(self._local, "direct", False):
+            return super().upsert_user_memory(memory, deserialize=deserialize)
+        if memory.memory_id is None:
+            memory.memory_id = str(uuid4())
+        with self._queue_lock:
+            self._pending_memories[memory.memory_id] = deepcopy(memory)
+            self._enqueued()
+        return memory if deserialize else memory.to_dict()
+
+    def upsert_sessions(self, sessions: List[Session], *args, **kwargs) -> List[Union[Session, Dict[str, Any]]]:
+        # Written directly; queued snapshots of the same sessions are older, so drop them, and
+        # hold the flush lock so a batch being written cannot land after these
+        with self._flush_lock:
+            with self._queue_lock:
+                for session in sessions:
+                    self._pending_sessions.pop(_session_key(session), None)
+            return self._write_direct(super().upsert_sessions, sessions, *args, **kwargs)
+
+    def upsert_memories(self, memories: List[UserMemory], *args, **kwargs) -> List[Union[UserMemory, Dict[str, Any]]]:
+        with self._flush_lock:
+            with self._queue_lock:
+                for memory in memories:
+                    self._pending_memories.pop(_memory_key(memory), None)
+            return self._write_direct(super().upsert_memories, memories, *args, **kwargs)
+
+    # -- Reads and deletes see queued writes --
+    def get_session(
+        self,
+        session_id: str,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ) -> Optional[Union[AgentSession, TeamSession, WorkflowSession, Dict[str, Any]]]:
+        self.flush()
+        return super().get_session(session_id, session_type, user_id=user_id, deserialize=deserialize)
+
+    def get_sessions(self, *args, **kwargs):
+        self.flush()
+        return super().get_sessions(*args, **kwargs)
+
+    def delete_session(self, session_id: str) -> bool:
+        self.flush()
+        return super().delete_session(session_id)
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        self.flush()
+        return super().delete_sessions(session_ids)
+
+    def get_user_memory(self, *args, **kwargs):
+        self.flush()
+        return super().get_user_memory(*args, **kwargs)
+
+    def get_user_memories(self, *args, **kwargs):
+        self.flush()
+        return super().get_user_memories(*args, **kwargs)
+
+    def get_user_memory_stats(self, *args, **kwargs):
+        self.flush()
+        return super().get_user_memory_stats(*args, **kwargs)
+
+    def get_all_memory_topics(self) -> List[str]:
+        self.flush()
+        return super().get_all_memory_topics()
+
+    def delete_user_memory(self, *args, **kwargs):
+        self.flush()
+        return super().delete_user_memory(*args, **kwargs)
+
+    def delete_user_memories(self, *args, **kwargs):
+        self.flush()
+        return super().delete_user_memories(*args, **kwargs)
+
+    def clear_memories(self) -> None:
+        with self._queue_lock:
+            self._pending_memories.clear()
+        super().clear_memories()
@@ -0,0 +1,412 @@
+"""
+Deferred, batched extraction of user memories for long-term memory agents.
+
+With enable_user_memories=True, every run ends with an extra model call that creates or
+updates the user's memories, and the run only returns once it is done. This module
+takes that call off the critical path:
+- MemoryExtractionQueue: a durable queue (SQLite journal) of run transcripts. A
+  background worker extracts memories for several runs of the same user in one model
+  call once batch_size runs are waiting or the queue has been idle for idle_seconds,
+  and again on close() / interpreter exit. With nothing queued and no retry due, the
+  worker sleeps until the next put().
+- DeferredMemoryManager: a RelevantMemoryManager whose create_user_memories() only
+  enqueues the transcript. After each extraction, new memories that duplicate an
+  existing one (same normalized text) are deleted.
+
+Delivery is at-least-once: a transcript leaves the journal only after its extraction
+succeeded. Failed batches are retried with exponential backoff up to max_attempts and
+then kept in the journal as dead letters. Claimed rows carry a lease, so transcripts
+of a crashed process are picked up by the next worker using the same journal. Each
+row records its target (the memory database and table it is extracted into), and a
+queue only claims rows of its own target, so managers writing to different memory
+databases can share one journal.
+stats() reports the queue depth, dead letters and batch counters.
+
+Configuration via environment variables:
+- MEMORY_QUEUE_PATH: SQLite journal of queued transcripts (default: tmp_dbs/memory_queue.db)
+- MEMORY_BATCH_SIZE: Runs per extraction call (default: 8)
+- MEMORY_IDLE_SECONDS: Idle time before a partial batch is extracted (default: 2)
+- MEMORY_MAX_ATTEMPTS: Extraction attempts before a transcript is dead-lettered (default: 5)
+"""
+import atexit
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+from agno.models.message import Message
+
+from src.memory_and_tools.memory_retrieval import RelevantMemoryManager
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry of a failed batch, doubled per attempt
+RETRY_BACKOFF = 5.0
+
+Extractor = Callable[[List[Message], str, Optional[str], Optional[str]], Any]
+
+
+@dataclass
+class MemoryQueueStats:
+    """Queue depth and counters of a MemoryExtractionQueue."""
+
+    depth: int
+    dead_letters: int
+    batches: int
+    runs_extracted: int
+    failures: int
+    last_batch_seconds: float
+
+
+def _normalize(memory: Any) -> str:
+    return " ".join(re.findall(r"\w+", str(memory or "").lower()))
+
+
+def memory_target(db: Any) -> str:
+    """Identify the memory table of a db (file or URL plus table name) for the journal."""
+    location = getattr(db, "db_url", None) or getattr(db, "db_file", None)
+    if location and "://" not in location:
+        location = os.path.realpath(location)
+    if not location and getattr(db, "db_engine", None) is not None:
+        location = str(db.db_engine.url)
+    return f"{location or getattr(db, 'id', '')}#{getattr(db, 'memory_table_name', '')}"
+
+
+class MemoryExtractionQueue:
+    """Durable queue of run transcripts, extracted in batches by a background worker."""
+
+    def __init__(
+        self,
+        extract: Extractor,
+        target: str = "",
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        lease_seconds: float = 300,
+    ):
+        """
+        Args:
+            extract: Called as extract(messages, user_id, agent_id, team_id) for each batch
+            target: Where extract() stores memories (see memory_target()); only transcripts
+                queued for the same target are claimed from a shared journal
+            path: SQLite journal file (defaults to MEMORY_QUEUE_PATH, ":memory:" for no durability)
+            batch_size: Runs per extraction call (defaults to MEMORY_BATCH_SIZE)
+            idle_seconds: Idle time before a partial batch is extracted (defaults to MEMORY_IDLE_SECONDS)
+            max_attempts: Attempts before a transcript is dead-lettered (defaults to MEMORY_MAX_ATTEMPTS)
+            lease_seconds: How long a claimed batch is reserved for this process
+        """
+        self.extract = extract
+        self.target = target
+        self.path = path or os.getenv("MEMORY_QUEUE_PATH", "tmp_dbs/memory_queue.db")
+        self.batch_size = batch_size or int(os.getenv("MEMORY_BATCH_SIZE", "8"))
+        self.idle_seconds = idle_seconds if idle_seconds is not None else float(os.getenv("MEMORY_IDLE_SECONDS", "2"))
+        self.max_attempts = max_attempts or int(os.getenv("MEMORY_MAX_ATTEMPTS", "5"))
+        self.lease_seconds = lease_seconds
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory_extraction_queue ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, agent_id TEXT, team_id TEXT, "
+            "messages TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, not_before REAL NOT NULL DEFAULT 0, "
+            "claimed_until REAL NOT NULL DEFAULT 0, created_at REAL NOT NULL, target TEXT NOT NULL DEFAULT '')"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(memory_extraction_queue)")]
+        if "target" not in columns:
+            # Journals from before targets were recorded
+            self._conn.execute("ALTER TABLE memory_extraction_queue ADD COLUMN target TEXT NOT NULL DEFAULT ''")
+        self._db_lock = threading.Lock()
+        self._cond = threading.Condition()
+        # Held while batches are extracted, so flush() waits for the worker's batch
+        self._flush_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._queued = 0
+        self._last_put = time.monotonic()
+        # Wall-clock time the next retry or expired lease is due, if any
+        self._next_due: Optional[float] = None
+        self._batches = 0
+        self._runs_extracted = 0
+        self._failures = 0
+        self._last_batch_seconds = 0.0
+        atexit.register(self.close)
+        self._next_due = self._due_at()
+        if self._next_due is not None:
+            # Transcripts left behind by an earlier process
+            self._ensure_worker()
+
+    def __deepcopy__(self, memo):
+        # Copies of the memory manager keep sharing the queue and its worker
+        return self
+
+    # -- Journal --
+    def _execute(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _claim(self) -> List[Tuple]:
+        """Reserve the transcripts that are due, oldest first."""
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, user_id, agent_id, team_id, messages, attempts FROM memory_extraction_queue "
+                    "WHERE target = ? AND attempts < ? AND not_before <= ? AND claimed_until <= ? "
+                    "ORDER BY user_id, agent_id, team_id, id LIMIT ?",
+                    (self.target, self.max_attempts, now, now, self.batch_size * 8),
+                ).fetchall()
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE memory_extraction_queue SET claimed_until = ? "
+                        f"WHERE id IN ({','.join('?' * len(rows))})",
+                        (now + self.lease_seconds, *(row[0] for row in rows)),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _due_at(self) -> Optional[float]:
+        """Earliest time a queued transcript of this target can be claimed, or None if there is none."""
+        return self._execute(
+            "SELECT MIN(MAX(not_before, claimed_until)) FROM memory_extraction_queue WHERE target = ? AND attempts < ?",
+            (self.target, self.max_attempts),
+        )[0][0]
+
+    # -- Worker --
+    def _ensure_worker(self) -> None:
+        with self._cond:
+            if self._closed or (self._worker is not None and self._worker.is_alive()):
+                return
+            self._worker = threading.Thread(target=self._run_worker, name="memory-extraction", daemon=True)
+            self._worker.start()
+
+    def _wait_timeout(self) -> Optional[float]:
+        """Seconds until the worker should flush, 0 for now, None to sleep until put() (cond held)."""
+        if self._queued >= self.batch_size:
+            return 0
+        timeouts = []
+        if self._queued:
+            timeouts.append(self._last_put + self.idle_seconds - time.monotonic())
+        if self._next_due is not None:
+            timeouts.append(self._next_due - time.time())
+        return max(0.0, min(timeouts)) if timeouts else None
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    timeout = self._wait_timeout()
+                    if timeout == 0:
+                        break
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+                next_due = self._due_at()
+            except Exception as e:
+                logger.error("Memory extraction worker failed: %s", e)
+                next_due = time.time() + RETRY_BACKOFF
+            with self._cond:
+                self._next_due = next_due
+
+    def put(
+        self,
+        messages: List[Message],
+        user_id: str,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+    ) -> None:
+        """
+        Queue the transcript of a run for memory extraction.
+
+        Args:
+            messages: Messages to extract memories from (usually the user message)
+            user_id: Owner of the memories
+            agent_id: Agent that ran
+            team_id: Team that ran
+        """
+        payload = json.dumps([{"role": m.role, "content": m.get_content_string()} for m in messages])
+        self._execute(
+            "INSERT INTO memory_extraction_queue (user_id, agent_id, team_id, messages, created_at, target) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, agent_id, team_id, payload, time.time(), self.target),
+        )
+        with self._cond:
+            self._queued += 1
+            self._last_put = time.monotonic()
+            # Starts the idle timer of a sleeping worker, or flushes a full batch
+            self._cond.notify()
+        self._ensure_worker()
+
+    def _extract_batch(self, rows: List[Tuple]) -> None:
+        _, user_id, agent_id, team_id, _, _ = rows[0]
+        seen = set()
+        messages: List[Message] = []
+        for row in rows:
+            for item in json.loads(row[4]):
+                # The same message queued by several runs is extracted once
+                key = (item["role"], item["content"])
+                if key not in seen:
+                    seen.add(key)
+                    messages.append(Message(role=item["role"], content=item["content"]))
+        ids = [row[0] for row in rows]
+        marks = ",".join("?" * len(ids))
+        start = time.perf_counter()
+        try:
+            self.extract(messages, user_id, agent_id, team_id)
+        except Exception as e:
+            now = time.time()
+            attempts = max(row[5] for row in rows) + 1
+            self._execute(
+                f"UPDATE memory_extraction_queue SET attempts = attempts + 1, claimed_until = 0, "
+                f"not_before = ? WHERE id IN ({marks})",
+                (now + RETRY_BACKOFF * 2 ** (attempts - 1), *ids),
+            )
+            self._failures += 1
+            if attempts >= self.max_attempts:
+                logger.error("Memory extraction for user %s failed %d times, dead-lettered: %s", user_id, attempts, e)
+            else:
+                logger.warning("Memory extraction for user %s failed (attempt %d), will retry: %s", user_id, attempts, e)
+            return
+        self._execute(f"DELETE FROM memory_extraction_queue WHERE id IN ({marks})", tuple(ids))
+        self._batches += 1
+        self._runs_extracted += len(rows)
+        self._last_batch_seconds = time.perf_counter() - start
+
+    def flush(self) -> int:
+        """
+        Extract memories for every transcript that is due now.
+
+        Returns:
+            int: Number of queued runs processed (successfully or not)
+        """
+        processed = 0
+        with self._flush_lock:
+            with self._cond:
+                self._queued = 0
+            while True:
+                rows = self._claim()
+                if not rows:
+                    return processed
+                for _, group in groupby(rows, key=lambda row: row[1:4]):
+                    group = list(group)
+                    for i in range(0, len(group), self.batch_size):
+                        self._extract_batch(group[i : i + self.batch_size])
+                processed += len(rows)
+
+    def close(self) -> None:
+        """Stop the worker and extract everything still queued."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> MemoryQueueStats:
+        """Return the queue depth, dead letters and extraction counters."""
+        depth, dead = self._execute(
+            "SELECT COALESCE(SUM(attempts < ?), 0), COALESCE(SUM(attempts >= ?), 0) FROM memory_extraction_queue "
+            "WHERE target = ?",
+            (self.max_attempts, self.max_attempts, self.target),
+        )[0]
+        return MemoryQueueStats(
+            depth=depth,
+            dead_letters=dead,
+            batches=self._batches,
+            runs_extracted=self._runs_extracted,
+            failures=self._failures,
+            last_batch_seconds=self._last_batch_seconds,
+        )
+
+
+class DeferredMemoryManager(RelevantMemoryManager):
+    """RelevantMemoryManager that extracts memories in background batches instead of after every run."""
+
+    def __init__(
+        self,
+        *args: Any,
+        queue_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._queue_options = dict(
+            path=queue_path, batch_size=batch_size, idle_seconds=idle_seconds, max_attempts=max_attempts
+        )
+        self._queue: Optional[MemoryExtractionQueue] = None
+        if self.db is not None:
+            # Start now, so transcripts left in the journal by an earlier process are extracted
+            self._queue = MemoryExtractionQueue(self._extract, target=memory_target(self.db), **self._queue_options)
+
+    @property
+    def queue(self) -> MemoryExtractionQueue:
+        """Extraction queue of this manager's memory db (the agent may only assign its db after construction)."""
+        if self._queue is None:
+            self._queue = MemoryExtractionQueue(self._extract, target=memory_target(self.db), **self._queue_options)
+        return self._queue
+
+    def _extract(
+        self, messages: List[Message], user_id: str, agent_id: Optional[str], team_id: Optional[str]
+    ) -> None:
+        before = {memory.memory_id: _normalize(memory.memory) for memory in self.db.get_user_memories(user_id=user_id)}
+        super().create_user_memories(messages=messages, agent_id=agent_id, team_id=team_id, user_id=user_id)
+
+        seen = set(before.values())
+        duplicates = []
+        for memory in self.db.get_user_memories(user_id=user_id):
+            if memory.memory_id in before:
+                continue
+            text = _normalize(memory.memory)
+            if text in seen:
+                duplicates.append(memory.memory_id)
+            seen.add(text)
+        if duplicates:
+            self.db.delete_user_memories(memory_ids=duplicates, user_id=user_id)
+            logger.debug("Removed %d duplicate memories for user %s", len(duplicates), user_id)
+
+    def create_user_memories(
+        self,
+        message: Optional[str] = None,
+        messages: Optional[List[Message]] = None,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        if not messages and not message:
+            raise ValueError("You must provide either a message or a list of messages")
+        if message:
+            messages = [Message(role="user", content=message)]
+        self.queue.put(messages, user_id or "default", agent_id=agent_id, team_id=team_id)
+        return "Queued for memory extraction"
+
+    async def acreate_user_memories(
+        self,
+        message: Optional[str] = None,
+        messages: Optional[List[Message]] = None,
+        agent_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        return self.create_user_memories(
+            message=message, messages=messages, agent_id=agent_id, team_id=team_id, user_id=user_id
+        )
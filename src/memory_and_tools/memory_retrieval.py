@@ -0,0 +1,306 @@
+"""
+Relevance-ranked retrieval of user memories for long-term memory agents.
+
+With enable_user_memories=True, Agno puts every stored memory of the user into the
+system prompt, so prompts grow linearly with the memory set. This module provides:
+- MemoryIndex: an SQLite FTS5 index over the memory table of a SqliteDb, ranked by
+  BM25. Triggers on the memory table keep it up to date on every insert, update and
+  delete, from any process writing to the database.
+- EmbeddingMemoryIndex: an optional local embedding index (any Agno embedder) with a
+  pure-NumPy cosine top-k. Only new or changed memories are embedded.
+- RelevantMemoryManager: a MemoryManager that gives the agent the top-k memories for
+  the current input, under a token budget, instead of all of them. When both indexes
+  are used their rankings are merged with reciprocal rank fusion. If nothing matches,
+  the most recently updated memories are used.
+
+Usage:
+    memory_manager = RelevantMemoryManager(db=db)
+    agent = Agent(db=db, memory_manager=memory_manager, enable_user_memories=True,
+                  pre_hooks=[memory_manager.capture_query], ...)
+
+Configuration via environment variables:
+- MEMORY_TOP_K: Memories added to the context per run (default: 5)
+- MEMORY_MAX_TOKENS: Token budget for those memories (default: 500)
+"""
+import json
+import os
+import re
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.db.schemas.memory import UserMemory
+from agno.db.sqlite import SqliteDb
+from agno.memory import MemoryManager
+from agno.utils.log import log_debug
+
+CHARS_PER_TOKEN = 4
+MAX_QUERY_TERMS = 32
+# Reciprocal rank fusion constant (60 is the value from the original paper)
+RRF_K = 60
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_current_query: ContextVar[Optional[str]] = ContextVar("memory_query", default=None)
+
+
+def _memory_tokens(memory: UserMemory) -> int:
+    return len(str(memory.memory or "")) // CHARS_PER_TOKEN + 4
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching any of its words."""
+    terms = list(dict.fromkeys(word.lower() for word in _WORD.findall(text)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class MemoryIndex:
+    """BM25 full-text index over the memory table of a SqliteDb, kept in sync by triggers."""
+
+    def __init__(self, db: SqliteDb):
+        self.db = db
+        self.table = db.memory_table_name
+        self.fts_table = f"{self.table}_fts"
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            self.db._get_table("memories", create_table_if_not_found=True)
+            t, f = self.table, self.fts_table
+            columns = "memory_id, user_id, memory, topics"
+            new_values = "new.memory_id, new.user_id, new.memory, new.topics"
+            old_values = "old.memory_id, old.user_id, old.memory, old.topics"
+            with self.db.db_engine.begin() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f,)
+                ).first()
+                # External content table: the text lives only in the memory table
+                conn.exec_driver_sql(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS "{f}" USING fts5('
+                    f"memory_id UNINDEXED, user_id UNINDEXED, memory, topics, "
+                    f"content='{t}', tokenize='porter unicode61')"
+                )
+                conn.exec_driver_sql(
+                    f'CREATE TRIGGER IF NOT EXISTS "{f}_ai" AFTER INSERT ON "{t}" BEGIN '
+                    f'INSERT INTO "{f}"(rowid, {columns}) VALUES (new.rowid, {new_values}); END'
+                )
+                conn.exec_driver_sql(
+                    f'CREATE TRIGGER IF NOT EXISTS "{f}_ad" AFTER DELETE ON "{t}" BEGIN '
+                    f"INSERT INTO \"{f}\"(\"{f}\", rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); END"
+                )
+                conn.exec_driver_sql(
+                    f'CREATE TRIGGER IF NOT EXISTS "{f}_au" AFTER UPDATE ON "{t}" BEGIN '
+                    f"INSERT INTO \"{f}\"(\"{f}\", rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); "
+                    f'INSERT INTO "{f}"(rowid, {columns}) VALUES (new.rowid, {new_values}); END'
+                )
+                if not exists:
+                    # Index the memories written before the index existed
+                    conn.exec_driver_sql(f"INSERT INTO \"{f}\"(\"{f}\") VALUES ('rebuild')")
+            self._ready = True
+
+    def search(self, user_id: str, query: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Return (memory_id, bm25 score) of the user's memories best matching the query.
+
+        Args:
+            user_id: Owner of the memories
+            query: Free text, matched against memory text and topics
+            limit: Max results
+
+        Returns:
+            List: Best match first (lower BM25 scores are better)
+        """
+        match = _fts_query(query)
+        if match is None:
+            return []
+        self._ensure()
+        # Memory writes may still be queued (BatchedSqliteDb)
+        flush = getattr(self.db, "flush", None)
+        if flush is not None:
+            flush()
+        with self.db.db_engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                f'SELECT m.memory_id, bm25("{self.fts_table}") AS score '
+                f'FROM "{self.fts_table}" JOIN "{self.table}" AS m ON m.rowid = "{self.fts_table}".rowid '
+                f'WHERE "{self.fts_table}" MATCH ? AND m.user_id = ? ORDER BY score LIMIT ?',
+                (match, user_id, limit),
+            ).all()
+        return [(row[0], row[1]) for row in rows]
+
+
+class EmbeddingMemoryIndex:
+    """In-process cosine similarity index over memory embeddings (requires numpy)."""
+
+    def __init__(self, db: SqliteDb, embedder: Any):
+        try:
+            import numpy  # noqa: F401
+        except ImportError as e:
+            raise ImportError("EmbeddingMemoryIndex requires numpy: uv add numpy") from e
+        self.db = db
+        self.embedder = embedder
+        self._lock = threading.Lock()
+        # user_id -> (memory ids, row-normalized embedding matrix, memory_id -> updated_at)
+        self._users: Dict[str, Tuple[List[str], Any, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _normalize(matrix: Any) -> Any:
+        import numpy as np
+
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _sync(self, user_id: str) -> Tuple[List[str], Any]:
+        """Embed the user's new or changed memories and drop deleted ones."""
+        import numpy as np
+
+        flush = getattr(self.db, "flush", None)
+        if flush is not None:
+            flush()
+        table = self.db._get_table("memories", create_table_if_not_found=True)
+        with self.db.db_engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                f'SELECT memory_id, updated_at, memory FROM "{table.name}" WHERE user_id = ?', (user_id,)
+            ).all()
+
+        with self._lock:
+            ids, matrix, versions = self._users.get(user_id, ([], None, {}))
+            if len(rows) == len(ids) and all(versions.get(row[0]) == row[1] for row in rows):
+                return ids, matrix
+            position = {memory_id: i for i, memory_id in enumerate(ids)}
+            new_ids: List[str] = []
+            vectors: List[Any] = []
+            for memory_id, updated_at, text in rows:
+                if memory_id in position and versions.get(memory_id) == updated_at:
+                    vectors.append(matrix[position[memory_id]])
+                else:
+                    embedding = self.embedder.get_embedding(str(json.loads(text) if text else ""))
+                    vectors.append(self._normalize(np.asarray(embedding, dtype=np.float32)))
+                new_ids.append(memory_id)
+            matrix = np.vstack(vectors) if vectors else None
+            self._users[user_id] = (new_ids, matrix, {row[0]: row[1] for row in rows})
+            return new_ids, matrix
+
+    def search(self, user_id: str, query: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Return (memory_id, cosine similarity) of the user's memories closest to the query.
+
+        Args:
+            user_id: Owner of the memories
+            query: Free text to embed
+            limit: Max results
+
+        Returns:
+            List: Most similar first
+        """
+        import numpy as np
+
+        ids, matrix = self._sync(user_id)
+        if matrix is None or not query.strip():
+            return []
+        scores = matrix @ self._normalize(np.asarray(self.embedder.get_embedding(query), dtype=np.float32))
+        limit = min(limit, len(ids))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[i], float(scores[i])) for i in top]
+
+
+class RelevantMemoryManager(MemoryManager):
+    """MemoryManager that adds only the memories relevant to the current input to the context."""
+
+    def __init__(
+        self,
+        *args: Any,
+        top_k: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        embedder: Optional[Any] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.top_k = top_k or int(os.getenv("MEMORY_TOP_K", "5"))
+        self.max_tokens = max_tokens or int(os.getenv("MEMORY_MAX_TOKENS", "500"))
+        self.embedder = embedder
+        self._indexes: Optional[Tuple[MemoryIndex, Optional[EmbeddingMemoryIndex]]] = None
+
+    def capture_query(self, run_input: Any) -> None:
+        """Pre-hook recording the run input as the query for the next memory lookup."""
+        _current_query.set(run_input.input_content_string())
+
+    def _get_indexes(self) -> Optional[Tuple[MemoryIndex, Optional[EmbeddingMemoryIndex]]]:
+        # The agent may only assign its db after construction
+        if self._indexes is None and isinstance(self.db, SqliteDb):
+            embedding_index = EmbeddingMemoryIndex(self.db, self.embedder) if self.embedder is not None else None
+            self._indexes = (MemoryIndex(self.db), embedding_index)
+        return self._indexes
+
+    def get_relevant_memories(self, user_id: str, query: str) -> List[UserMemory]:
+        """
+        Return the user's memories most relevant to the query, within top_k and max_tokens.
+
+        Args:
+            user_id: Owner of the memories
+            query: Text to rank the memories against (usually the user's message)
+
+        Returns:
+            List: Most relevant first
+        """
+        text_index, embedding_index = self._get_indexes()
+        candidates = self.top_k * 4
+        rankings = [text_index.search(user_id, query, candidates)]
+        if embedding_index is not None:
+            rankings.append(embedding_index.search(user_id, query, candidates))
+
+        fused: Dict[str, float] = {}
+        for ranking in rankings:
+            for rank, (memory_id, _) in enumerate(ranking):
+                fused[memory_id] = fused.get(memory_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+        ranked = sorted(fused, key=fused.get, reverse=True)
+
+        if ranked:
+            # Fetched lazily: usually only the first top_k rows are needed
+            memories = (self.db.get_user_memory(memory_id, user_id=user_id) for memory_id in ranked)
+        else:
+            memories = self.db.get_user_memories(
+                user_id=user_id, limit=self.top_k, sort_by="updated_at", sort_order="desc"
+            )
+
+        selected: List[UserMemory] = []
+        tokens = 0
+        for memory in memories:
+            if memory is None:
+                continue
+            cost = _memory_tokens(memory)
+            if tokens + cost > self.max_tokens:
+                continue
+            selected.append(memory)
+            tokens += cost
+            if len(selected) >= self.top_k:
+                break
+        log_debug(f"Selected {len(selected)} relevant memories ({tokens} tokens) for user {user_id}")
+        return selected
+
+    def _take_query(self) -> Optional[str]:
+        # Only the first lookup of a run (the system message) is narrowed; memory
+        # updates and other callers still see every memory
+        query = _current_query.get()
+        if query is not None:
+            _current_query.set(None)
+        return query
+
+    def get_user_memories(self, user_id: Optional[str] = None) -> Optional[List[UserMemory]]:
+        query = self._take_query()
+        if query is None or self._get_indexes() is None:
+            return super().get_user_memories(user_id=user_id)
+        return self.get_relevant_memories(user_id or "default", query)
+
+    async def aget_user_memories(self, user_id: Optional[str] = None) -> Optional[List[UserMemory]]:
+        query = self._take_query()
+        if query is None or self._get_indexes() is None:
+            return await super().aget_user_memories(user_id=user_id)
+        return self.get_relevant_memories(user_id or "default", query)
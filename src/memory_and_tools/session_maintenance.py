@@ -0,0 +1,287 @@
+"""
+Retention, compaction and compression of persisted agent sessions.
+
+SqliteDb stores every run of a session, with all of its messages and tool outputs, as
+JSON in the runs column of the sessions table, forever. Loading a session parses all
+of it, although the agent only uses the last num_history_runs runs. SessionMaintenance
+keeps the sessions table small:
+- Compaction: runs beyond the keep_runs most recent ones of a session are moved out
+  of the runs column into zlib-compressed chunks, stored in a "<table>_archive" table
+  or as files under archive_dir. Loading a session then only parses the recent runs;
+  load_archived_runs() reads the older ones back.
+- Retention: archived runs and whole sessions not updated for max_age_days are deleted.
+- Vacuum: the database is switched to incremental auto-vacuum (one full VACUUM the
+  first time) and freed pages are returned to the file system a batch at a time.
+
+Session rows changed by an agent while being compacted are skipped and picked up on
+the next pass, so it is safe to run while agents use the database.
+
+Usage:
+    uv run python -m src.memory_and_tools.session_maintenance --db tmp_dbs/demo_ltm.db --table agent_sessions
+
+Configuration via environment variables:
+- SESSION_KEEP_RUNS: Recent runs kept uncompressed per session (default: 20)
+- SESSION_MAX_AGE_DAYS: Days before archived runs and idle sessions are deleted (default: 90, 0 = never)
+- SESSION_ARCHIVE_DIR: Directory for archived runs instead of the archive table (optional)
+- SESSION_VACUUM_PAGES: Pages released per incremental vacuum (default: 2000)
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agno.db.sqlite import SqliteDb
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class MaintenanceReport:
+    """What one SessionMaintenance.run() pass did."""
+
+    sessions_compacted: int = 0
+    runs_archived: int = 0
+    sessions_skipped: int = 0
+    sessions_deleted: int = 0
+    archive_chunks_deleted: int = 0
+    pages_freed: int = 0
+    seconds: float = 0.0
+
+
+class SessionMaintenance:
+    """Compacts, expires and vacuums the sessions table of a SqliteDb."""
+
+    def __init__(
+        self,
+        db: SqliteDb,
+        keep_runs: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        archive_dir: Optional[str] = None,
+        vacuum_pages: Optional[int] = None,
+        compression_level: int = 6,
+    ):
+        """
+        Args:
+            db: Database holding the sessions
+            keep_runs: Recent runs kept uncompressed per session (defaults to SESSION_KEEP_RUNS)
+            max_age_days: Age after which archived runs and idle sessions are deleted
+                (defaults to SESSION_MAX_AGE_DAYS, 0 = never)
+            archive_dir: Write archived runs to files here instead of the archive table
+                (defaults to SESSION_ARCHIVE_DIR)
+            vacuum_pages: Pages released per incremental vacuum (defaults to SESSION_VACUUM_PAGES)
+            compression_level: zlib level for archived runs
+        """
+        self.db = db
+        self.keep_runs = keep_runs if keep_runs is not None else int(os.getenv("SESSION_KEEP_RUNS", "20"))
+        self.max_age_days = (
+            max_age_days if max_age_days is not None else float(os.getenv("SESSION_MAX_AGE_DAYS", "90"))
+        )
+        self.archive_dir = archive_dir or os.getenv("SESSION_ARCHIVE_DIR") or None
+        self.vacuum_pages = vacuum_pages or int(os.getenv("SESSION_VACUUM_PAGES", "2000"))
+        self.compression_level = compression_level
+        self.table = db.session_table_name
+        self.archive_table = f"{self.table}_archive"
+
+    def _prepare(self) -> None:
+        self.db._get_table("sessions", create_table_if_not_found=True)
+        with self.db.db_engine.begin() as conn:
+            conn.exec_driver_sql(
+                f'CREATE TABLE IF NOT EXISTS "{self.archive_table}" ('
+                f"chunk_id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                f"first_created_at INTEGER, last_created_at INTEGER, run_count INTEGER NOT NULL, "
+                f"payload BLOB NOT NULL)"
+            )
+            conn.exec_driver_sql(
+                f'CREATE INDEX IF NOT EXISTS "{self.archive_table}_session" ON "{self.archive_table}" (session_id)'
+            )
+
+    def _archive_path(self, session_id: str) -> Path:
+        return Path(self.archive_dir) / re.sub(r"[^\w.-]", "_", session_id)
+
+    # -- Compaction --
+    def _compact_session(self, conn: Any, session_id: str, runs_json: str, updated_at: Optional[int]) -> int:
+        """Archive all but the keep_runs most recent runs of one session; return runs archived."""
+        runs = json.loads(runs_json)
+        # SqliteDb stores the runs as a JSON string holding the serialized list
+        double_encoded = isinstance(runs, str)
+        if double_encoded:
+            runs = json.loads(runs)
+        if len(runs) <= self.keep_runs:
+            return 0
+        cut = len(runs) - self.keep_runs
+        old, recent = runs[:cut], runs[cut:]
+        created = [run.get("created_at") or 0 for run in old]
+        payload = zlib.compress(json.dumps(old).encode(), self.compression_level)
+        recent_json = json.dumps(recent)
+        if double_encoded:
+            recent_json = json.dumps(recent_json)
+
+        # Only replace the runs if the agent did not write the session meanwhile; updated_at
+        # has whole-second resolution, so the runs themselves are compared too
+        result = conn.exec_driver_sql(
+            f'UPDATE "{self.table}" SET runs = ? WHERE session_id = ? AND updated_at IS ? AND runs = ?',
+            (recent_json, session_id, updated_at, runs_json),
+        )
+        if result.rowcount == 0:
+            return -1
+        if self.archive_dir:
+            directory = self._archive_path(session_id)
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"{min(created)}-{max(created)}-{len(old)}.json.zlib").write_bytes(payload)
+        else:
+            conn.exec_driver_sql(
+                f'INSERT INTO "{self.archive_table}" '
+                f"(session_id, first_created_at, last_created_at, run_count, payload) VALUES (?, ?, ?, ?, ?)",
+                (session_id, min(created), max(created), len(old), payload),
+            )
+        return len(old)
+
+    def compact(self, report: MaintenanceReport) -> None:
+        """Compact every session with more than keep_runs runs."""
+        with self.db.db_engine.connect() as conn:
+            candidates = conn.exec_driver_sql(
+                f'SELECT session_id FROM "{self.table}" '
+                f"WHERE runs IS NOT NULL AND json_array_length(json_extract(runs, '$')) > ?",
+                (self.keep_runs,),
+            ).all()
+        for (session_id,) in candidates:
+            # One short transaction per session keeps agents from waiting on the lock
+            with self.db.db_engine.begin() as conn:
+                row = conn.exec_driver_sql(
+                    f'SELECT runs, updated_at FROM "{self.table}" WHERE session_id = ?', (session_id,)
+                ).first()
+                if row is None or row[0] is None:
+                    continue
+                archived = self._compact_session(conn, session_id, row[0], row[1])
+            if archived < 0:
+                report.sessions_skipped += 1
+            elif archived:
+                report.sessions_compacted += 1
+                report.runs_archived += archived
+
+    def load_archived_runs(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Read the archived runs of a session back, oldest first.
+
+        Args:
+            session_id: Session whose runs were compacted
+
+        Returns:
+            List: Run dicts as stored in the runs column
+        """
+        payloads: List[bytes] = []
+        if self.archive_dir:
+            directory = self._archive_path(session_id)
+            if directory.is_dir():
+                files = sorted(directory.glob("*.json.zlib"), key=lambda p: int(p.name.split("-")[0]))
+                payloads = [path.read_bytes() for path in files]
+        else:
+            self._prepare()
+            with self.db.db_engine.connect() as conn:
+                payloads = [
+                    row[0]
+                    for row in conn.exec_driver_sql(
+                        f'SELECT payload FROM "{self.archive_table}" WHERE session_id = ? ORDER BY chunk_id',
+                        (session_id,),
+                    )
+                ]
+        runs: Dict[str, Dict[str, Any]] = {}
+        for payload in payloads:
+            for run in json.loads(zlib.decompress(payload)):
+                # A run can be archived twice if an agent wrote back an old copy of the session
+                runs[run.get("run_id") or str(len(runs))] = run
+        return list(runs.values())
+
+    # -- Retention --
+    def expire(self, report: MaintenanceReport) -> None:
+        """Delete archived runs and sessions older than max_age_days."""
+        if self.max_age_days <= 0:
+            return
+        cutoff = int(time.time() - self.max_age_days * SECONDS_PER_DAY)
+        with self.db.db_engine.begin() as conn:
+            expired = [
+                row[0]
+                for row in conn.exec_driver_sql(
+                    f'SELECT session_id FROM "{self.table}" WHERE COALESCE(updated_at, created_at) < ?', (cutoff,)
+                )
+            ]
+            if expired:
+                marks = ",".join("?" * len(expired))
+                conn.exec_driver_sql(f'DELETE FROM "{self.table}" WHERE session_id IN ({marks})', tuple(expired))
+                conn.exec_driver_sql(
+                    f'DELETE FROM "{self.archive_table}" WHERE session_id IN ({marks})', tuple(expired)
+                )
+            result = conn.exec_driver_sql(
+                f'DELETE FROM "{self.archive_table}" WHERE last_created_at < ?', (cutoff,)
+            )
+        report.sessions_deleted += len(expired)
+        report.archive_chunks_deleted += result.rowcount
+
+        if self.archive_dir and Path(self.archive_dir).is_dir():
+            expired_dirs = {self._archive_path(session_id).name for session_id in expired}
+            for path in Path(self.archive_dir).glob("*/*.json.zlib"):
+                last_created_at = int(path.name.split("-")[1])
+                if last_created_at < cutoff or path.parent.name in expired_dirs:
+                    path.unlink(missing_ok=True)
+                    report.archive_chunks_deleted += 1
+
+    # -- Vacuum --
+    def vacuum(self, report: MaintenanceReport) -> None:
+        """Release up to vacuum_pages free pages to the file system."""
+        with self.db.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                # Switching to incremental mode only takes effect after a full VACUUM
+                logger.info("Enabling incremental auto-vacuum on %s (one-time full VACUUM)", self.db.db_file)
+                conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+                return
+            free = conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+            if free:
+                conn.exec_driver_sql(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                report.pages_freed += free - (conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0)
+
+    def run(self) -> MaintenanceReport:
+        """Compact, expire and vacuum once; returns what was done."""
+        start = time.perf_counter()
+        report = MaintenanceReport()
+        flush = getattr(self.db, "flush", None)
+        if flush is not None:
+            # Write queued sessions first (BatchedSqliteDb)
+            flush()
+        self._prepare()
+        self.compact(report)
+        self.expire(report)
+        self.vacuum(report)
+        report.seconds = time.perf_counter() - start
+        logger.info("Session maintenance: %s", report)
+        return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compact, expire and vacuum persisted agent sessions")
+    parser.add_argument("--db", default="tmp_dbs/demo_ltm.db", help="SQLite database file")
+    parser.add_argument("--table", default="agent_sessions", help="Sessions table")
+    parser.add_argument("--keep-runs", type=int, help="Recent runs kept uncompressed per session")
+    parser.add_argument("--max-age-days", type=float, help="Delete archived runs and idle sessions after this")
+    parser.add_argument("--archive-dir", help="Archive runs to files here instead of the archive table")
+    args = parser.parse_args()
+
+    db = SqliteDb(db_file=args.db, session_table=args.table)
+    report = SessionMaintenance(
+        db, keep_runs=args.keep_runs, max_age_days=args.max_age_days, archive_dir=args.archive_dir
+    ).run()
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Bounded in-memory session storage for short-term memory agents.
+
+InMemoryDb keeps every session (with all of its runs) forever as plain dicts, so a
+long-lived multi-user worker grows without limit. BoundedInMemoryDb is a drop-in
+replacement that:
+- Stores each session as a zlib-compressed pickle next to a small __slots__ record
+  of the fields used for lookups and filtering
+- Evicts least-recently-used sessions beyond max_sessions or max_bytes (compressed)
+- Drops sessions not accessed for ttl seconds
+- Reports memory usage via stats()
+
+Only sessions are bounded; memories, metrics and evals use the InMemoryDb storage.
+
+Configuration via environment variables:
+- SESSION_STORE_MAX_SESSIONS: Max sessions kept (default: 1000)
+- SESSION_STORE_MAX_BYTES: Max compressed bytes kept (default: 67108864)
+- SESSION_STORE_TTL: Seconds since last access before a session expires (default: 3600, 0 = never)
+"""
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from agno.db.base import SessionType
+from agno.db.in_memory import InMemoryDb
+from agno.db.in_memory.utils import apply_sorting
+from agno.session import AgentSession, Session, TeamSession, WorkflowSession
+from agno.utils.log import log_debug
+
+SessionKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class SessionStoreStats:
+    """Size and eviction counters of a BoundedInMemoryDb."""
+
+    sessions: int
+    stored_bytes: int
+    raw_bytes: int
+    hits: int
+    misses: int
+    lru_evictions: int
+    ttl_evictions: int
+
+
+class _SessionRecord:
+    """Lookup fields of a stored session plus its compressed payload."""
+
+    __slots__ = (
+        "session_id", "session_type", "component_id", "user_id", "session_name",
+        "created_at", "last_access", "blob", "raw_size",
+    )
+
+    def __init__(self, data: Dict[str, Any], level: int):
+        raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.session_id = data.get("session_id")
+        self.session_type = data.get("session_type")
+        self.component_id = _component_id(data)
+        self.user_id = data.get("user_id")
+        self.session_name = (data.get("session_data") or {}).get("session_name") or ""
+        self.created_at = data.get("created_at") or 0
+        self.last_access = time.monotonic()
+        self.blob = zlib.compress(raw, level)
+        self.raw_size = len(raw)
+
+    def load(self) -> Dict[str, Any]:
+        # Every load yields a fresh dict, so no deepcopy is needed
+        return pickle.loads(zlib.decompress(self.blob))
+
+
+def _component_id(data: Dict[str, Any]) -> Optional[str]:
+    session_type = data.get("session_type")
+    if session_type == SessionType.TEAM.value:
+        return data.get("team_id")
+    if session_type == SessionType.WORKFLOW.value:
+        return data.get("workflow_id")
+    return data.get("agent_id")
+
+
+def _session_type_value(session: Session) -> str:
+    if isinstance(session, TeamSession):
+        return SessionType.TEAM.value
+    if isinstance(session, WorkflowSession):
+        return SessionType.WORKFLOW.value
+    return SessionType.AGENT.value
+
+
+def _deserialize(data: Dict[str, Any], session_type: Any) -> Session:
+    value = session_type.value if isinstance(session_type, SessionType) else session_type
+    if value == SessionType.TEAM.value:
+        return TeamSession.from_dict(data)
+    if value == SessionType.WORKFLOW.value:
+        return WorkflowSession.from_dict(data)
+    return AgentSession.from_dict(data)
+
+
+class BoundedInMemoryDb(InMemoryDb):
+    """InMemoryDb with compressed, LRU/TTL-bounded session storage."""
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        compression_level: int = 1,
+    ):
+        self._lock = threading.RLock()
+        self._records: "OrderedDict[SessionKey, _SessionRecord]" = OrderedDict()
+        self._ids: Dict[str, Set[SessionKey]] = {}
+        self._stored_bytes = 0
+        self._raw_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lru_evictions = 0
+        self._ttl_evictions = 0
+        self.max_sessions = max_sessions if max_sessions is not None else int(os.getenv("SESSION_STORE_MAX_SESSIONS", "1000"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("SESSION_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.ttl = ttl if ttl is not None else float(os.getenv("SESSION_STORE_TTL", "3600"))
+        self.compression_level = compression_level
+        super().__init__()
+
+    # InMemoryDb code paths we do not override (e.g. metrics) read and assign _sessions
+    @property
+    def _sessions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [record.load() for record in self._records.values()]
+
+    @_sessions.setter
+    def _sessions(self, sessions: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._records.clear()
+            self._ids.clear()
+            self._stored_bytes = self._raw_bytes = 0
+            for data in sessions:
+                self._store(data)
+
+    # -- Storage internals --
+    def _store(self, data: Dict[str, Any]) -> None:
+        record = _SessionRecord(data, self.compression_level)
+        key = (record.session_id, record.component_id)
+        if key in self._records:
+            self._remove(key)
+        self._records[key] = record
+        self._ids.setdefault(record.session_id, set()).add(key)
+        self._stored_bytes += len(record.blob)
+        self._raw_bytes += record.raw_size
+        self._evict()
+
+    def _remove(self, key: SessionKey) -> None:
+        record = self._records.pop(key)
+        self._stored_bytes -= len(record.blob)
+        self._raw_bytes -= record.raw_size
+        keys = self._ids[record.session_id]
+        keys.discard(key)
+        if not keys:
+            del self._ids[record.session_id]
+
+    def _evict(self) -> None:
+        """Drop expired sessions, then least-recently-used ones beyond the caps."""
+        if self.ttl > 0:
+            deadline = time.monotonic() - self.ttl
+            # Records are kept in access order, so expired ones are at the front
+            while self._records:
+                key, record = next(iter(self._records.items()))
+                if record.last_access > deadline:
+                    break
+                self._remove(key)
+                self._ttl_evictions += 1
+        while self._records and (
+            len(self._records) > self.max_sessions or self._stored_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._records)))
+            self._lru_evictions += 1
+
+    def _touch(self, key: SessionKey) -> _SessionRecord:
+        record = self._records[key]
+        record.last_access = time.monotonic()
+        self._records.move_to_end(key)
+        return record
+
+    def _find(self, session_id: str, user_id: Optional[str] = None) -> Iterator[SessionKey]:
+        for key in list(self._ids.get(session_id, ())):
+            if user_id is None or self._records[key].user_id == user_id:
+                yield key
+
+    # -- Session methods --
+    def delete_session(self, session_id: str) -> bool:
+        with self._lock:
+            keys = list(self._find(session_id))
+            for key in keys:
+                self._remove(key)
+        log_debug(f"Deleted {len(keys)} session(s) with session_id: {session_id}")
+        return bool(keys)
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        with self._lock:
+            for session_id in session_ids:
+                for key in list(self._find(session_id)):
+                    self._remove(key)
+
+    def get_session(
+        self,
+        session_id: str,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ) -> Optional[Union[AgentSession, TeamSession, WorkflowSession, Dict[str, Any]]]:
+        with self._lock:
+            self._evict()
+            key = next(self._find(session_id, user_id), None)
+            if key is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            data = self._touch(key).load()
+        return data if not deserialize else _deserialize(data, session_type)
+
+    def get_sessions(
+        self,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        component_id: Optional[str] = None,
+        session_name: Optional[str] = None,
+        start_timestamp: Optional[int] = None,
+        end_timestamp: Optional[int] = None,
+        limit: Optional[int] = None,
+        page: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ) -> Union[List[Session], Tuple[List[Dict[str, Any]], int]]:
+        type_value = session_type.value if isinstance(session_type, SessionType) else session_type
+        with self._lock:
+            self._evict()
+            # Filter on the slot fields so only matching sessions are decompressed
+            sessions = [
+                record.load()
+                for record in self._records.values()
+                if record.session_type == type_value
+                and (user_id is None or record.user_id == user_id)
+                and (component_id is None or record.component_id == component_id)
+                and (start_timestamp is None or record.created_at >= start_timestamp)
+                and (end_timestamp is None or record.created_at <= end_timestamp)
+                and (session_name is None or session_name.lower() in record.session_name.lower())
+            ]
+        total_count = len(sessions)
+        sessions = apply_sorting(sessions, sort_by, sort_order)
+        if limit is not None:
+            start = (page - 1) * limit if page is not None else 0
+            sessions = sessions[start : start + limit]
+        if not deserialize:
+            return sessions, total_count
+        return [_deserialize(data, session_type) for data in sessions]
+
+    def rename_session(
+        self, session_id: str, session_type: SessionType, session_name: str, deserialize: Optional[bool] = True
+    ) -> Optional[Union[Session, Dict[str, Any]]]:
+        with self._lock:
+            for key in self._find(session_id):
+                record = self._records[key]
+                if record.session_type != session_type.value:
+                    continue
+                data = record.load()
+                data.setdefault("session_data", {})
+                data["session_data"]["session_name"] = session_name
+                self._store(data)
+                break
+            else:
+                return None
+        return data if not deserialize else _deserialize(data, session_type)
+
+    def upsert_session(
+        self, session: Session, deserialize: Optional[bool] = True
+    ) -> Optional[Union[Session, Dict[str, Any]]]:
+        data = session.to_dict()
+        data["session_type"] = _session_type_value(session)
+        now = int(time.time())
+        with self._lock:
+            key = (data.get("session_id"), _component_id(data))
+            if key in self._records:
+                data["updated_at"] = now
+            else:
+                data["created_at"] = data.get("created_at") or now
+                data["updated_at"] = data.get("created_at")
+            self._store(data)
+        if not deserialize:
+            return data
+        return _deserialize(data, data["session_type"])
+
+    def stats(self) -> SessionStoreStats:
+        """Return the number of sessions, their compressed/raw size and eviction counters."""
+        with self._lock:
+            return SessionStoreStats(
+                sessions=len(self._records),
+                stored_bytes=self._stored_bytes,
+                raw_bytes=self._raw_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                lru_evictions=self._lru_evictions,
+                ttl_evictions=self._ttl_evictions,
+            )
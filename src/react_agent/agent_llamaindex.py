@@ -4,7 +4,6 @@ Demonstrates iterative reasoning: Think → Act → Observe → Think → Act...
 """
 import os
 import asyncio
-from tavily import TavilyClient
 from llama_index.core.agent.workflow import (
     ReActAgent,
     AgentStream,
@@ -13,14 +12,35 @@ from llama_index.core.agent.workflow import (
 from llama_index.core.tools import FunctionTool
 from llama_index.llms.openai import OpenAI
 from llama_index.llms.ollama import Ollama
-from dotenv import load_dotenv, find_dotenv
+from src.config.model_factory import load_config
+from src.config.search_cache import cached_tavily_client
+from src.config.search_client import get_async_search_client
+from src.config.search_distill import distill_results, get_distill_tokens
 
-load_dotenv(find_dotenv())
+load_config()
 
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# Pooled async client (does not block the ReAct event loop) behind the shared TTL cache
+tavily_client = cached_tavily_client(get_async_search_client())
 
 
-def search_academic_programs(query: str) -> str:
+def relevant_results(search_query: str, result: dict) -> list:
+    """
+    Drop near-duplicate results and keep only the passages relevant to the query.
+
+    Args:
+        search_query: Query sent to Tavily
+        result: Tavily search response
+
+    Returns:
+        Results trimmed to SEARCH_DISTILL_TOKENS (unchanged if it is 0)
+    """
+    max_tokens = get_distill_tokens()
+    if max_tokens <= 0:
+        return result.get("results", [])
+    return distill_results(search_query, result.get("results", []), max_tokens=max_tokens)
+
+
+async def search_academic_programs(query: str) -> str:
     """
     Search for information about ENIT's academic programs.
     
@@ -31,10 +51,10 @@ def search_academic_programs(query: str) -> str:
         Search results about academic programs
     """
     search_query = f"ENIT Tunis {query} academic programs engineering specializations"
-    result = tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
+    result = await tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
     
     formatted_results = []
-    for item in result.get("results", []):
+    for item in relevant_results(search_query, result):
         formatted_results.append(
             f"- {item.get('title', 'N/A')}: {item.get('content', 'N/A')}\n"
             f"  Source: {item.get('url', 'N/A')}"
@@ -43,7 +63,7 @@ def search_academic_programs(query: str) -> str:
     return "\n\n".join(formatted_results) if formatted_results else "No results found"
 
 
-def search_research_innovation(query: str) -> str:
+async def search_research_innovation(query: str) -> str:
     """
     Search for information about ENIT's research and innovation activities.
     
@@ -54,10 +74,10 @@ def search_research_innovation(query: str) -> str:
         Search results about research and innovation
     """
     search_query = f"ENIT Tunis {query} research innovation projects laboratories"
-    result = tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
+    result = await tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
     
     formatted_results = []
-    for item in result.get("results", []):
+    for item in relevant_results(search_query, result):
         formatted_results.append(
             f"- {item.get('title', 'N/A')}: {item.get('content', 'N/A')}\n"
             f"  Source: {item.get('url', 'N/A')}"
@@ -66,7 +86,7 @@ def search_research_innovation(query: str) -> str:
     return "\n\n".join(formatted_results) if formatted_results else "No results found"
 
 
-def search_rankings_reputation(query: str) -> str:
+async def search_rankings_reputation(query: str) -> str:
     """
     Search for information about ENIT's rankings and reputation.
     
@@ -77,10 +97,10 @@ def search_rankings_reputation(query: str) -> str:
         Search results about rankings and reputation
     """
     search_query = f"ENIT Tunis {query} rankings reputation international standing"
-    result = tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
+    result = await tavily_client.search(query=search_query, search_depth="advanced", max_results=5)
     
     formatted_results = []
-    for item in result.get("results", []):
+    for item in relevant_results(search_query, result):
         formatted_results.append(
             f"- {item.get('title', 'N/A')}: {item.get('content', 'N/A')}\n"
             f"  Source: {item.get('url', 'N/A')}"
@@ -110,7 +130,8 @@ def create_llm():
         if not model_id:
             raise ValueError("OLLAMA_MODEL_ID environment variable is required")
         temperature = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
-        return Ollama(model=model_id, temperature=temperature, request_timeout=120.0)
+        base_url = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        return Ollama(model=model_id, temperature=temperature, base_url=base_url, request_timeout=120.0)
     
     else:
         raise ValueError(f"Unsupported provider: {provider}. Use 'openai' or 'ollama'")
@@ -126,9 +147,9 @@ async def main():
     llm = create_llm()
     
     tools = [
-        FunctionTool.from_defaults(fn=search_academic_programs),
-        FunctionTool.from_defaults(fn=search_research_innovation),
-        FunctionTool.from_defaults(fn=search_rankings_reputation),
+        FunctionTool.from_defaults(async_fn=search_academic_programs),
+        FunctionTool.from_defaults(async_fn=search_research_innovation),
+        FunctionTool.from_defaults(async_fn=search_rankings_reputation),
     ]
     
     agent = ReActAgent(